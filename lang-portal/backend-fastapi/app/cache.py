@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from .config import get_settings
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries also expire after ``ttl`` seconds.
+    Keeps hit/miss counters so the savings can be observed.
+    Each invalidation starts a new generation. A value computed across an
+    invalidation, or within ``settle`` seconds after one (e.g. read from a
+    lagging replica), is returned but not stored, so it can not outlive
+    the write that made it stale.
+    Usage:
+        cache = TTLCache(maxsize=32, ttl=30)
+        value = await cache.get_or_compute("key", compute_value)
+    """
+    def __init__(self, maxsize: int = 128, ttl: float = 30.0, settle: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.settle = settle
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.generation = 0
+        self._invalidated_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.discarded = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Stores a value. ``generation`` is the generation the value was
+        computed in, the value is dropped if the cache was invalidated since.
+        """
+        if generation is not None and generation != self.generation:
+            self.discarded += 1
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Returns the cached value for ``key`` or computes and stores it"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            generation = self.generation
+            settling = time.monotonic() - self._invalidated_at < self.settle
+            value = await compute()
+            if settling:
+                self.discarded += 1
+            else:
+                self.set(key, value, generation)
+        return value
+
+    def invalidate(self) -> None:
+        """Drops every entry, called after writes that change cached data"""
+        self._entries.clear()
+        self.generation += 1
+        self._invalidated_at = time.monotonic()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "discarded": self.discarded,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl
+        }
+
+# Global dashboard aggregates, invalidated by review and session writes
+dashboard_cache = TTLCache(
+    maxsize=get_settings().dashboard_cache_size,
+    ttl=get_settings().dashboard_cache_ttl,
+    settle=get_settings().read_replica_max_lag if get_settings().read_database_url else 0.0
+)
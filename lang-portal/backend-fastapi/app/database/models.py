@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, func
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, Date, DateTime, Float, ForeignKey, JSON, Index, func
+from sqlalchemy import DDL, event, false, text
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -15,6 +16,8 @@ class Word(Base):
     # Relationships
     groups = relationship("Group", secondary="words_groups", back_populates="words")
     review_items = relationship("WordReviewItem", back_populates="word")
+    stats = relationship("WordReviewStats", back_populates="word", uselist=False)
+    schedule = relationship("WordSchedule", back_populates="word", uselist=False)
 
 class Group(Base):
     __tablename__ = "groups"
@@ -28,6 +31,10 @@ class Group(Base):
 
 class WordGroup(Base):
     __tablename__ = "words_groups"
+    __table_args__ = (
+        Index("uq_words_groups_word_id_group_id", "word_id", "group_id", unique=True),
+        Index("ix_words_groups_group_id_word_id", "group_id", "word_id"),
+    )
     
     id = Column(Integer, primary_key=True)
     word_id = Column(Integer, ForeignKey("words.id"), nullable=False)
@@ -46,6 +53,11 @@ class StudyActivity(Base):
 
 class StudySession(Base):
     __tablename__ = "study_sessions"
+    __table_args__ = (
+        Index("ix_study_sessions_created_at", "created_at"),
+        Index("ix_study_sessions_group_id_created_at", "group_id", "created_at"),
+        Index("ix_study_sessions_study_activity_id_created_at", "study_activity_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
@@ -59,13 +71,126 @@ class StudySession(Base):
 
 class WordReviewItem(Base):
     __tablename__ = "word_review_items"
+    __table_args__ = (
+        Index("ix_word_review_items_word_id_correct", "word_id", "correct"),
+        Index("ix_word_review_items_study_session_id_created_at", "study_session_id", "created_at"),
+        # Only the reviews still to fold into the rollups, a handful at a time
+        Index(
+            "ix_word_review_items_pending_rollup", "id",
+            sqlite_where=text("rolled_up = 0"),
+            postgresql_where=text("NOT rolled_up")
+        ),
+    )
     
     id = Column(Integer, primary_key=True)
     word_id = Column(Integer, ForeignKey("words.id"), nullable=False)
     study_session_id = Column(Integer, ForeignKey("study_sessions.id"), nullable=False)
     correct = Column(Boolean, nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Set once the review is counted in the review rollups
+    rolled_up = Column(Boolean, nullable=False, default=False, server_default=false())
     
     # Relationships
     word = relationship("Word", back_populates="review_items")
-    study_session = relationship("StudySession", back_populates="review_items") 
\ No newline at end of file
+    study_session = relationship("StudySession", back_populates="review_items") 
+
+class WordReviewStats(Base):
+    """Per-word review counters kept in sync with word_review_items on write"""
+    __tablename__ = "word_stats"
+    
+    word_id = Column(Integer, ForeignKey("words.id"), primary_key=True)
+    correct_count = Column(Integer, nullable=False, default=0, server_default="0")
+    wrong_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_reviewed_at = Column(DateTime)
+    
+    # Relationships
+    word = relationship("Word", back_populates="stats")
+
+class WordSchedule(Base):
+    """Spaced-repetition (SM-2) state of a word, words without a row are new"""
+    __tablename__ = "word_schedules"
+    __table_args__ = (
+        Index("ix_word_schedules_due_at", "due_at"),
+    )
+    
+    word_id = Column(Integer, ForeignKey("words.id"), primary_key=True)
+    ease = Column(Float, nullable=False, default=2.5, server_default="2.5")
+    interval_days = Column(Integer, nullable=False, default=0, server_default="0")
+    repetitions = Column(Integer, nullable=False, default=0, server_default="0")
+    due_at = Column(DateTime, nullable=False)
+    last_reviewed_at = Column(DateTime, nullable=False)
+    
+    # Relationships
+    word = relationship("Word", back_populates="schedule")
+
+class ReviewRollup(Base):
+    """
+    Daily review aggregates. ``dimension`` is "all" (key_id 0), "group" or
+    "activity" with the group or study activity id as key_id.
+    """
+    __tablename__ = "review_rollups"
+    
+    dimension = Column(String, primary_key=True)
+    key_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    reviews = Column(Integer, nullable=False, default=0, server_default="0")
+    correct_count = Column(Integer, nullable=False, default=0, server_default="0")
+    distinct_words = Column(Integer, nullable=False, default=0, server_default="0")
+
+class ReviewRollupWord(Base):
+    """Words reviewed per rollup cell, used to keep distinct_words exact"""
+    __tablename__ = "review_rollup_words"
+    
+    dimension = Column(String, primary_key=True)
+    key_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    word_id = Column(Integer, primary_key=True)
+
+class RollupState(Base):
+    """Row locked by rollup catch-ups to serialize them, with the time of the last one"""
+    __tablename__ = "rollup_state"
+    
+    name = Column(String, primary_key=True)
+    updated_at = Column(DateTime)
+
+class TableVersion(Base):
+    """Change counter per table, bumped by writes and used for ETags"""
+    __tablename__ = "table_versions"
+    
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+
+# Trigram full-text index over words, kept in sync by triggers (SQLite only,
+# the trigram tokenizer needs SQLite 3.34+). Migration 0007 creates the same
+# objects, these hooks cover Base.metadata.create_all.
+WORD_SEARCH_TABLE = "words_fts"
+WORD_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+        japanese, romaji, english,
+        content='words', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+        INSERT INTO words_fts(rowid, japanese, romaji, english)
+        VALUES (new.id, new.japanese, new.romaji, new.english);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, japanese, romaji, english)
+        VALUES ('delete', old.id, old.japanese, old.romaji, old.english);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS words_fts_update AFTER UPDATE ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, japanese, romaji, english)
+        VALUES ('delete', old.id, old.japanese, old.romaji, old.english);
+        INSERT INTO words_fts(rowid, japanese, romaji, english)
+        VALUES (new.id, new.japanese, new.romaji, new.english);
+    END""",
+]
+
+def _supports_word_search(ddl, target, bind, **kw) -> bool:
+    return bind.dialect.name == "sqlite" and bind.dialect.server_version_info >= (3, 34)
+
+for statement in WORD_SEARCH_DDL:
+    event.listen(Word.__table__, "after_create", DDL(statement).execute_if(callable_=_supports_word_search))
+event.listen(
+    Word.__table__, "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {WORD_SEARCH_TABLE}").execute_if(dialect="sqlite")
+)
@@ -1,16 +1,84 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from typing import AsyncGenerator, Callable, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from .config import Settings, get_settings
 
-# Database URL - SQLite for development
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///words.db"
+def _sqlite_pragmas(settings: Settings) -> list:
+    return [
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA cache_size={int(settings.sqlite_cache_size)}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}",
+        f"PRAGMA foreign_keys={'ON' if settings.sqlite_foreign_keys else 'OFF'}",
+    ]
 
-# Create async engine
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Needed for SQLite
-    poolclass=NullPool  # Disable connection pooling
+def create_engine_from_settings(
+    settings: Optional[Settings] = None,
+    url: Optional[str] = None
+) -> AsyncEngine:
+    """
+    Creates a pooled async engine.
+    SQLite connections get the configured PRAGMAs (WAL, synchronous level,
+    cache and mmap sizes, foreign keys) once, when the pool opens them,
+    instead of on every request.
+    Args:
+        settings: Settings to use, defaults to get_settings()
+        url: Database URL, defaults to settings.database_url
+    Returns:
+        Configured AsyncEngine
+    """
+    settings = settings or get_settings()
+    url = make_url(url or settings.database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    
+    kwargs = {"pool_pre_ping": settings.pool_pre_ping}
+    if is_sqlite and url.database in (None, "", ":memory:"):
+        # In-memory databases only exist inside their single connection
+        kwargs.update(
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+    else:
+        kwargs.update(
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle
+        )
+        if is_sqlite:
+            # aiosqlite defaults to NullPool, keep connections open instead
+            kwargs.update(
+                connect_args={"check_same_thread": False},
+                poolclass=AsyncAdaptedQueuePool
+            )
+    
+    engine = create_async_engine(url, **kwargs)
+    
+    if is_sqlite:
+        pragmas = _sqlite_pragmas(settings)
+        
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+    
+    return engine
+
+# Database URL - SQLite for development, see app/config.py
+SQLALCHEMY_DATABASE_URL = get_settings().database_url
+
+# Create async engines, reads go to the replica when one is configured
+engine = create_engine_from_settings()
+read_engine = (
+    create_engine_from_settings(url=get_settings().read_database_url)
+    if get_settings().read_database_url
+    else engine
 )
 
 # Create async session factory
@@ -22,7 +90,15 @@ AsyncSessionLocal = sessionmaker(
     autoflush=False
 )
 
-# Dependency for FastAPI endpoints
+ReadSessionLocal = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
+# Dependencies for FastAPI endpoints
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency that provides an async database session.
@@ -41,5 +117,73 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency that provides a read-only async database session.
+    It is bound to the read replica if LANG_PORTAL_READ_DATABASE_URL is set,
+    otherwise to the primary. Use it for GET endpoints and get_db for writes.
+    """
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+def get_session_factory() -> Callable[[], AsyncSession]:
+    """
+    Dependency that provides the primary session factory, for background
+    jobs that outlive the request and open their own sessions.
+    """
+    return AsyncSessionLocal
+
+def get_engine() -> AsyncEngine:
+    """
+    Dependency that provides the primary engine, for maintenance work such
+    as VACUUM that runs outside a session. Override it together with
+    get_session_factory.
+    """
+    return engine
+
+def dialect_insert(db: AsyncSession, table):
+    """
+    Returns an INSERT construct for the session's dialect so callers can use
+    ``on_conflict_do_update``/``on_conflict_do_nothing`` upserts.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+class QueryCounter:
+    """
+    Counts the SQL statements executed on an engine.
+    Usage:
+        counter = QueryCounter(engine)
+        with counter:
+            ...
+        print(counter.count)
+    """
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine.sync_engine
+        self.count = 0
+        self.statements: List[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+    def reset(self) -> None:
+        self.count = 0
+        self.statements = []
+
+    def __enter__(self) -> "QueryCounter":
+        self.reset()
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
 # Export Base from models
-from .database.models import Base 
\ No newline at end of file
+from .database.models import Base 
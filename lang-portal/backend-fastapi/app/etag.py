@@ -0,0 +1,114 @@
+import hashlib
+import inspect
+import re
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .db import get_read_db
+from .database.models import (
+    Group, StudyActivity, StudySession, Word, WordGroup, WordReviewItem, WordReviewStats
+)
+from .services.versions import load_versions
+
+# GET routes answered with ETags and the tables their responses are built
+# from, first match wins. Routes that depend on the current time (due words,
+# review history, dashboard) are left out, None stops the lookup.
+ETAG_ROUTES: Sequence[Tuple["re.Pattern", Optional[Tuple[type, ...]]]] = (
+    (re.compile(r"^/api/words(/\d+)?$"), (Word, WordGroup, Group, WordReviewItem, WordReviewStats)),
+    (re.compile(r"^/api/words/search$"), (Word, WordReviewItem, WordReviewStats)),
+    (re.compile(r"^/api/groups/\d+/words$"), (Group, WordGroup, Word, WordReviewItem, WordReviewStats)),
+    (re.compile(r"^/api/study_sessions/\d+/words$"), (StudySession, Word, WordReviewItem, WordReviewStats)),
+    (re.compile(r"^/api/(groups|study_activities)/\d+/(due_words|review_history)$"), None),
+    (re.compile(r"^/api/groups(/.*)?$"), (
+        Group, WordGroup, Word, StudySession, StudyActivity, WordReviewItem
+    )),
+    (re.compile(r"^/api/study_activities(/.*)?$"), (
+        StudyActivity, StudySession, Group, WordReviewItem
+    )),
+    (re.compile(r"^/api/study_sessions(/.*)?$"), (
+        StudySession, StudyActivity, Group, Word, WordReviewItem
+    )),
+)
+
+def route_tables(path: str) -> Optional[Tuple[str, ...]]:
+    """Returns the table names behind a GET path, None if it gets no ETag"""
+    path = path.rstrip("/")
+    for pattern, models in ETAG_ROUTES:
+        if pattern.match(path):
+            return tuple(sorted(model.__tablename__ for model in models)) if models else None
+    return None
+
+def make_etag(path: str, query_string: bytes, versions: dict) -> str:
+    """Weak ETag of a URL for the given table versions"""
+    digest = hashlib.sha1(path.rstrip("/").encode())
+    digest.update(b"?" + query_string)
+    for name in sorted(versions):
+        digest.update(f"|{name}:{versions[name]}".encode())
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag``"""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+@asynccontextmanager
+async def _read_session(app) -> AsyncIterator[AsyncSession]:
+    # Resolve get_read_db like a route would, dependency overrides included
+    provider = app.dependency_overrides.get(get_read_db, get_read_db)
+    session = provider()
+    if inspect.isasyncgen(session):
+        try:
+            yield await session.__anext__()
+        finally:
+            await session.aclose()
+    else:
+        yield session
+
+class ETagMiddleware:
+    """
+    Conditional GETs for the word, group, study activity and study session
+    routes. The ETag is derived from the change versions of the tables a
+    route reads, which write routes bump in their transaction. A matching
+    If-None-Match is answered with 304 after a single version lookup,
+    without running the route. Versions are read before the route runs, so
+    a write racing with the request can only make the tag older than the
+    body, never newer.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        tables = route_tables(scope["path"])
+        if tables is None:
+            await self.app(scope, receive, send)
+            return
+
+        async with _read_session(scope["app"]) as db:
+            versions = await load_versions(db, tables)
+        etag = make_etag(scope["path"], scope.get("query_string", b""), versions)
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if etag_matches(Headers(scope=scope).get("if-none-match"), etag):
+            await Response(status_code=304, headers=cache_headers)(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                for key, value in cache_headers.items():
+                    headers[key] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
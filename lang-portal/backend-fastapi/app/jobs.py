@@ -0,0 +1,81 @@
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+from .models import JobStatus
+
+class Job:
+    """State of one background job, updated by the job while it runs"""
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "pending"
+        self.stage: Optional[str] = None
+        self.progress: Dict[str, int] = {}
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("pending", "running")
+
+    def to_status(self) -> JobStatus:
+        return JobStatus(
+            id=self.id,
+            kind=self.kind,
+            status=self.status,
+            stage=self.stage,
+            progress=dict(self.progress),
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at
+        )
+
+class JobRegistry:
+    """
+    In-process registry of background jobs, keeping the ``maxsize`` most
+    recent ones for status polling.
+    Usage:
+        job = jobs.create("full_reset")
+        background_tasks.add_task(jobs.run, job, work)
+    """
+    def __init__(self, maxsize: int = 50):
+        self.maxsize = maxsize
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def create(self, kind: str) -> Job:
+        job = Job(kind)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.maxsize:
+            oldest = next(iter(self._jobs))
+            if self._jobs[oldest].active:
+                break
+            del self._jobs[oldest]
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def active(self) -> Optional[Job]:
+        """The pending or running job, if any"""
+        return next((job for job in self._jobs.values() if job.active), None)
+
+    async def run(self, job: Job, work: Callable[[Job], Awaitable[None]]) -> None:
+        """Runs ``work(job)`` and records its outcome on the job"""
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        try:
+            await work(job)
+            job.status = "succeeded"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.stage = None
+            job.finished_at = datetime.utcnow()
+
+# Resets and other long running maintenance jobs
+jobs = JobRegistry()
@@ -1,6 +1,5 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from tasks.init_db import init_db
 from .routers import (
     dashboard,
     words,
@@ -9,18 +8,22 @@ from .routers import (
     study_sessions,
     system
 )
+from .etag import ETagMiddleware
+from .startup import lifespan
 from .utils import PaginationParams  # Import from utils, not models
 from .database import models  # Add this import
 
 app = FastAPI(
     title="Language Learning Portal API",
     description="API for managing vocabulary and study sessions",
-    version="1.0.0"
+    version="1.0.0",
+    # Checks the schema revision, optionally migrates and warms the pool
+    lifespan=lifespan
 )
 
-@app.on_event("startup")
-async def startup_event():
-    init_db() 
+# Answer If-None-Match on read routes from the table versions, added
+# before CORS so that 304 responses get CORS headers as well
+app.add_middleware(ETagMiddleware)
 
 # Configure CORS
 app.add_middleware(
@@ -1,18 +1,26 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
-from datetime import datetime
+from datetime import date, datetime
 
 # Base Models
 class PaginationResponse(BaseModel):
-    current_page: int
-    total_pages: int
-    total_items: int
+    current_page: Optional[int]
+    total_pages: Optional[int]
+    total_items: Optional[int]
     items_per_page: int
+    next_cursor: Optional[str] = None
 
 # Request Models
 class ReviewWordRequest(BaseModel):
     correct: bool
 
+class WordReview(BaseModel):
+    word_id: int
+    correct: bool
+
+class BulkReviewRequest(BaseModel):
+    reviews: List[WordReview] = Field(..., min_length=1, max_length=1000)
+
 # Response Models
 class StudySessionResponse(BaseModel):
     id: int
@@ -25,6 +33,35 @@ class StudySessionResponse(BaseModel):
     end_time: datetime
     review_items_count: int
 
+class WordReviewResult(BaseModel):
+    word_id: int
+    correct: bool
+    recorded: bool
+    error: Optional[str] = None
+
+class BulkReviewResponse(BaseModel):
+    success: bool
+    study_session_id: int
+    recorded_count: int
+    failed_count: int
+    created_at: datetime
+    results: List[WordReviewResult]
+
+class ReviewHistoryDay(BaseModel):
+    day: date
+    reviews: int
+    correct_count: int
+    success_rate: float
+    distinct_words: int
+
+class ReviewHistoryResponse(BaseModel):
+    dimension: str
+    key_id: Optional[int] = None
+    days: int
+    total_reviews: int
+    success_rate: float
+    items: list[ReviewHistoryDay]
+
 class StudyProgressResponse(BaseModel):
     total_words_studied: int
     total_available_words: int
@@ -98,6 +135,21 @@ class StudyActivityCreateResponse(BaseModel):
     id: int
     group_id: int
 
+class DueWord(BaseModel):
+    id: int
+    japanese: str
+    romaji: str
+    english: str
+    is_new: bool
+    due_at: Optional[datetime] = None
+    interval_days: int = 0
+    ease: float = 2.5
+    repetitions: int = 0
+
+class DueWordsResponse(BaseModel):
+    group_id: int
+    items: list[DueWord]
+
 class StudySessionInList(BaseModel):
     id: int
     activity_name: str
@@ -111,4 +163,19 @@ class StudySessionInList(BaseModel):
 
 class StudySessionListResponse(BaseModel):
     items: list[StudySessionInList]
-    pagination: PaginationResponse 
\ No newline at end of file
+    pagination: PaginationResponse
+
+class ImportResponse(BaseModel):
+    lines: int
+    rows: dict[str, int]
+
+class JobStatus(BaseModel):
+    id: str
+    kind: str
+    status: str  # pending, running, succeeded or failed
+    stage: Optional[str] = None
+    progress: Dict[str, int]
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
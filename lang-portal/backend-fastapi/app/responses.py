@@ -0,0 +1,39 @@
+import json
+from datetime import date, datetime
+from typing import Any, Dict
+from fastapi.responses import JSONResponse
+from .config import get_settings
+
+try:
+    import orjson
+except ImportError:  # optional, pip install -e .[fast]
+    orjson = None
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when it is installed, else with the
+    standard library. FastAPI does not validate a returned Response against
+    the route's response_model, so the content must already have its shape.
+    """
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=_default
+        ).encode("utf-8")
+
+def fast_responses_enabled() -> bool:
+    """Whether list endpoints take the pre-validated row fast path"""
+    return get_settings().fast_json_responses
+
+def list_response(payload: Dict[str, Any], fast: bool):
+    """
+    Returns a paginated payload as is, for FastAPI to validate against the
+    response_model, or as a FastJSONResponse when the items are plain rows.
+    """
+    return FastJSONResponse(payload) if fast else payload
@@ -1,50 +1,43 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from datetime import datetime, timedelta
-from ..db import get_db
-from ..database.models import StudySession, StudyActivity, Group, Word, WordReviewItem
+from sqlalchemy import select, func, cast, true, Date, Integer
+from datetime import date, datetime
+from ..db import get_read_db
+from ..database.models import StudySession, StudyActivity, Group, Word, WordReviewItem, WordReviewStats
 from ..models import (
     StudySessionResponse,
     StudyProgressResponse,
-    QuickStatsResponse
+    QuickStatsResponse,
+    ReviewHistoryResponse
 )
 from ..utils import validate_entity_exists
-from sqlalchemy.orm import joinedload
+from ..cache import dashboard_cache
+from ..services.rollups import DIMENSION_ALL, load_review_history
+from ..services.sessions import get_session_summary
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 @router.get("/last_study_session", response_model=StudySessionResponse)
-async def get_last_study_session(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(StudySession)
-        .options(joinedload(StudySession.activity), joinedload(StudySession.group))
-        .order_by(StudySession.created_at.desc())
-        .limit(1)
+async def get_last_study_session(db: AsyncSession = Depends(get_read_db)):
+    return await dashboard_cache.get_or_compute(
+        "last_study_session",
+        lambda: compute_last_study_session(db)
     )
-    session = result.unique().scalar_one_or_none()
+
+async def compute_last_study_session(db: AsyncSession) -> StudySessionResponse:
+    session = await get_session_summary(db, latest=True)
     validate_entity_exists(session, "Study session")
     
-    review_count = await db.scalar(
-        select(func.count())
-        .select_from(WordReviewItem)
-        .where(WordReviewItem.study_session_id == session.id)
-    )
-    
-    return StudySessionResponse(
-        id=session.id,
-        activity_name=session.activity.name,
-        group_name=session.group.name,
-        group_id=session.group_id,
-        study_activity_id=session.study_activity_id,
-        created_at=session.created_at,
-        start_time=session.created_at,
-        end_time=session.created_at,
-        review_items_count=review_count or 0
-    )
+    return StudySessionResponse(**session.model_dump())
 
 @router.get("/study_progress", response_model=StudyProgressResponse)
-async def get_study_progress(db: AsyncSession = Depends(get_db)):
+async def get_study_progress(db: AsyncSession = Depends(get_read_db)):
+    return await dashboard_cache.get_or_compute(
+        "study_progress",
+        lambda: compute_study_progress(db)
+    )
+
+async def compute_study_progress(db: AsyncSession) -> StudyProgressResponse:
     # Get total available words
     total_words = await db.scalar(select(func.count()).select_from(Word))
     
@@ -60,52 +53,94 @@ async def get_study_progress(db: AsyncSession = Depends(get_db)):
         total_available_words=total_words or 0
     )
 
-@router.get("/quick-stats", response_model=QuickStatsResponse)
-async def get_quick_stats(db: AsyncSession = Depends(get_db)):
-    # Get total correct and wrong reviews
-    correct_reviews = await db.scalar(
-        select(func.count())
-        .select_from(WordReviewItem)
-        .where(WordReviewItem.correct == True)
-    )
-    total_reviews = await db.scalar(
-        select(func.count())
-        .select_from(WordReviewItem)
-    )
+def _study_streak_subquery(dialect_name: str, today: date):
+    """
+    Length of the run of consecutive study days ending today (0 if none today).
+    Gaps and islands: consecutive days minus their row number share one
+    island key, so the streak is the size of today's island.
+    """
+    if dialect_name == "postgresql":
+        day = cast(StudySession.created_at, Date)
+        today_value = today
+    else:
+        day = func.date(StudySession.created_at)
+        today_value = today.isoformat()
     
-    # Calculate success rate
-    success_rate = (correct_reviews / total_reviews * 100) if total_reviews > 0 else 0
+    days = select(day.label("day")).distinct().cte("study_days")
+    row_number = func.row_number().over(order_by=days.c.day)
+    if dialect_name == "postgresql":
+        island = days.c.day - cast(row_number, Integer)
+    else:
+        island = func.julianday(days.c.day) - row_number
+    islands = select(days.c.day, island.label("island")).cte("study_islands")
     
-    # Get total study sessions
-    total_sessions = await db.scalar(
-        select(func.count())
-        .select_from(StudySession)
+    today_island = select(islands.c.island)\
+        .where(islands.c.day == today_value)\
+        .scalar_subquery()
+    return select(func.count())\
+        .select_from(islands)\
+        .where(islands.c.island == today_island)\
+        .scalar_subquery()
+
+@router.get("/quick-stats", response_model=QuickStatsResponse)
+async def get_quick_stats(db: AsyncSession = Depends(get_read_db)):
+    # The streak depends on the current day, so it is part of the key
+    today = datetime.utcnow().date()
+    return await dashboard_cache.get_or_compute(
+        ("quick-stats", today),
+        lambda: compute_quick_stats(db, today)
     )
+
+async def compute_quick_stats(db: AsyncSession, today: date) -> QuickStatsResponse:
+    # Review totals come from the per-word counters, session totals from one
+    # scan of study_sessions, and the streak from one gaps-and-islands pass
+    reviews = select(
+        func.coalesce(func.sum(WordReviewStats.correct_count), 0).label("correct_reviews"),
+        func.coalesce(
+            func.sum(WordReviewStats.correct_count + WordReviewStats.wrong_count), 0
+        ).label("total_reviews")
+    ).subquery()
+    sessions = select(
+        func.count().label("total_sessions"),
+        func.count(StudySession.group_id.distinct()).label("active_groups")
+    ).subquery()
+    streak = _study_streak_subquery(db.get_bind().dialect.name, today)
     
-    # Get total active groups (groups with study sessions)
-    active_groups = await db.scalar(
-        select(func.count(StudySession.group_id.distinct()))
-        .select_from(StudySession)
+    result = await db.execute(
+        select(
+            reviews.c.correct_reviews,
+            reviews.c.total_reviews,
+            sessions.c.total_sessions,
+            sessions.c.active_groups,
+            streak.label("study_streak_days")
+        ).select_from(reviews).join(sessions, true())
     )
+    stats = result.one()
     
-    # Calculate study streak (consecutive days with sessions)
-    today = datetime.utcnow().date()
-    streak = 0
-    current_date = today
-    
-    while True:
-        has_session = await db.scalar(
-            select(StudySession)
-            .where(func.date(StudySession.created_at) == current_date)
-        )
-        if not has_session:
-            break
-        streak += 1
-        current_date -= timedelta(days=1)
+    # Calculate success rate
+    total_reviews = stats.total_reviews or 0
+    success_rate = (stats.correct_reviews / total_reviews * 100) if total_reviews > 0 else 0
     
     return QuickStatsResponse(
         success_rate=round(success_rate, 1),
-        total_study_sessions=total_sessions or 0,
-        total_active_groups=active_groups or 0,
-        study_streak_days=streak
-    ) 
\ No newline at end of file
+        total_study_sessions=stats.total_sessions or 0,
+        total_active_groups=stats.active_groups or 0,
+        study_streak_days=stats.study_streak_days or 0
+    )
+
+@router.get("/review_history", response_model=ReviewHistoryResponse)
+async def get_review_history(
+    days: int = Query(90, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Daily reviews and success rate over the last ``days`` days, from the rollups"""
+    today = datetime.utcnow().date()
+    return await dashboard_cache.get_or_compute(
+        ("review_history", days, today),
+        lambda: load_review_history(db, DIMENSION_ALL, 0, days, today)
+    )
+
+@router.get("/cache_stats")
+async def get_cache_stats():
+    """Hit/miss counters of the dashboard response cache"""
+    return dashboard_cache.stats()
@@ -1,18 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import joinedload
-from ..db import get_db
-from ..database.models import Group, Word, WordGroup, StudySession, WordReviewItem, StudyActivity
+from datetime import datetime
+from ..db import get_read_db
+from ..database.models import Group, Word, WordGroup, StudySession
 from ..models import (
     GroupListResponse, GroupDetail, GroupStats, GroupInList,
-    WordInList, WordListResponse, StudySessionInList, StudySessionListResponse
+    WordListResponse, StudySessionListResponse, DueWordsResponse,
+    ReviewHistoryResponse
 )
+from ..services.rollups import DIMENSION_GROUP, load_review_history
+from ..services.scheduler import load_due_words
+from ..services.sessions import list_sessions
+from ..services.word_stats import build_word_list
+from ..responses import fast_responses_enabled, list_response
 from ..utils import (
     create_paginated_response, 
     validate_entity_exists,
     create_success_response,
-    PaginationParams
+    PaginationParams,
+    paginate_query,
+    split_page,
+    count_total
 )
 
 router = APIRouter(prefix="/api/groups", tags=["groups"])
@@ -20,16 +30,12 @@ router = APIRouter(prefix="/api/groups", tags=["groups"])
 @router.get("/", response_model=GroupListResponse)
 async def get_groups(
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    total_count = await db.scalar(select(func.count()).select_from(Group))
+    total_count = await count_total(db, select(func.count()).select_from(Group), pagination)
     
-    result = await db.execute(
-        select(Group)
-        .offset((pagination.page - 1) * pagination.items_per_page)
-        .limit(pagination.items_per_page)
-    )
-    groups = result.scalars().all()
+    result = await db.execute(paginate_query(select(Group), pagination, Group.id))
+    groups, next_cursor = split_page(result.scalars().all(), pagination, lambda g: (g.id,))
     
     # Get word count for each group
     group_list = []
@@ -47,10 +53,10 @@ async def get_groups(
             )
         )
     
-    return create_paginated_response(group_list, total_count, pagination)
+    return create_paginated_response(group_list, total_count, pagination, next_cursor)
 
 @router.get("/{group_id}", response_model=GroupDetail)
-async def get_group(group_id: int, db: AsyncSession = Depends(get_db)):
+async def get_group(group_id: int, db: AsyncSession = Depends(get_read_db)):
     query = select(Group).options(joinedload(Group.words)).where(Group.id == group_id)
     result = await db.execute(query)
     group = result.unique().scalar_one_or_none()
@@ -72,96 +78,91 @@ async def get_group(group_id: int, db: AsyncSession = Depends(get_db)):
 async def get_group_words(
     group_id: int,
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     group = await db.scalar(select(Group).where(Group.id == group_id))
     validate_entity_exists(group, "Group")
     
-    total_count = await db.scalar(
+    total_count = await count_total(
+        db,
         select(func.count())
         .select_from(Word)
         .join(WordGroup)
-        .where(WordGroup.group_id == group_id)
+        .where(WordGroup.group_id == group_id),
+        pagination
     )
     
     result = await db.execute(
-        select(Word)
-        .join(WordGroup)
-        .where(WordGroup.group_id == group_id)
-        .offset((pagination.page - 1) * pagination.items_per_page)
-        .limit(pagination.items_per_page)
+        paginate_query(
+            select(Word)
+            .join(WordGroup)
+            .where(WordGroup.group_id == group_id),
+            pagination,
+            Word.id
+        )
     )
-    words = result.scalars().all()
+    words, next_cursor = split_page(result.scalars().all(), pagination, lambda w: (w.id,))
     
-    word_list = []
-    for word in words:
-        correct_count = await db.scalar(
-            select(func.count())
-            .select_from(WordReviewItem)
-            .where(WordReviewItem.word_id == word.id)
-            .where(WordReviewItem.correct == True)
-        )
-        wrong_count = await db.scalar(
-            select(func.count())
-            .select_from(WordReviewItem)
-            .where(WordReviewItem.word_id == word.id)
-            .where(WordReviewItem.correct == False)
-        )
-        word_list.append(
-            WordInList(
-                japanese=word.japanese,
-                romaji=word.romaji,
-                english=word.english,
-                correct_count=correct_count or 0,
-                wrong_count=wrong_count or 0
-            )
-        )
+    fast = fast_responses_enabled()
+    word_list = await build_word_list(db, words, as_rows=fast)
     
-    return create_paginated_response(word_list, total_count, pagination)
+    return list_response(
+        create_paginated_response(word_list, total_count, pagination, next_cursor), fast
+    )
+
+@router.get("/{group_id}/due_words", response_model=DueWordsResponse)
+async def get_group_due_words(
+    group_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Returns the next words of the group to study, scheduled with SM-2.
+    Overdue words come first, then words that were never reviewed.
+    """
+    group = await db.scalar(select(Group).where(Group.id == group_id))
+    validate_entity_exists(group, "Group")
+    
+    words = await load_due_words(db, group_id, limit)
+    
+    return DueWordsResponse(group_id=group_id, items=words)
+
+@router.get("/{group_id}/review_history", response_model=ReviewHistoryResponse)
+async def get_group_review_history(
+    group_id: int,
+    days: int = Query(90, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Daily progress of the group (reviews, success rate, distinct words) from the rollups"""
+    group = await db.scalar(select(Group).where(Group.id == group_id))
+    validate_entity_exists(group, "Group")
+    
+    return await load_review_history(
+        db, DIMENSION_GROUP, group_id, days, datetime.utcnow().date()
+    )
 
 @router.get("/{group_id}/study_sessions", response_model=StudySessionListResponse)
 async def get_group_study_sessions(
     group_id: int,
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     group = await db.scalar(select(Group).where(Group.id == group_id))
     validate_entity_exists(group, "Group")
     
-    total_count = await db.scalar(
+    total_count = await count_total(
+        db,
         select(func.count())
         .select_from(StudySession)
-        .where(StudySession.group_id == group_id)
+        .where(StudySession.group_id == group_id),
+        pagination
     )
     
-    result = await db.execute(
-        select(StudySession, StudyActivity)
-        .join(StudyActivity)
-        .where(StudySession.group_id == group_id)
-        .offset((pagination.page - 1) * pagination.items_per_page)
-        .limit(pagination.items_per_page)
+    fast = fast_responses_enabled()
+    session_list, next_cursor = await list_sessions(
+        db, pagination, StudySession.group_id == group_id, as_rows=fast
     )
-    sessions = result.all()
-    
-    session_list = []
-    for session, activity in sessions:
-        review_count = await db.scalar(
-            select(func.count())
-            .select_from(WordReviewItem)
-            .where(WordReviewItem.study_session_id == session.id)
-        )
-        session_list.append(
-            StudySessionInList(
-                id=session.id,
-                activity_name=activity.name,
-                group_name=group.name,
-                group_id=session.group_id,
-                study_activity_id=session.study_activity_id,
-                created_at=session.created_at,
-                start_time=session.created_at,
-                end_time=session.created_at,
-                review_items_count=review_count or 0
-            )
-        )
     
-    return create_paginated_response(session_list, total_count, pagination) 
\ No newline at end of file
+    return list_response(
+        create_paginated_response(session_list, total_count, pagination, next_cursor), fast
+    )
\ No newline at end of file
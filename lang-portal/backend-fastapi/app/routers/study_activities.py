@@ -1,27 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import joinedload
 from typing import List
-from ..db import get_db
-from ..database.models import StudyActivity, StudySession, Group, WordReviewItem
+from datetime import datetime
+from ..db import get_db, get_read_db
+from ..database.models import StudyActivity, StudySession, Group
 from ..models import (
     StudyActivityDetail,
     StudyActivityCreate,
     StudyActivityCreateResponse,
-    StudySessionInList,
-    StudySessionListResponse
+    StudySessionListResponse,
+    ReviewHistoryResponse
 )
+from ..cache import dashboard_cache
+from ..services.rollups import DIMENSION_ACTIVITY, load_review_history
+from ..services.sessions import list_sessions
+from ..services.versions import bump_versions
+from ..responses import fast_responses_enabled, list_response
 from ..utils import (
     create_paginated_response,
     validate_entity_exists,
-    PaginationParams
+    PaginationParams,
+    count_total
 )
 
 router = APIRouter(prefix="/api/study_activities", tags=["study_activities"])
 
 @router.get("/{activity_id}", response_model=StudyActivityDetail)
-async def get_activity(activity_id: int, db: AsyncSession = Depends(get_db)):
+async def get_activity(activity_id: int, db: AsyncSession = Depends(get_read_db)):
     query = select(StudyActivity).options(joinedload(StudyActivity.sessions)).where(StudyActivity.id == activity_id)
     result = await db.execute(query)
     activity = result.unique().scalar_one_or_none()
@@ -37,7 +44,7 @@ async def get_activity(activity_id: int, db: AsyncSession = Depends(get_db)):
     )
 
 @router.get("", response_model=List[StudyActivityDetail])
-async def get_all_activities(db: AsyncSession = Depends(get_db)):
+async def get_all_activities(db: AsyncSession = Depends(get_read_db)):
     query = select(StudyActivity)
     result = await db.execute(query)
     activities = result.scalars().all()
@@ -52,7 +59,7 @@ async def get_all_activities(db: AsyncSession = Depends(get_db)):
 async def get_activity_sessions(
     activity_id: int,
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     # Verify activity exists
     activity = await db.scalar(select(StudyActivity).where(StudyActivity.id == activity_id))
@@ -63,51 +70,30 @@ async def get_activity_sessions(
     count_query = select(func.count())\
         .select_from(StudySession)\
         .where(StudySession.study_activity_id == activity_id)
-    total_count = await db.scalar(count_query)
-    
-    # Get paginated sessions with group info
-    query = select(StudySession)\
-        .options(joinedload(StudySession.group))\
-        .where(StudySession.study_activity_id == activity_id)\
-        .offset((pagination.page - 1) * pagination.items_per_page)\
-        .limit(pagination.items_per_page)
-    
-    result = await db.execute(query)
-    sessions = result.unique().scalars().all()
+    total_count = await count_total(db, count_query, pagination)
     
-    # Get review counts for each session
-    session_stats = {}
-    for session in sessions:
-        review_count = await db.scalar(
-            select(func.count())
-            .select_from(WordReviewItem)
-            .where(WordReviewItem.study_session_id == session.id)
-        )
-        session_stats[session.id] = review_count or 0
+    # Get paginated sessions with group names and review counts in one query
+    fast = fast_responses_enabled()
+    session_list, next_cursor = await list_sessions(
+        db, pagination, StudySession.study_activity_id == activity_id, as_rows=fast
+    )
     
-    # Convert to response model
-    session_list = [
-        StudySessionInList(
-            id=session.id,
-            activity_name=activity.name,
-            group_name=session.group.name,
-            group_id=session.group_id,
-            study_activity_id=session.study_activity_id,
-            created_at=session.created_at,
-            start_time=session.created_at,
-            end_time=session.created_at,
-            review_items_count=session_stats[session.id]
-        ) for session in sessions
-    ]
+    return list_response(
+        create_paginated_response(session_list, total_count, pagination, next_cursor), fast
+    )
+
+@router.get("/{activity_id}/review_history", response_model=ReviewHistoryResponse)
+async def get_activity_review_history(
+    activity_id: int,
+    days: int = Query(90, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Daily reviews and success rate of the activity from the rollups"""
+    activity = await db.scalar(select(StudyActivity).where(StudyActivity.id == activity_id))
+    validate_entity_exists(activity, "Study activity")
     
-    return StudySessionListResponse(
-        items=session_list,
-        pagination={
-            "current_page": pagination.page,
-            "total_pages": (total_count + pagination.items_per_page - 1) // pagination.items_per_page,
-            "total_items": total_count,
-            "items_per_page": pagination.items_per_page
-        }
+    return await load_review_history(
+        db, DIMENSION_ACTIVITY, activity_id, days, datetime.utcnow().date()
     )
 
 @router.post("", response_model=StudyActivityCreateResponse)
@@ -120,16 +106,25 @@ async def create_activity(
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     
-    # Create new activity
-    new_activity = StudyActivity(
+    # Verify study activity exists
+    study_activity = await db.scalar(
+        select(StudyActivity).where(StudyActivity.id == activity.study_activity_id)
+    )
+    if not study_activity:
+        raise HTTPException(status_code=404, detail="Study activity not found")
+    
+    # Launching an activity starts a new study session
+    new_session = StudySession(
         group_id=activity.group_id,
         study_activity_id=activity.study_activity_id
     )
-    db.add(new_activity)
+    db.add(new_session)
+    await bump_versions(db, StudySession)
     await db.commit()
-    await db.refresh(new_activity)
+    await db.refresh(new_session)
+    dashboard_cache.invalidate()
     
     return StudyActivityCreateResponse(
-        id=new_activity.id,
-        group_id=new_activity.group_id
+        id=new_session.id,
+        group_id=new_session.group_id
     ) 
\ No newline at end of file
@@ -1,22 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import joinedload
-from ..db import get_db
+from sqlalchemy import select, func, insert
+from datetime import datetime
+from ..db import get_db, get_read_db
 from ..database.models import StudySession, StudyActivity, Group, Word, WordReviewItem
 from ..models import (
     StudySessionResponse,
-    StudySessionInList,
     StudySessionListResponse,
-    WordInList,
     WordListResponse,
-    ReviewWordRequest
+    ReviewWordRequest,
+    BulkReviewRequest,
+    BulkReviewResponse,
+    WordReviewResult
 )
+from ..services.rollups import INLINE_CATCH_UP_LIMIT, catch_up_rollups
+from ..services.scheduler import update_schedules
+from ..services.sessions import list_sessions, get_session_summary
+from ..services.versions import bump_versions
+from ..services.word_stats import build_word_list, record_review, increment_word_stats
+from ..cache import dashboard_cache
+from ..responses import fast_responses_enabled, list_response
 from ..utils import (
     create_paginated_response,
     validate_entity_exists,
     create_success_response,
-    PaginationParams
+    PaginationParams,
+    paginate_query,
+    split_page,
+    count_total
 )
 
 router = APIRouter(prefix="/api/study_sessions", tags=["study_sessions"])
@@ -24,119 +35,61 @@ router = APIRouter(prefix="/api/study_sessions", tags=["study_sessions"])
 @router.get("/", response_model=StudySessionListResponse)
 async def get_sessions(
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    total_count = await db.scalar(select(func.count()).select_from(StudySession))
+    total_count = await count_total(db, select(func.count()).select_from(StudySession), pagination)
     
-    result = await db.execute(
-        select(StudySession)
-        .options(joinedload(StudySession.activity), joinedload(StudySession.group))
-        .offset((pagination.page - 1) * pagination.items_per_page)
-        .limit(pagination.items_per_page)
-    )
-    sessions = result.unique().scalars().all()
+    fast = fast_responses_enabled()
+    session_list, next_cursor = await list_sessions(db, pagination, as_rows=fast)
     
-    session_list = []
-    for session in sessions:
-        review_count = await db.scalar(
-            select(func.count())
-            .select_from(WordReviewItem)
-            .where(WordReviewItem.study_session_id == session.id)
-        )
-        session_list.append(
-            StudySessionInList(
-                id=session.id,
-                activity_name=session.activity.name,
-                group_name=session.group.name,
-                group_id=session.group_id,
-                study_activity_id=session.study_activity_id,
-                created_at=session.created_at,
-                start_time=session.created_at,
-                end_time=session.created_at,
-                review_items_count=review_count or 0
-            )
-        )
-    
-    return create_paginated_response(session_list, total_count, pagination)
+    return list_response(
+        create_paginated_response(session_list, total_count, pagination, next_cursor), fast
+    )
 
 @router.get("/{session_id}", response_model=StudySessionResponse)
-async def get_session(session_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(StudySession)
-        .options(joinedload(StudySession.activity), joinedload(StudySession.group))
-        .where(StudySession.id == session_id)
-    )
-    session = result.unique().scalar_one_or_none()
+async def get_session(session_id: int, db: AsyncSession = Depends(get_read_db)):
+    session = await get_session_summary(db, StudySession.id == session_id)
     validate_entity_exists(session, "Study session")
     
-    review_count = await db.scalar(
-        select(func.count())
-        .select_from(WordReviewItem)
-        .where(WordReviewItem.study_session_id == session.id)
-    )
-    
-    return StudySessionResponse(
-        id=session.id,
-        activity_name=session.activity.name,
-        group_name=session.group.name,
-        group_id=session.group.id,
-        study_activity_id=session.activity.id,
-        created_at=session.created_at,
-        start_time=session.created_at,
-        end_time=session.created_at,
-        review_items_count=review_count or 0
-    )
+    return StudySessionResponse(**session.model_dump())
 
 @router.get("/{session_id}/words", response_model=WordListResponse)
 async def get_session_words(
     session_id: int,
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     session = await db.scalar(select(StudySession).where(StudySession.id == session_id))
     validate_entity_exists(session, "Study session")
     
-    total_count = await db.scalar(
+    total_count = await count_total(
+        db,
         select(func.count())
         .select_from(Word)
         .join(WordReviewItem)
-        .where(WordReviewItem.study_session_id == session_id)
+        .where(WordReviewItem.study_session_id == session_id),
+        pagination
     )
     
+    # One row per review, keyed on the review id
     result = await db.execute(
-        select(Word)
-        .join(WordReviewItem)
-        .where(WordReviewItem.study_session_id == session_id)
-        .offset((pagination.page - 1) * pagination.items_per_page)
-        .limit(pagination.items_per_page)
+        paginate_query(
+            select(Word, WordReviewItem.id)
+            .join(WordReviewItem)
+            .where(WordReviewItem.study_session_id == session_id),
+            pagination,
+            WordReviewItem.id
+        )
     )
-    words = result.scalars().all()
+    rows, next_cursor = split_page(result.all(), pagination, lambda row: (row[1],))
+    words = [word for word, _ in rows]
     
-    word_list = []
-    for word in words:
-        correct_count = await db.scalar(
-            select(func.count())
-            .select_from(WordReviewItem)
-            .where(WordReviewItem.word_id == word.id)
-            .where(WordReviewItem.correct == True)
-        )
-        wrong_count = await db.scalar(
-            select(func.count())
-            .select_from(WordReviewItem)
-            .where(WordReviewItem.word_id == word.id)
-            .where(WordReviewItem.correct == False)
-        )
-        word_list.append(
-            WordInList(
-                japanese=word.japanese,
-                romaji=word.romaji,
-                english=word.english,
-                correct_count=correct_count or 0,
-                wrong_count=wrong_count or 0
-            )
-        )
+    fast = fast_responses_enabled()
+    word_list = await build_word_list(db, words, as_rows=fast)
     
-    return create_paginated_response(word_list, total_count, pagination)
+    return list_response(
+        create_paginated_response(word_list, total_count, pagination, next_cursor), fast
+    )
 
 @router.post("/{session_id}/words/{word_id}/review")
 async def review_word(
@@ -157,8 +110,15 @@ async def review_word(
         correct=review.correct
     )
     db.add(review_item)
+    await db.flush()
+    # Keep the materialized counters, schedule and rollups in the same transaction
+    await record_review(db, word_id, review.correct, review_item.created_at)
+    await update_schedules(db, [(word_id, review.correct)], review_item.created_at)
+    await catch_up_rollups(db, max_reviews=INLINE_CATCH_UP_LIMIT)
+    await bump_versions(db, WordReviewItem)
     await db.commit()
     await db.refresh(review_item)
+    dashboard_cache.invalidate()
     
     return create_success_response(
         "Review recorded successfully",
@@ -168,4 +128,69 @@ async def review_word(
             "correct": review.correct,
             "created_at": review_item.created_at
         }
-    ) 
\ No newline at end of file
+    ) 
+
+@router.post("/{session_id}/review", response_model=BulkReviewResponse)
+async def review_words(
+    session_id: int,
+    payload: BulkReviewRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Records a batch of reviews for one study session.
+    Word ids are validated with a single IN query, valid reviews are
+    inserted with one executemany and everything is committed once.
+    Unknown words are reported per item and do not fail the batch.
+    """
+    session = await db.scalar(select(StudySession).where(StudySession.id == session_id))
+    validate_entity_exists(session, "Study session")
+    
+    word_ids = {review.word_id for review in payload.reviews}
+    existing_ids = set(await db.scalars(select(Word.id).where(Word.id.in_(word_ids))))
+    
+    created_at = datetime.utcnow()
+    rows = []
+    results = []
+    counts = {}
+    for review in payload.reviews:
+        if review.word_id not in existing_ids:
+            results.append(WordReviewResult(
+                word_id=review.word_id,
+                correct=review.correct,
+                recorded=False,
+                error="Word not found"
+            ))
+            continue
+        rows.append({
+            "word_id": review.word_id,
+            "study_session_id": session_id,
+            "correct": review.correct,
+            "created_at": created_at
+        })
+        correct, wrong = counts.get(review.word_id, (0, 0))
+        counts[review.word_id] = (correct + 1, wrong) if review.correct else (correct, wrong + 1)
+        results.append(WordReviewResult(
+            word_id=review.word_id,
+            correct=review.correct,
+            recorded=True
+        ))
+    
+    if rows:
+        await db.execute(insert(WordReviewItem), rows)
+        await increment_word_stats(db, counts, created_at)
+        await update_schedules(
+            db, [(row["word_id"], row["correct"]) for row in rows], created_at
+        )
+        await catch_up_rollups(db, max_reviews=INLINE_CATCH_UP_LIMIT)
+        await bump_versions(db, WordReviewItem)
+        await db.commit()
+        dashboard_cache.invalidate()
+    
+    return BulkReviewResponse(
+        success=len(rows) == len(payload.reviews),
+        study_session_id=session_id,
+        recorded_count=len(rows),
+        failed_count=len(payload.reviews) - len(rows),
+        created_at=created_at,
+        results=results
+    )
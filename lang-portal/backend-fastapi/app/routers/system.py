@@ -1,30 +1,149 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete
-from ..db import get_db
-from ..database.models import StudySession, WordReviewItem, Word, Group, WordGroup
+from typing import Callable, List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from ..config import get_settings
+from ..db import get_db, get_engine, get_read_db, get_session_factory
+from ..models import ImportResponse, JobStatus
+from ..cache import dashboard_cache
+from ..jobs import Job, jobs
+from ..services.resets import FULL_RESET_MODELS, RESET_HISTORY_MODELS, reset_tables, vacuum as vacuum_database
+from ..services.transfer import (
+    NDJSON_MEDIA_TYPE, InvalidImportLine, export_ndjson, import_ndjson, iter_lines
+)
 from ..utils import create_success_response
 
 router = APIRouter(prefix="/api", tags=["system"])
 
+async def _start_reset(
+    kind: str,
+    models: List[type],
+    session_factory: Callable[[], AsyncSession],
+    engine: AsyncEngine,
+    background_tasks: BackgroundTasks,
+    run_vacuum: bool
+) -> Job:
+    """
+    Queues a reset job that empties ``models`` in batches, see reset_tables().
+    Raises:
+        HTTPException: 409 if another maintenance job is still running
+    """
+    running = jobs.active()
+    if running:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job {running.id} ({running.kind}) is still running"
+        )
+    settings = get_settings()
+    job = jobs.create(kind)
+
+    async def work(job: Job) -> None:
+        def on_stage(stage: str) -> None:
+            job.stage = stage
+        try:
+            await reset_tables(
+                session_factory,
+                models,
+                batch_size=settings.reset_batch_size,
+                pause=settings.reset_batch_pause_ms / 1000,
+                progress=job.progress,
+                on_stage=on_stage
+            )
+        finally:
+            dashboard_cache.invalidate()
+        if run_vacuum:
+            on_stage("vacuum")
+            await vacuum_database(engine)
+
+    background_tasks.add_task(jobs.run, job, work)
+    return job
+
+def _job_started(message: str, job: Job) -> dict:
+    return create_success_response(
+        message, {"job_id": job.id, "status_url": f"/api/jobs/{job.id}"}
+    )
+
 @router.post("/reset_history")
-async def reset_history(db: AsyncSession = Depends(get_db)):
-    # Delete all review items
-    await db.execute(delete(WordReviewItem))
-    # Delete all study sessions
-    await db.execute(delete(StudySession))
-    await db.commit()
-    
-    return create_success_response("Study history has been reset")
+async def reset_history(
+    background_tasks: BackgroundTasks,
+    vacuum: bool = Query(False, description="Reclaim the freed disk space afterwards"),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+    engine: AsyncEngine = Depends(get_engine)
+):
+    """
+    Deletes all review items, their counters, schedules and rollups and all
+    study sessions, in a background job. Poll ``status_url`` for progress.
+    """
+    job = await _start_reset(
+        "reset_history", RESET_HISTORY_MODELS, session_factory, engine, background_tasks, vacuum
+    )
+    return _job_started("Study history reset started", job)
 
 @router.post("/full_reset")
-async def full_reset(db: AsyncSession = Depends(get_db)):
-    # Delete everything in order due to foreign key constraints
-    await db.execute(delete(WordReviewItem))
-    await db.execute(delete(StudySession))
-    await db.execute(delete(WordGroup))
-    await db.execute(delete(Word))
-    await db.execute(delete(Group))
-    await db.commit()
-    
-    return create_success_response("System has been fully reset") 
\ No newline at end of file
+async def full_reset(
+    background_tasks: BackgroundTasks,
+    vacuum: bool = Query(False, description="Reclaim the freed disk space afterwards"),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+    engine: AsyncEngine = Depends(get_engine)
+):
+    """
+    Deletes everything, children before parents due to foreign key
+    constraints, in a background job. Poll ``status_url`` for progress.
+    """
+    job = await _start_reset(
+        "full_reset", FULL_RESET_MODELS, session_factory, engine, background_tasks, vacuum
+    )
+    return _job_started("Full reset started", job)
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_status()
+
+@router.get("/export")
+async def export_data(db: AsyncSession = Depends(get_read_db)):
+    """
+    Streams words, groups, links, activities, sessions and reviews as NDJSON.
+    The response is produced batch by batch, so memory use does not depend
+    on the size of the database.
+    """
+    async def stream():
+        try:
+            async for chunk in export_ndjson(db):
+                yield chunk
+        finally:
+            # The dependency has already exited once streaming starts
+            await db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="lang-portal-export.ndjson"'}
+    )
+
+@router.post("/import", response_model=ImportResponse)
+async def import_data(
+    request: Request,
+    start_line: int = Query(0, ge=0, description="Lines already imported, to resume an import"),
+    chunk_size: int = Query(1000, ge=1, le=100000, description="Lines per transaction"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Imports an NDJSON export from the streamed request body.
+    Every chunk is committed on its own, existing rows are skipped.
+    Raises:
+        HTTPException: 400 on an invalid line, with the line to resume from
+    """
+    try:
+        return await import_ndjson(
+            db, iter_lines(request.stream()), start_line=start_line, chunk_size=chunk_size
+        )
+    except InvalidImportLine as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{e}. Lines before it were imported, resume with start_line={e.committed_lines}"
+        )
+    finally:
+        dashboard_cache.invalidate()
@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import joinedload
 from typing import Optional
-from ..db import get_db
-from ..database.models import Word, WordReviewItem
-from ..utils import create_paginated_response, validate_entity_exists, PaginationParams
+from ..db import get_read_db
+from ..database.models import Word
+from ..utils import (
+    create_paginated_response,
+    validate_entity_exists,
+    PaginationParams,
+    paginate_query,
+    split_page,
+    count_total
+)
+from ..services.search import search_words
+from ..services.word_stats import build_word_list, load_word_stats
+from ..responses import fast_responses_enabled, list_response
 from ..models import (
     WordListResponse, 
     WordDetail, 
-    WordInList,
-    WordStats,
     GroupInWord
 )
 
@@ -19,51 +27,48 @@ router = APIRouter(prefix="/api/words", tags=["words"])
 @router.get("/", response_model=WordListResponse)
 async def get_words(
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     # Get total count
-    total_count = await db.scalar(select(func.count()).select_from(Word))
+    total_count = await count_total(db, select(func.count()).select_from(Word), pagination)
     
     # Get paginated words
-    result = await db.execute(
-        select(Word)
-        .offset((pagination.page - 1) * pagination.items_per_page)
-        .limit(pagination.items_per_page)
-    )
-    words = result.scalars().all()
+    result = await db.execute(paginate_query(select(Word), pagination, Word.id))
+    words, next_cursor = split_page(result.scalars().all(), pagination, lambda w: (w.id,))
     
-    # Get review counts for each word
-    word_stats = {}
-    for word in words:
-        correct_count = await db.scalar(
-            select(func.count())
-            .select_from(WordReviewItem)
-            .where(WordReviewItem.word_id == word.id)
-            .where(WordReviewItem.correct == True)
-        )
-        wrong_count = await db.scalar(
-            select(func.count())
-            .select_from(WordReviewItem)
-            .where(WordReviewItem.word_id == word.id)
-            .where(WordReviewItem.correct == False)
-        )
-        word_stats[word.id] = {"correct": correct_count or 0, "wrong": wrong_count or 0}
+    # Get review counts for the whole page in one query
+    fast = fast_responses_enabled()
+    word_list = await build_word_list(db, words, as_rows=fast)
     
-    # Convert to response model
-    word_list = [
-        WordInList(
-            japanese=w.japanese,
-            romaji=w.romaji,
-            english=w.english,
-            correct_count=word_stats[w.id]["correct"],
-            wrong_count=word_stats[w.id]["wrong"]
-        ) for w in words
-    ]
+    return list_response(
+        create_paginated_response(word_list, total_count, pagination, next_cursor), fast
+    )
+
+@router.get("/search", response_model=WordListResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=100, description="Text to find in japanese, romaji or english"),
+    fuzzy: bool = Query(True, description="Fall back to trigram similarity when nothing matches"),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Searches words by substring across japanese, romaji and english,
+    best matches first. Declared before /{word_id} so that "search" is not
+    parsed as a word id.
+    Raises:
+        HTTPException: 400 for cursor pagination, results are ranked
+    """
+    if pagination.is_cursor:
+        raise HTTPException(status_code=400, detail="Search results are paginated with page, not after")
+    words, total_count = await search_words(db, q, pagination, fuzzy=fuzzy)
+    
+    fast = fast_responses_enabled()
+    word_list = await build_word_list(db, words, as_rows=fast)
     
-    return create_paginated_response(word_list, total_count, pagination)
+    return list_response(create_paginated_response(word_list, total_count, pagination), fast)
 
 @router.get("/{word_id}", response_model=WordDetail)
-async def get_word(word_id: int, db: AsyncSession = Depends(get_db)):
+async def get_word(word_id: int, db: AsyncSession = Depends(get_read_db)):
     query = select(Word).options(joinedload(Word.groups)).where(Word.id == word_id)
     result = await db.execute(query)
     word = result.unique().scalar_one_or_none()
@@ -72,26 +77,12 @@ async def get_word(word_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Word not found")
     
     # Get review stats
-    correct_count = await db.scalar(
-        select(func.count())
-        .select_from(WordReviewItem)
-        .where(WordReviewItem.word_id == word.id)
-        .where(WordReviewItem.correct == True)
-    )
-    wrong_count = await db.scalar(
-        select(func.count())
-        .select_from(WordReviewItem)
-        .where(WordReviewItem.word_id == word.id)
-        .where(WordReviewItem.correct == False)
-    )
+    stats = await load_word_stats(db, [word.id])
     
     return WordDetail(
         japanese=word.japanese,
         romaji=word.romaji,
         english=word.english,
-        stats=WordStats(
-            correct_count=correct_count or 0,
-            wrong_count=wrong_count or 0
-        ),
+        stats=stats[word.id],
         groups=[GroupInWord(id=g.id, name=g.name) for g in word.groups]
     ) 
\ No newline at end of file
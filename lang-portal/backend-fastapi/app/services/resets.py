@@ -0,0 +1,120 @@
+import asyncio
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import delete, exists, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from ..database.models import (
+    Group, ReviewRollup, ReviewRollupWord, RollupState, StudySession, Word, WordGroup,
+    WordReviewItem, WordReviewStats, WordSchedule
+)
+from .versions import bump_versions
+
+# Tables emptied by each reset, derived tables first, children before parents
+RESET_HISTORY_MODELS = [
+    WordReviewStats, WordSchedule, ReviewRollupWord, ReviewRollup, RollupState,
+    WordReviewItem, StudySession,
+]
+FULL_RESET_MODELS = RESET_HISTORY_MODELS + [WordGroup, Word, Group]
+
+# Rows still referenced by one of these columns are skipped by the batches,
+# so a write racing with the reset can not make a batch fail on a foreign
+# key. The final sweep deletes them.
+REFERENCED_BY = {
+    StudySession: [WordReviewItem.study_session_id],
+    Word: [WordGroup.word_id, WordReviewItem.word_id, WordReviewStats.word_id, WordSchedule.word_id],
+    Group: [WordGroup.group_id, StudySession.group_id],
+}
+
+async def delete_batch(db: AsyncSession, model, batch_size: int) -> int:
+    """
+    Deletes up to ``batch_size`` unreferenced rows of a table by primary key.
+    Returns:
+        Number of rows deleted
+    """
+    table = model.__table__
+    pk = list(table.primary_key.columns)
+    page = select(*pk).where(
+        *(~exists().where(column == pk[0]) for column in REFERENCED_BY.get(model, []))
+    ).limit(batch_size)
+    key = pk[0] if len(pk) == 1 else tuple_(*pk)
+    result = await db.execute(delete(table).where(key.in_(page)))
+    return result.rowcount
+
+async def reset_tables(
+    session_factory: Callable[[], AsyncSession],
+    models: List[type],
+    batch_size: int = 5000,
+    pause: float = 0.01,
+    progress: Optional[Dict[str, int]] = None,
+    on_stage: Optional[Callable[[str], None]] = None
+) -> Dict[str, int]:
+    """
+    Empties tables in bounded batches, each in its own short transaction,
+    so the write lock is released between batches instead of being held
+    for the whole reset. Each batch bumps the version of its table, so
+    ETags change with the first deleted rows. Rows written while the reset runs are removed by
+    a final sweep that empties every table in one transaction, leaving the
+    derived tables consistent with the raw history.
+    Args:
+        session_factory: Opens the sessions used by the batches
+        models: Models to empty, children before parents
+        batch_size: Rows deleted per transaction
+        pause: Seconds to sleep between batches
+        progress: Updated in place with the rows deleted per table
+        on_stage: Called with a description of each stage
+    Returns:
+        Rows deleted per table
+    """
+    progress = {} if progress is None else progress
+    for model in models:
+        name = model.__tablename__
+        progress.setdefault(name, 0)
+        if on_stage:
+            on_stage(f"deleting {name}")
+        while True:
+            async with session_factory() as db:
+                deleted = await delete_batch(db, model, batch_size)
+                if deleted:
+                    # Cached pages go stale with each batch, even if the
+                    # reset stops before the final sweep
+                    await bump_versions(db, model)
+                await db.commit()
+            progress[name] += deleted
+            if deleted < batch_size:
+                break
+            await asyncio.sleep(pause)
+
+    if on_stage:
+        on_stage("final sweep")
+    async with session_factory() as db:
+        for model in models:
+            result = await db.execute(delete(model.__table__))
+            progress[model.__tablename__] += result.rowcount
+        await bump_versions(db, *models)
+        await db.commit()
+    return progress
+
+async def vacuum(engine: AsyncEngine) -> str:
+    """
+    Reclaims the disk space freed by a reset, outside of any transaction.
+    SQLite databases with auto_vacuum=INCREMENTAL run incremental_vacuum,
+    others a full VACUUM, which locks the database while it runs.
+    Returns:
+        The command that was run
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if engine.dialect.name != "sqlite":
+            command = "VACUUM ANALYZE"
+            await conn.exec_driver_sql(command)
+            return command
+        auto_vacuum = (await conn.exec_driver_sql("PRAGMA auto_vacuum")).scalar()
+        if auto_vacuum != 2:
+            command = "VACUUM"
+            await conn.exec_driver_sql(command)
+            return command
+        command = "PRAGMA incremental_vacuum"
+        # sqlite3's execute() steps a statement without result columns only
+        # once, which frees a single page; executescript() runs it to the end
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.executescript(command)
+    return command
@@ -0,0 +1,271 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import String, select, func, delete, bindparam, and_, case, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import dialect_insert
+from ..database.models import (
+    StudySession, WordReviewItem, ReviewRollup, ReviewRollupWord, RollupState
+)
+from ..models import ReviewHistoryDay, ReviewHistoryResponse
+from .versions import bump_versions
+
+ROLLUP_STATE_NAME = "review_rollups"
+# Reviews folded in by a write request, a larger backlog is left to the
+# catch-up task so writes stay fast after a migration or bulk import
+INLINE_CATCH_UP_LIMIT = 5000
+
+DIMENSION_ALL = "all"
+DIMENSION_GROUP = "group"
+DIMENSION_ACTIVITY = "activity"
+
+RollupKey = Tuple[str, int, date]
+
+def _rollup_keys(group_id: int, study_activity_id: int, day: date) -> List[RollupKey]:
+    return [
+        (DIMENSION_ALL, 0, day),
+        (DIMENSION_GROUP, group_id, day),
+        (DIMENSION_ACTIVITY, study_activity_id, day),
+    ]
+
+async def _apply_reviews(db: AsyncSession, reviews: list) -> None:
+    """Adds a batch of reviews to the rollup cells they belong to"""
+    totals: Dict[RollupKey, List[int]] = {}
+    words = set()
+    for review in reviews:
+        for key in _rollup_keys(review.group_id, review.study_activity_id, review.created_at.date()):
+            cell = totals.setdefault(key, [0, 0])
+            cell[0] += 1
+            cell[1] += 1 if review.correct else 0
+            words.add(key + (review.word_id,))
+
+    stmt = dialect_insert(db, ReviewRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ReviewRollup.dimension, ReviewRollup.key_id, ReviewRollup.day],
+        set_={
+            "reviews": ReviewRollup.reviews + stmt.excluded.reviews,
+            "correct_count": ReviewRollup.correct_count + stmt.excluded.correct_count
+        }
+    )
+    await db.execute(stmt, [
+        {
+            "dimension": dimension,
+            "key_id": key_id,
+            "day": day,
+            "reviews": reviews_count,
+            "correct_count": correct_count,
+            "distinct_words": 0
+        } for (dimension, key_id, day), (reviews_count, correct_count) in totals.items()
+    ])
+
+    await db.execute(dialect_insert(db, ReviewRollupWord).on_conflict_do_nothing(), [
+        {"dimension": dimension, "key_id": key_id, "day": day, "word_id": word_id}
+        for dimension, key_id, day, word_id in words
+    ])
+
+    # Recount distinct words of the touched cells only
+    rollups = ReviewRollup.__table__
+    rollup_words = ReviewRollupWord.__table__
+    in_cell = and_(
+        rollup_words.c.dimension == bindparam("b_dimension"),
+        rollup_words.c.key_id == bindparam("b_key_id"),
+        rollup_words.c.day == bindparam("b_day")
+    )
+    await db.execute(
+        rollups.update()
+        .where(
+            rollups.c.dimension == bindparam("b_dimension"),
+            rollups.c.key_id == bindparam("b_key_id"),
+            rollups.c.day == bindparam("b_day")
+        )
+        .values(distinct_words=select(func.count()).where(in_cell).scalar_subquery()),
+        [
+            {"b_dimension": dimension, "b_key_id": key_id, "b_day": day}
+            for dimension, key_id, day in totals
+        ]
+    )
+
+async def _lock_state(db: AsyncSession) -> None:
+    """
+    Serializes catch-ups by upserting the rollup state row: the update
+    keeps the row locked until the caller commits (the write lock on
+    SQLite). Unlike a SELECT followed by an INSERT, concurrent first
+    catch-ups can not fail on creating the row, e.g. after a reset.
+    """
+    stmt = dialect_insert(db, RollupState).values(
+        name=ROLLUP_STATE_NAME, updated_at=datetime.utcnow()
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[RollupState.name],
+        set_={"updated_at": stmt.excluded.updated_at}
+    ))
+
+async def catch_up_rollups(
+    db: AsyncSession,
+    batch_size: int = 5000,
+    max_reviews: Optional[int] = None
+) -> int:
+    """
+    Folds the reviews not yet rolled up into the daily rollups.
+    Runs in the caller's transaction, so review writes can call it before
+    committing and rollups never double count. Reviews are picked by their
+    rolled_up flag rather than by id, since ids do not commit in order on
+    Postgres: a review committed after a higher id was folded is still
+    picked up by the next catch-up. Concurrent catch-ups are serialized on
+    the rollup state row.
+    Args:
+        db: Database session, the caller commits
+        batch_size: Reviews read per query
+        max_reviews: Stop after this many reviews, None for all of them
+    Returns:
+        Number of reviews folded in
+    """
+    await _lock_state(db)
+    reviews_table = WordReviewItem.__table__
+
+    processed = 0
+    while max_reviews is None or processed < max_reviews:
+        limit = batch_size if max_reviews is None else min(batch_size, max_reviews - processed)
+        result = await db.execute(
+            select(
+                WordReviewItem.id,
+                WordReviewItem.word_id,
+                WordReviewItem.correct,
+                WordReviewItem.created_at,
+                StudySession.group_id,
+                StudySession.study_activity_id
+            )
+            .join(StudySession, StudySession.id == WordReviewItem.study_session_id)
+            .where(WordReviewItem.rolled_up == False)
+            .order_by(WordReviewItem.id)
+            .limit(limit)
+        )
+        reviews = result.all()
+        if not reviews:
+            break
+        await _apply_reviews(db, reviews)
+        await db.execute(
+            reviews_table.update()
+            .where(reviews_table.c.id.in_([review.id for review in reviews]))
+            .values(rolled_up=True)
+        )
+        processed += len(reviews)
+        if len(reviews) < limit:
+            break
+    return processed
+
+async def rebuild_rollups(db: AsyncSession) -> int:
+    """
+    Drops the rollups and recomputes them from the whole review history
+    with one grouped INSERT ... SELECT per dimension. Every visible review
+    is marked rolled up first, and the rollups are computed from exactly
+    the marked ones, so reviews committed meanwhile are left to the next
+    catch-up.
+    Args:
+        db: Database session, the caller commits
+    Returns:
+        Number of reviews folded in
+    """
+    await _lock_state(db)
+    await db.execute(delete(ReviewRollupWord))
+    await db.execute(delete(ReviewRollup))
+    await db.execute(
+        WordReviewItem.__table__.update()
+        .where(WordReviewItem.rolled_up == False)
+        .values(rolled_up=True)
+    )
+    day = func.date(WordReviewItem.created_at)
+    reviews = (
+        select(WordReviewItem)
+        .join(StudySession, StudySession.id == WordReviewItem.study_session_id)
+        .where(WordReviewItem.rolled_up == True)
+    )
+    for dimension, key_id in (
+        (DIMENSION_ALL, literal(0)),
+        (DIMENSION_GROUP, StudySession.group_id),
+        (DIMENSION_ACTIVITY, StudySession.study_activity_id),
+    ):
+        await db.execute(ReviewRollup.__table__.insert().from_select(
+            ["dimension", "key_id", "day", "reviews", "correct_count", "distinct_words"],
+            reviews.with_only_columns(
+                literal(dimension, String),
+                key_id,
+                day,
+                func.count(),
+                func.sum(case((WordReviewItem.correct == True, 1), else_=0)),
+                func.count(WordReviewItem.word_id.distinct())
+            ).group_by(key_id, day)
+        ))
+        await db.execute(ReviewRollupWord.__table__.insert().from_select(
+            ["dimension", "key_id", "day", "word_id"],
+            reviews.with_only_columns(
+                literal(dimension, String), key_id, day, WordReviewItem.word_id
+            ).distinct()
+        ))
+    await bump_versions(db, ReviewRollup, ReviewRollupWord)
+    return await db.scalar(
+        select(func.count()).select_from(WordReviewItem).where(WordReviewItem.rolled_up == True)
+    )
+
+async def load_review_history(
+    db: AsyncSession,
+    dimension: str,
+    key_id: int,
+    days: int,
+    today: date
+) -> ReviewHistoryResponse:
+    """
+    Reads a daily review time series from the rollups.
+    Reads at most ``days`` rows by primary key range, whatever the size of
+    the review history. Days without reviews are filled with zeros.
+    Args:
+        db: Database session
+        dimension: DIMENSION_ALL, DIMENSION_GROUP or DIMENSION_ACTIVITY
+        key_id: Group or study activity id, 0 for DIMENSION_ALL
+        days: Number of days, ending today
+        today: Last day of the series
+    Returns:
+        ReviewHistoryResponse with one item per day, oldest first
+    """
+    start = today - timedelta(days=days - 1)
+    result = await db.execute(
+        select(
+            ReviewRollup.day,
+            ReviewRollup.reviews,
+            ReviewRollup.correct_count,
+            ReviewRollup.distinct_words
+        )
+        .where(
+            ReviewRollup.dimension == dimension,
+            ReviewRollup.key_id == key_id,
+            ReviewRollup.day >= start,
+            ReviewRollup.day <= today
+        )
+    )
+    rows = {row.day: row for row in result}
+
+    items = []
+    total_reviews = total_correct = 0
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = rows.get(day)
+        reviews, correct, distinct = (
+            (row.reviews, row.correct_count, row.distinct_words) if row else (0, 0, 0)
+        )
+        total_reviews += reviews
+        total_correct += correct
+        items.append(ReviewHistoryDay(
+            day=day,
+            reviews=reviews,
+            correct_count=correct,
+            success_rate=round(correct / reviews * 100, 1) if reviews else 0,
+            distinct_words=distinct
+        ))
+
+    return ReviewHistoryResponse(
+        dimension=dimension,
+        key_id=None if dimension == DIMENSION_ALL else key_id,
+        days=days,
+        total_reviews=total_reviews,
+        success_rate=round(total_correct / total_reviews * 100, 1) if total_reviews else 0,
+        items=items
+    )
@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select, delete, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import dialect_insert
+from ..database.models import Word, WordGroup, WordReviewItem, WordSchedule
+from ..models import DueWord
+from .versions import bump_versions
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# Keeps due dates representable after long streaks of correct answers
+MAX_INTERVAL_DAYS = 36500
+# SM-2 answer quality (0-5) of the binary outcome a review records
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+class ScheduleState(NamedTuple):
+    ease: float
+    interval_days: int
+    repetitions: int
+    due_at: datetime
+    last_reviewed_at: datetime
+
+def next_schedule(
+    state: Optional[ScheduleState],
+    correct: bool,
+    reviewed_at: datetime
+) -> ScheduleState:
+    """
+    Applies one review to a word's schedule using the SM-2 algorithm.
+    A wrong answer restarts the word at a one day interval, correct answers
+    grow the interval 1 -> 6 -> interval * ease days, capped at
+    MAX_INTERVAL_DAYS. Answers given at the time of the last review, like
+    repeats of a word in one bulk submission, are a single step: a correct
+    repeat leaves the schedule unchanged, a wrong one still restarts it.
+    Args:
+        state: Current schedule, None for a new word
+        correct: Whether the word was answered correctly
+        reviewed_at: Time of the review
+    Returns:
+        The new schedule
+    """
+    if correct and state and reviewed_at <= state.last_reviewed_at:
+        return state
+    ease = state.ease if state else DEFAULT_EASE
+    interval = state.interval_days if state else 0
+    repetitions = state.repetitions if state else 0
+    quality = QUALITY_CORRECT if correct else QUALITY_WRONG
+
+    if quality < 3:
+        repetitions = 0
+        interval = 1
+    else:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = min(round(interval * ease), MAX_INTERVAL_DAYS)
+        repetitions += 1
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+    return ScheduleState(
+        ease=round(ease, 4),
+        interval_days=interval,
+        repetitions=repetitions,
+        due_at=reviewed_at + timedelta(days=interval),
+        last_reviewed_at=reviewed_at
+    )
+
+async def _upsert_schedules(db: AsyncSession, states: Dict[int, ScheduleState]) -> None:
+    stmt = dialect_insert(db, WordSchedule)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[WordSchedule.word_id],
+        set_={field: getattr(stmt.excluded, field) for field in ScheduleState._fields}
+    )
+    await db.execute(stmt, [
+        {"word_id": word_id, **state._asdict()} for word_id, state in states.items()
+    ])
+
+async def update_schedules(
+    db: AsyncSession,
+    reviews: Iterable[Tuple[int, bool]],
+    reviewed_at: datetime
+) -> None:
+    """
+    Applies new reviews to the word schedules.
+    Loads the affected schedules with one query and writes them back with
+    one upsert, in the caller's transaction.
+    Args:
+        db: Database session
+        reviews: (word_id, correct) pairs in the order they were answered
+        reviewed_at: Time of the reviews
+    """
+    reviews = list(reviews)
+    if not reviews:
+        return
+    word_ids = {word_id for word_id, _ in reviews}
+    result = await db.execute(
+        select(WordSchedule.word_id, *(getattr(WordSchedule, f) for f in ScheduleState._fields))
+        .where(WordSchedule.word_id.in_(word_ids))
+    )
+    states = {row[0]: ScheduleState(*row[1:]) for row in result}
+    for word_id, correct in reviews:
+        states[word_id] = next_schedule(states.get(word_id), correct, reviewed_at)
+    await _upsert_schedules(db, {word_id: states[word_id] for word_id in word_ids})
+
+async def rebuild_schedules(db: AsyncSession, batch_size: int = 5000) -> int:
+    """
+    Recomputes every schedule by replaying the review history in order.
+    Reviews are streamed, so memory is bounded by ``batch_size``.
+    Args:
+        db: Database session, the caller commits
+        batch_size: Reviews fetched and schedules written per batch
+    Returns:
+        Number of schedules written
+    """
+    await db.execute(delete(WordSchedule))
+    result = await db.stream(
+        select(WordReviewItem.word_id, WordReviewItem.correct, WordReviewItem.created_at)
+        .order_by(WordReviewItem.word_id, WordReviewItem.created_at, WordReviewItem.id)
+        .execution_options(yield_per=batch_size)
+    )
+    pending: Dict[int, ScheduleState] = {}
+    written = 0
+    word_id, state = None, None
+    async for review_word_id, correct, created_at in result:
+        if review_word_id != word_id:
+            if word_id is not None:
+                pending[word_id] = state
+            word_id, state = review_word_id, None
+            if len(pending) >= batch_size:
+                await _upsert_schedules(db, pending)
+                written += len(pending)
+                pending = {}
+        state = next_schedule(state, correct, created_at)
+    if word_id is not None:
+        pending[word_id] = state
+    if pending:
+        await _upsert_schedules(db, pending)
+        written += len(pending)
+    await bump_versions(db, WordSchedule)
+    return written
+
+def due_in_group(group_id: int):
+    """EXISTS clause restricting word_schedules to the words of a group"""
+    return exists().where(
+        WordGroup.word_id == WordSchedule.word_id,
+        WordGroup.group_id == group_id
+    )
+
+async def load_due_words(
+    db: AsyncSession,
+    group_id: int,
+    limit: int,
+    now: Optional[datetime] = None
+) -> List[DueWord]:
+    """
+    Picks the next words of a group to study.
+    Due words come first, most overdue first, read in due order from the
+    due_at index. Remaining slots are filled with new words of the group.
+    Words scheduled for later are not returned.
+    Args:
+        db: Database session
+        group_id: Group to pick words from
+        limit: Maximum number of words
+        now: Reference time, defaults to now
+    Returns:
+        Up to ``limit`` words in study order
+    """
+    now = now or datetime.utcnow()
+    result = await db.execute(
+        select(
+            Word.id, Word.japanese, Word.romaji, Word.english,
+            WordSchedule.due_at, WordSchedule.interval_days,
+            WordSchedule.ease, WordSchedule.repetitions
+        )
+        .select_from(WordSchedule)
+        .join(Word, Word.id == WordSchedule.word_id)
+        .where(WordSchedule.due_at <= now)
+        # A correlated EXISTS keeps word_schedules as the outer loop, so rows
+        # come off the due_at index in order and the scan stops at ``limit``
+        .where(due_in_group(group_id))
+        .order_by(WordSchedule.due_at, WordSchedule.word_id)
+        .limit(limit)
+    )
+    words = [DueWord(is_new=False, **row._mapping) for row in result]
+
+    if len(words) < limit:
+        result = await db.execute(
+            select(Word.id, Word.japanese, Word.romaji, Word.english)
+            .select_from(WordGroup)
+            .join(Word, Word.id == WordGroup.word_id)
+            .where(WordGroup.group_id == group_id)
+            .where(~exists().where(WordSchedule.word_id == WordGroup.word_id))
+            .order_by(WordGroup.word_id)
+            .limit(limit - len(words))
+        )
+        words += [DueWord(is_new=True, **row._mapping) for row in result]
+    return words
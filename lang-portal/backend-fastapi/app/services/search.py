@@ -0,0 +1,127 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, case, func, literal_column, or_, select, table, column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database.models import Word, WORD_SEARCH_TABLE
+from ..utils import PaginationParams
+
+# The trigram index only answers terms of at least 3 characters
+MIN_TRIGRAM_LENGTH = 3
+# Column weights for bm25, an english hit ranks below a japanese/romaji hit
+BM25_WEIGHTS = (2.0, 2.0, 1.0)
+
+words_fts = table(WORD_SEARCH_TABLE, column("rowid"))
+_fts = literal_column(WORD_SEARCH_TABLE)
+
+async def word_index_available(db: AsyncSession) -> bool:
+    """Whether the trigram index exists, it is SQLite only (migration 0007)"""
+    if db.get_bind().dialect.name != "sqlite":
+        return False
+    return bool(await db.scalar(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": WORD_SEARCH_TABLE}
+    ))
+
+def _phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+def _trigrams(terms: List[str]) -> List[str]:
+    grams = []
+    for term in terms:
+        for i in range(len(term) - MIN_TRIGRAM_LENGTH + 1):
+            grams.append(term[i:i + MIN_TRIGRAM_LENGTH])
+    return list(dict.fromkeys(grams))
+
+async def _page(db: AsyncSession, query, pagination: PaginationParams) -> List[Word]:
+    result = await db.execute(
+        query
+        .offset((pagination.page - 1) * pagination.items_per_page)
+        .limit(pagination.items_per_page)
+    )
+    return list(result.scalars().all())
+
+async def _search_index(
+    db: AsyncSession,
+    match: str,
+    pagination: PaginationParams
+) -> Tuple[List[Word], Optional[int]]:
+    matches = _fts.op("MATCH")(match)
+    words = await _page(
+        db,
+        select(Word)
+        .join(words_fts, words_fts.c.rowid == Word.id)
+        .where(matches)
+        .order_by(func.bm25(_fts, *BM25_WEIGHTS), Word.id),
+        pagination
+    )
+    total = None
+    if pagination.include_total:
+        total = await db.scalar(select(func.count()).select_from(words_fts).where(matches))
+    return words, total
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+async def _search_scan(
+    db: AsyncSession,
+    terms: List[str],
+    pagination: PaginationParams
+) -> Tuple[List[Word], Optional[int]]:
+    columns = (Word.japanese, Word.romaji, Word.english)
+    # SQLite's LIKE is already case-insensitive, ILIKE would lower() every value
+    sqlite = db.get_bind().dialect.name == "sqlite"
+
+    def like(c, pattern):
+        return c.like(pattern, escape="\\") if sqlite else c.ilike(pattern, escape="\\")
+
+    condition = and_(*(
+        or_(*(like(c, f"%{_escape_like(term)}%") for c in columns)) for term in terms
+    ))
+    query = _escape_like(" ".join(terms))
+    rank = case(
+        (or_(*(like(c, query) for c in columns)), 0),
+        (or_(*(like(c, f"{query}%") for c in columns)), 1),
+        else_=2
+    )
+    words = await _page(db, select(Word).where(condition).order_by(rank, Word.id), pagination)
+    total = None
+    if pagination.include_total:
+        total = await db.scalar(select(func.count()).select_from(Word).where(condition))
+    return words, total
+
+async def search_words(
+    db: AsyncSession,
+    q: str,
+    pagination: PaginationParams,
+    fuzzy: bool = True
+) -> Tuple[List[Word], Optional[int]]:
+    """
+    Finds words whose japanese, romaji or english contain every term of ``q``.
+    Terms of 3+ characters are answered by the trigram index and ranked
+    with bm25. Shorter terms, or databases without the index, fall back to
+    a LIKE scan ranked exact match, then prefix match. With ``fuzzy``, a
+    query without substring matches is retried with its trigrams OR-ed, so
+    misspellings still find the words sharing the most trigrams.
+    Args:
+        db: Database session
+        q: Search text, whitespace separated terms
+        pagination: Page based pagination parameters
+        fuzzy: Retry with trigram overlap when nothing matches
+    Returns:
+        Tuple of (words of this page, total matches or None if not counted)
+    """
+    terms = q.lower().split()
+    if not terms:
+        return [], 0 if pagination.include_total else None
+    if any(len(term) < MIN_TRIGRAM_LENGTH for term in terms) or not await word_index_available(db):
+        return await _search_scan(db, terms, pagination)
+
+    exact = " ".join(_phrase(term) for term in terms)
+    words, total = await _search_index(db, exact, pagination)
+    if fuzzy and not words and len(_trigrams(terms)) > 1:
+        # An empty later page of an exact search stays exact
+        if pagination.page == 1 or not await db.scalar(
+            select(words_fts.c.rowid).where(_fts.op("MATCH")(exact)).limit(1)
+        ):
+            fuzzy_match = " OR ".join(_phrase(gram) for gram in _trigrams(terms))
+            words, total = await _search_index(db, fuzzy_match, pagination)
+    return words, total
@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+from sqlalchemy import Select, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database.models import StudySession, StudyActivity, Group, WordReviewItem
+from ..models import StudySessionInList
+from ..utils import PaginationParams, paginate_query, split_page
+
+def _session_columns() -> Select:
+    return select(
+        StudySession.id,
+        StudySession.group_id,
+        StudySession.study_activity_id,
+        StudySession.created_at
+    )
+
+def project_sessions(sessions: Select) -> Select:
+    """
+    Builds the StudySessionInList projection for a set of sessions.
+    Review counts and start/end times come from one grouped subquery over
+    word_review_items, restricted to the selected sessions, so the whole
+    page is loaded with a single statement.
+    Args:
+        sessions: Select of session id, group_id, study_activity_id and
+            created_at, already filtered, ordered and limited
+    Returns:
+        Select yielding StudySessionInList rows, ordered by (created_at, id)
+    """
+    page = sessions.cte("session_page")
+    reviews = (
+        select(
+            WordReviewItem.study_session_id,
+            func.count().label("review_items_count"),
+            func.min(WordReviewItem.created_at).label("first_review_at"),
+            func.max(WordReviewItem.created_at).label("last_review_at")
+        )
+        .where(WordReviewItem.study_session_id.in_(select(page.c.id)))
+        .group_by(WordReviewItem.study_session_id)
+        .subquery("session_reviews")
+    )
+    return (
+        select(
+            page.c.id,
+            StudyActivity.name.label("activity_name"),
+            Group.name.label("group_name"),
+            page.c.group_id,
+            page.c.study_activity_id,
+            page.c.created_at,
+            func.coalesce(reviews.c.first_review_at, page.c.created_at).label("start_time"),
+            func.coalesce(reviews.c.last_review_at, page.c.created_at).label("end_time"),
+            func.coalesce(reviews.c.review_items_count, 0).label("review_items_count")
+        )
+        .select_from(page)
+        .join(StudyActivity, StudyActivity.id == page.c.study_activity_id)
+        .join(Group, Group.id == page.c.group_id)
+        .outerjoin(reviews, reviews.c.study_session_id == page.c.id)
+        .order_by(page.c.created_at, page.c.id)
+    )
+
+async def list_sessions(
+    db: AsyncSession,
+    pagination: PaginationParams,
+    *filters,
+    as_rows: bool = False
+) -> Tuple[Union[List[StudySessionInList], List[Dict[str, Any]]], Optional[str]]:
+    """
+    Loads one page of study sessions with their review counts.
+    Args:
+        db: Database session
+        pagination: Pagination parameters
+        filters: Optional WHERE clauses on StudySession
+        as_rows: Return plain dicts of the StudySessionInList fields instead
+            of models, for FastJSONResponse
+    Returns:
+        Tuple of (sessions of this page, cursor of the next page)
+    """
+    sessions = paginate_query(
+        _session_columns().where(*filters),
+        pagination,
+        StudySession.created_at,
+        StudySession.id
+    )
+    result = await db.execute(project_sessions(sessions))
+    rows, next_cursor = split_page(
+        result.all(), pagination, lambda row: (row.created_at, row.id)
+    )
+    if as_rows:
+        return [dict(row._mapping) for row in rows], next_cursor
+    return [StudySessionInList.model_validate(row._mapping) for row in rows], next_cursor
+
+async def get_session_summary(
+    db: AsyncSession,
+    *filters,
+    latest: bool = False
+) -> Optional[StudySessionInList]:
+    """
+    Loads a single study session with its review count and start/end times.
+    Args:
+        db: Database session
+        filters: WHERE clauses on StudySession, e.g. StudySession.id == 1
+        latest: Pick the most recently created matching session
+    Returns:
+        The session, or None if nothing matches
+    """
+    sessions = _session_columns().where(*filters)
+    if latest:
+        sessions = sessions.order_by(StudySession.created_at.desc(), StudySession.id.desc())
+    result = await db.execute(project_sessions(sessions.limit(1)))
+    row = result.first()
+    return StudySessionInList.model_validate(row._mapping) if row else None
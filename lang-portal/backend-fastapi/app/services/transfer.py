@@ -0,0 +1,189 @@
+import json
+from datetime import datetime
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+)
+from sqlalchemy import DateTime, Table, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import dialect_insert
+from ..database.models import (
+    Group, StudyActivity, Word, WordGroup, StudySession, WordReviewItem
+)
+from ..models import ImportResponse
+from .rollups import rebuild_rollups
+from .scheduler import rebuild_schedules
+from .versions import bump_versions
+from .word_stats import rebuild_word_stats
+
+# Record type -> table, parents before children so that every row only
+# references rows exported (and imported) before it
+TRANSFER_TABLES: Dict[str, Table] = {
+    "group": Group.__table__,
+    "study_activity": StudyActivity.__table__,
+    "word": Word.__table__,
+    "word_group": WordGroup.__table__,
+    "study_session": StudySession.__table__,
+    "word_review_item": WordReviewItem.__table__,
+}
+
+# Bookkeeping columns left out of exports, the import rebuilds them
+DERIVED_COLUMNS = {"rolled_up"}
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+class InvalidImportLine(ValueError):
+    """Invalid import line, ``committed_lines`` can be passed as start_line to resume"""
+    def __init__(self, message: str, line: int, committed_lines: int):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+        self.committed_lines = committed_lines
+
+def _columns(table: Table) -> list:
+    return [column for column in table.columns if column.name not in DERIVED_COLUMNS]
+
+def _dump(record_type: str, row: Dict[str, Any]) -> str:
+    record = {"type": record_type}
+    for key, value in row.items():
+        record[key] = value.isoformat() if isinstance(value, datetime) else value
+    return json.dumps(record, ensure_ascii=False)
+
+async def export_ndjson(db: AsyncSession, batch_size: int = 1000) -> AsyncIterator[str]:
+    """
+    Streams every table as NDJSON, one ``{"type": ..., <columns>}`` object
+    per line. Tables are read in id-keyset batches so memory stays bounded
+    by ``batch_size`` rows whatever the size of the database.
+    Args:
+        db: Database session
+        batch_size: Rows read per query
+    Returns:
+        Async iterator of text chunks, each holding up to batch_size lines
+    """
+    for record_type, table in TRANSFER_TABLES.items():
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(*_columns(table))
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            )
+            rows = result.mappings().all()
+            if not rows:
+                break
+            yield "".join(_dump(record_type, row) + "\n" for row in rows)
+            last_id = rows[-1]["id"]
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Splits a stream of byte chunks, e.g. a request body, into text lines"""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if pending:
+        yield pending.decode("utf-8")
+
+async def _aiter(lines: Iterable[str]) -> AsyncIterator[str]:
+    for line in lines:
+        yield line
+
+def _load(record: Dict[str, Any], table: Table) -> Dict[str, Any]:
+    row = {}
+    for column in _columns(table):
+        if column.name not in record:
+            continue
+        value = record[column.name]
+        if isinstance(column.type, DateTime) and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        row[column.name] = value
+    return row
+
+async def _write_chunk(db: AsyncSession, pending: Dict[str, List[dict]]) -> None:
+    # Insert-or-ignore makes re-importing already committed lines a no-op
+    written = []
+    for record_type, table in TRANSFER_TABLES.items():
+        if pending[record_type]:
+            await db.execute(
+                dialect_insert(db, table).on_conflict_do_nothing(),
+                pending[record_type]
+            )
+            pending[record_type] = []
+            written.append(table)
+    await bump_versions(db, *written)
+
+async def _reset_sequences(db: AsyncSession) -> None:
+    """Moves Postgres id sequences past the imported ids"""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in TRANSFER_TABLES.values():
+        await db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"
+        ))
+
+async def import_ndjson(
+    db: AsyncSession,
+    lines: Union[AsyncIterable[str], Iterable[str]],
+    start_line: int = 0,
+    chunk_size: int = 1000,
+    on_commit: Optional[Callable[[int], None]] = None
+) -> ImportResponse:
+    """
+    Imports an NDJSON export, committing every ``chunk_size`` lines.
+    Rows keep their ids, rows whose id (or word/group link) already exists
+    are skipped, so an interrupted import can be resumed from the last
+    committed line or simply re-run. Word review counters, schedules and
+    rollups are rebuilt once at the end.
+    Args:
+        db: Database session
+        lines: NDJSON lines, sync or async
+        start_line: Number of leading lines to skip, e.g. the last checkpoint
+        chunk_size: Lines per transaction
+        on_commit: Called with the number of committed lines after each chunk
+    Returns:
+        ImportResponse with the lines read and the rows per record type
+    Raises:
+        InvalidImportLine: On an invalid line, after committing the lines before it
+    """
+    if not hasattr(lines, "__aiter__"):
+        lines = _aiter(lines)
+    pending: Dict[str, List[dict]] = {record_type: [] for record_type in TRANSFER_TABLES}
+    rows = {record_type: 0 for record_type in TRANSFER_TABLES}
+    line_number = 0
+    committed = start_line
+
+    async def commit(through: int) -> None:
+        nonlocal committed
+        await _write_chunk(db, pending)
+        await db.commit()
+        committed = through
+        if on_commit:
+            on_commit(committed)
+
+    async for line in lines:
+        line_number += 1
+        if line_number <= start_line:
+            continue
+        if line.strip():
+            try:
+                record = json.loads(line)
+                record_type = record.pop("type")
+                row = _load(record, TRANSFER_TABLES[record_type])
+            except (ValueError, KeyError, AttributeError, TypeError):
+                await commit(line_number - 1)
+                raise InvalidImportLine(
+                    "expected a JSON object with a known type", line_number, committed
+                )
+            pending[record_type].append(row)
+            rows[record_type] += 1
+        if line_number % chunk_size == 0:
+            await commit(line_number)
+
+    await commit(line_number)
+    await _reset_sequences(db)
+    await rebuild_word_stats(db)
+    await rebuild_schedules(db)
+    await rebuild_rollups(db)
+    await db.commit()
+    return ImportResponse(lines=line_number, rows=rows)
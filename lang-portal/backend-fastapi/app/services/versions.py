@@ -0,0 +1,47 @@
+import time
+from typing import Dict, Iterable
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import dialect_insert
+from ..database.models import TableVersion
+
+def _table_name(model) -> str:
+    return model.name if isinstance(model, Table) else model.__tablename__
+
+async def bump_versions(db: AsyncSession, *models) -> None:
+    """
+    Marks tables as changed, in the caller's transaction.
+    A table's first version is the current time in ms rather than 1, so
+    versions never repeat after the database is recreated.
+    Args:
+        db: Database session, the caller commits
+        models: Models (or tables) that were written
+    """
+    names = sorted({_table_name(model) for model in models})
+    if not names:
+        return
+    stmt = dialect_insert(db, TableVersion)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TableVersion.name],
+        set_={"version": TableVersion.version + 1}
+    )
+    first_version = int(time.time() * 1000)
+    await db.execute(stmt, [{"name": name, "version": first_version} for name in names])
+
+async def load_versions(db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Reads the change versions of tables with one query.
+    Args:
+        db: Database session
+        names: Table names
+    Returns:
+        Dictionary mapping every requested table to its version, 0 if never written
+    """
+    versions = dict.fromkeys(names, 0)
+    result = await db.execute(
+        select(TableVersion.name, TableVersion.version)
+        .where(TableVersion.name.in_(list(versions)))
+    )
+    for name, version in result:
+        versions[name] = version
+    return versions
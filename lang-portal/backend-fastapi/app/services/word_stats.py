@@ -0,0 +1,188 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from sqlalchemy import select, func, case, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db import dialect_insert
+from ..database.models import Word, WordReviewItem, WordReviewStats
+from ..models import WordInList, WordStats
+from .versions import bump_versions
+
+async def load_word_counts(
+    db: AsyncSession,
+    word_ids: Iterable[int]
+) -> Dict[int, Tuple[int, int]]:
+    """
+    Loads (correct, wrong) review counts for a batch of words.
+    Counts come from the materialized word_stats table in a single query,
+    so the cost does not grow with the size of the review history.
+    Args:
+        db: Database session
+        word_ids: Ids of the words to load counts for
+    Returns:
+        Dictionary mapping every requested word id to its counts
+    """
+    ids = list(dict.fromkeys(word_ids))
+    counts = dict.fromkeys(ids, (0, 0))
+    if not ids:
+        return counts
+
+    result = await db.execute(
+        select(
+            WordReviewStats.word_id,
+            WordReviewStats.correct_count,
+            WordReviewStats.wrong_count
+        )
+        .where(WordReviewStats.word_id.in_(ids))
+    )
+    for word_id, correct_count, wrong_count in result:
+        counts[word_id] = (correct_count or 0, wrong_count or 0)
+    return counts
+
+async def load_word_stats(
+    db: AsyncSession,
+    word_ids: Iterable[int]
+) -> Dict[int, WordStats]:
+    """Same as load_word_counts, with WordStats values"""
+    return {
+        word_id: WordStats(correct_count=correct, wrong_count=wrong)
+        for word_id, (correct, wrong) in (await load_word_counts(db, word_ids)).items()
+    }
+
+async def build_word_list(
+    db: AsyncSession,
+    words: List[Word],
+    as_rows: bool = False
+) -> Union[List[WordInList], List[Dict[str, Any]]]:
+    """
+    Converts a page of words into WordInList items with their review stats.
+    Args:
+        db: Database session
+        words: Words of the current page
+        as_rows: Return plain dicts of the WordInList fields instead of
+            models, for FastJSONResponse
+    Returns:
+        List of WordInList items in the same order as ``words``
+    """
+    counts = await load_word_counts(db, [w.id for w in words])
+    rows = [
+        {
+            "japanese": w.japanese,
+            "romaji": w.romaji,
+            "english": w.english,
+            "correct_count": counts[w.id][0],
+            "wrong_count": counts[w.id][1]
+        } for w in words
+    ]
+    if as_rows:
+        return rows
+    return [WordInList(**row) for row in rows]
+
+async def increment_word_stats(
+    db: AsyncSession,
+    counts: Dict[int, Tuple[int, int]],
+    reviewed_at: Optional[datetime] = None
+) -> None:
+    """
+    Adds new reviews to the word_stats counters.
+    Runs in the caller's transaction so counters and review rows are
+    committed together.
+    Args:
+        db: Database session
+        counts: Mapping of word id to (correct, wrong) counts to add
+        reviewed_at: Timestamp of the reviews, defaults to now
+    """
+    if not counts:
+        return
+    reviewed_at = reviewed_at or datetime.utcnow()
+    stmt = dialect_insert(db, WordReviewStats)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[WordReviewStats.word_id],
+        set_={
+            "correct_count": WordReviewStats.correct_count + stmt.excluded.correct_count,
+            "wrong_count": WordReviewStats.wrong_count + stmt.excluded.wrong_count,
+            "last_reviewed_at": stmt.excluded.last_reviewed_at
+        }
+    )
+    await db.execute(stmt, [
+        {
+            "word_id": word_id,
+            "correct_count": correct,
+            "wrong_count": wrong,
+            "last_reviewed_at": reviewed_at
+        } for word_id, (correct, wrong) in counts.items()
+    ])
+
+async def record_review(
+    db: AsyncSession,
+    word_id: int,
+    correct: bool,
+    reviewed_at: Optional[datetime] = None
+) -> None:
+    """Adds a single review to the word_stats counters"""
+    await increment_word_stats(
+        db,
+        {word_id: (1, 0) if correct else (0, 1)},
+        reviewed_at
+    )
+
+def _aggregate_reviews_query():
+    return (
+        select(
+            WordReviewItem.word_id,
+            func.sum(case((WordReviewItem.correct == True, 1), else_=0)).label("correct_count"),
+            func.sum(case((WordReviewItem.correct == False, 1), else_=0)).label("wrong_count"),
+            func.max(WordReviewItem.created_at).label("last_reviewed_at")
+        )
+        .group_by(WordReviewItem.word_id)
+    )
+
+async def rebuild_word_stats(db: AsyncSession) -> int:
+    """
+    Recomputes every word_stats row from the raw word_review_items, and
+    bumps the word_stats version so cached word lists see the new counts.
+    Args:
+        db: Database session, the caller commits
+    Returns:
+        Number of word_stats rows written
+    """
+    await db.execute(delete(WordReviewStats))
+    aggregate = _aggregate_reviews_query().subquery()
+    await db.execute(
+        WordReviewStats.__table__.insert().from_select(
+            ["word_id", "correct_count", "wrong_count", "last_reviewed_at"],
+            select(aggregate)
+        )
+    )
+    await bump_versions(db, WordReviewStats)
+    return await db.scalar(select(func.count()).select_from(WordReviewStats)) or 0
+
+async def verify_word_stats(db: AsyncSession) -> Dict[int, Dict[str, Tuple[int, int]]]:
+    """
+    Compares the word_stats counters with the raw word_review_items.
+    Args:
+        db: Database session
+    Returns:
+        Mapping of word id to {"stored": (correct, wrong), "actual": (correct, wrong)}
+        for every word whose counters are out of sync. Empty when consistent.
+    """
+    actual = {
+        word_id: (correct or 0, wrong or 0)
+        for word_id, correct, wrong, _ in await db.execute(_aggregate_reviews_query())
+    }
+    stored = {
+        word_id: (correct or 0, wrong or 0)
+        for word_id, correct, wrong in await db.execute(
+            select(
+                WordReviewStats.word_id,
+                WordReviewStats.correct_count,
+                WordReviewStats.wrong_count
+            )
+        )
+    }
+    mismatches = {}
+    for word_id in actual.keys() | stored.keys():
+        expected = actual.get(word_id, (0, 0))
+        current = stored.get(word_id, (0, 0))
+        if expected != current:
+            mismatches[word_id] = {"stored": current, "actual": expected}
+    return mismatches
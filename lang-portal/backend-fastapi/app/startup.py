@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Set, Tuple
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from fastapi import FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from .config import get_settings
+from .database.models import Word
+from .db import engine, read_engine
+from .etag import ETAG_ROUTES
+from .services.versions import load_versions
+
+# uvicorn configures this logger, so the timings show up next to its own
+# startup lines
+logger = logging.getLogger("uvicorn.error")
+
+def _engine_database_url(engine: AsyncEngine) -> str:
+    """The URL the engine actually opens, relative SQLite paths made absolute"""
+    url = engine.url
+    if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:"):
+        url = url.set(database=os.path.abspath(url.database))
+    return url.render_as_string(hide_password=False)
+
+def _head_revisions(database_url: str) -> Set[str]:
+    from tasks.migrate_db import alembic_config
+    return set(ScriptDirectory.from_config(alembic_config(database_url)).get_heads())
+
+async def check_schema(engine: AsyncEngine) -> Tuple[Set[str], Set[str]]:
+    """
+    Reads the database's Alembic revision without blocking the event loop.
+    Returns:
+        Tuple of (current revisions, head revisions of the migration scripts)
+    """
+    async with engine.connect() as conn:
+        current = await conn.run_sync(
+            lambda sync_conn: set(MigrationContext.configure(sync_conn).get_current_heads())
+        )
+    heads = await asyncio.to_thread(_head_revisions, _engine_database_url(engine))
+    return current, heads
+
+async def migrate(engine: AsyncEngine) -> None:
+    """
+    Applies pending migrations in a worker thread, Alembic's env.py runs
+    its own event loop there.
+    Raises:
+        RuntimeError: If the migrations fail
+    """
+    from tasks.migrate_db import migrate_db
+    ok = await asyncio.to_thread(
+        migrate_db, _engine_database_url(engine), configure_logging=False
+    )
+    if not ok:
+        raise RuntimeError("Database migrations failed, see the output above")
+
+async def _warm_connection(engine: AsyncEngine, statements: bool) -> None:
+    async with engine.connect() as conn:
+        if not statements:
+            return
+        # Compile (and on Postgres prepare) the statements every list request
+        # starts with: the ETag version lookup, a count and a page
+        tables = sorted({
+            model.__tablename__ for _, models in ETAG_ROUTES for model in models or ()
+        })
+        async with AsyncSession(bind=conn) as db:
+            await load_versions(db, tables)
+            await db.scalar(select(func.count()).select_from(Word))
+            await db.execute(select(Word).order_by(Word.id).limit(1))
+
+async def warm_pool(engine: AsyncEngine, connections: int, statements: bool = True) -> int:
+    """
+    Opens pooled connections concurrently, so SQLite PRAGMAs (or Postgres
+    handshakes) happen before the first request rather than during it.
+    Args:
+        engine: Engine whose pool to fill
+        connections: Number of connections, capped at the pool size
+        statements: Also run the hot read statements once per connection
+    Returns:
+        Number of connections opened
+    """
+    pool_size = getattr(engine.pool, "size", lambda: 1)()
+    connections = max(1, min(connections, pool_size))
+    await asyncio.gather(*(_warm_connection(engine, statements) for _ in range(connections)))
+    return connections
+
+async def startup(
+    app: FastAPI,
+    primary: AsyncEngine = engine,
+    replica: AsyncEngine = read_engine
+) -> Dict[str, float]:
+    """
+    Startup sequence: schema revision check, optional migrations and pool
+    warm-up. The step timings in ms are logged and kept in
+    ``app.state.startup_timings``.
+    Args:
+        app: The application
+        primary: Engine of the primary database, checked and migrated
+        replica: Engine of the read replica, only warmed
+    Returns:
+        The step timings in ms
+    Raises:
+        RuntimeError: If migrate_on_startup is set and the migrations fail
+    """
+    settings = get_settings()
+    timings: Dict[str, float] = {}
+    started = step = time.perf_counter()
+
+    def lap(name: str) -> None:
+        nonlocal step
+        now = time.perf_counter()
+        timings[name] = round((now - step) * 1000, 1)
+        step = now
+
+    current, heads = await check_schema(primary)
+    lap("schema_check_ms")
+    schema_ok = current == heads
+    if not schema_ok:
+        if settings.migrate_on_startup:
+            logger.info("Migrating database from %s to %s", sorted(current) or "empty", sorted(heads))
+            await migrate(primary)
+            schema_ok = True
+        else:
+            logger.warning(
+                "Database revision %s is not the latest %s, run `python tasks.py migrate` "
+                "or set LANG_PORTAL_MIGRATE_ON_STARTUP=true",
+                sorted(current) or "none", sorted(heads)
+            )
+    lap("migrations_ms")
+
+    warmed = 0
+    for warm_engine in (primary,) if replica is primary else (primary, replica):
+        try:
+            warmed += await warm_pool(warm_engine, settings.warm_connections, statements=schema_ok)
+        except SQLAlchemyError as e:
+            logger.warning("Connection pool warm-up failed: %s", e)
+    lap("pool_warm_up_ms")
+
+    timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    app.state.startup_timings = timings
+    logger.info(
+        "Startup finished in %.1f ms (schema check %.1f ms, migrations %.1f ms, "
+        "%d connections warmed in %.1f ms)",
+        timings["total_ms"], timings["schema_check_ms"], timings["migrations_ms"],
+        warmed, timings["pool_warm_up_ms"]
+    )
+    return timings
+
+async def shutdown() -> None:
+    """Closes the pooled connections"""
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """FastAPI lifespan running startup() before serving and shutdown() after"""
+    await startup(app)
+    try:
+        yield
+    finally:
+        await shutdown()
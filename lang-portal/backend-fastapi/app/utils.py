@@ -1,6 +1,12 @@
-from typing import TypeVar, Generic, List, Optional, Dict, Any
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import TypeVar, Generic, List, Optional, Dict, Any, Callable, Sequence, Tuple
 from fastapi import HTTPException, Query
 from pydantic import BaseModel, conint
+from sqlalchemy import DateTime, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Generic type for items
 T = TypeVar('T')
@@ -8,6 +14,10 @@ T = TypeVar('T')
 class PaginationParams:
     """
     Pagination parameters that can be used as FastAPI dependencies.
+    Pages are addressed either by number (OFFSET/LIMIT) or by an opaque
+    ``after`` cursor returned as ``next_cursor`` by the previous page.
+    Cursor paging seeks on the sort key, so deep pages cost the same as
+    the first one. ``include_total=false`` skips the COUNT(*) query.
     Usage:
         @app.get("/items")
         async def get_items(pagination: PaginationParams = Depends()):
@@ -16,10 +26,105 @@ class PaginationParams:
     def __init__(
         self,
         page: int = Query(1, ge=1, description="Page number"),
-        items_per_page: int = Query(100, ge=1, le=100, description="Items per page")
+        items_per_page: int = Query(100, ge=1, le=100, description="Items per page"),
+        after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+        include_total: bool = Query(True, description="Include total item and page counts")
     ):
         self.page = page
         self.items_per_page = items_per_page
+        self.after = after
+        self.include_total = include_total
+
+    @property
+    def is_cursor(self) -> bool:
+        return self.after is not None
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encodes sort key values into an opaque, URL-safe cursor token"""
+    payload = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def _cursor_value(column: Any, value: Any) -> Any:
+    """Checks a decoded cursor value against the type of its sort key column"""
+    # DateTime keys are encoded as ISO strings, other keys as themselves
+    if isinstance(column.type, DateTime):
+        if not isinstance(value, str):
+            raise ValueError(f"cursor value for {column.key} is not a string")
+        return datetime.fromisoformat(value)
+    if type(value) is not column.type.python_type:
+        raise ValueError(f"cursor value for {column.key} is not a {column.type.python_type.__name__}")
+    return value
+
+def decode_cursor(token: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    Decodes a cursor token back into sort key values for ``columns``.
+    Raises:
+        HTTPException: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [_cursor_value(c, v) for c, v in zip(columns, values)]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def paginate_query(query: Select, pagination: PaginationParams, *order_by) -> Select:
+    """
+    Orders ``query`` by the given key columns and restricts it to one page.
+    In cursor mode rows after the cursor are selected with a keyset
+    predicate, otherwise OFFSET/LIMIT is used. One extra row is fetched
+    so that split_page can tell whether another page exists.
+    Args:
+        query: Select statement to paginate
+        pagination: Pagination parameters
+        order_by: Unique, ascending sort key columns, e.g. (Model.id,)
+    Returns:
+        Paginated select statement
+    """
+    query = query.order_by(*order_by)
+    if pagination.is_cursor:
+        values = decode_cursor(pagination.after, order_by)
+        if len(order_by) == 1:
+            query = query.where(order_by[0] > values[0])
+        else:
+            query = query.where(tuple_(*order_by) > tuple_(*values))
+    else:
+        query = query.offset((pagination.page - 1) * pagination.items_per_page)
+    return query.limit(pagination.items_per_page + 1)
+
+def split_page(
+    rows: Sequence[T],
+    pagination: PaginationParams,
+    cursor_of: Callable[[T], Sequence[Any]]
+) -> Tuple[List[T], Optional[str]]:
+    """
+    Trims the extra row fetched by paginate_query.
+    Args:
+        rows: Rows returned by a paginate_query statement
+        pagination: Pagination parameters
+        cursor_of: Returns the sort key values of a row
+    Returns:
+        Tuple of (rows of this page, cursor for the next page or None)
+    """
+    page = list(rows[:pagination.items_per_page])
+    if len(rows) > pagination.items_per_page and page:
+        return page, encode_cursor(cursor_of(page[-1]))
+    return page, None
+
+async def count_total(
+    db: AsyncSession,
+    query: Select,
+    pagination: PaginationParams
+) -> Optional[int]:
+    """Runs the COUNT query unless the client opted out of totals"""
+    if not pagination.include_total:
+        return None
+    return await db.scalar(query) or 0
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """
@@ -28,31 +133,36 @@ class PaginatedResponse(BaseModel, Generic[T]):
         response_model=PaginatedResponse[ItemModel]
     """
     items: List[T]
-    pagination: Dict[str, int]
+    pagination: Dict[str, Any]
 
 def create_paginated_response(
     items: List[T],
-    total_count: int,
-    pagination: PaginationParams
+    total_count: Optional[int],
+    pagination: PaginationParams,
+    next_cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Creates a standardized paginated response.
     Args:
         items: List of items for current page
-        total_count: Total number of items across all pages
+        total_count: Total number of items across all pages, None if not counted
         pagination: Pagination parameters
+        next_cursor: Cursor of the next page, None on the last page
     Returns:
         Dictionary with items and pagination info
     """
-    total_pages = (total_count + pagination.items_per_page - 1) // pagination.items_per_page
+    total_pages = None
+    if total_count is not None:
+        total_pages = (total_count + pagination.items_per_page - 1) // pagination.items_per_page
     
     return {
         "items": items,
         "pagination": {
-            "current_page": pagination.page,
+            "current_page": None if pagination.is_cursor else pagination.page,
             "total_pages": total_pages,
             "total_items": total_count,
-            "items_per_page": pagination.items_per_page
+            "items_per_page": pagination.items_per_page,
+            "next_cursor": next_cursor
         }
     }
 
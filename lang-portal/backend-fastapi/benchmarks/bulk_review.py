@@ -0,0 +1,74 @@
+"""
+Throughput benchmark for recording reviews.
+
+Posts the same number of reviews through the single-item route
+(POST /api/study_sessions/{id}/words/{word_id}/review) and through the
+bulk route (POST /api/study_sessions/{id}/review).
+
+Usage:
+    python -m benchmarks.bulk_review --reviews 2000 --batch-size 50
+"""
+import argparse
+import asyncio
+import random
+import time
+from .common import (
+    QueryCounter, benchmark_client, create_benchmark_engine,
+    dispose_benchmark_engine, seed_benchmark_data
+)
+
+async def run(reviews: int, batch_size: int, words: int) -> None:
+    engine = create_benchmark_engine()
+    await seed_benchmark_data(engine, words=words, reviews=0, sessions=10)
+    rng = random.Random(7)
+    items = [
+        {"word_id": rng.randint(1, words), "correct": rng.random() < 0.7}
+        for _ in range(reviews)
+    ]
+    counter = QueryCounter(engine)
+
+    async with benchmark_client(engine) as client:
+        with counter:
+            start = time.perf_counter()
+            for item in items:
+                response = await client.post(
+                    f"/api/study_sessions/1/words/{item['word_id']}/review",
+                    json={"correct": item["correct"]}
+                )
+                response.raise_for_status()
+            single_elapsed = time.perf_counter() - start
+        single_queries = counter.count
+
+        with counter:
+            start = time.perf_counter()
+            for offset in range(0, reviews, batch_size):
+                response = await client.post(
+                    "/api/study_sessions/2/review",
+                    json={"reviews": items[offset:offset + batch_size]}
+                )
+                response.raise_for_status()
+            bulk_elapsed = time.perf_counter() - start
+        bulk_queries = counter.count
+
+    print(f"{reviews} reviews, bulk batches of {batch_size}:")
+    print(
+        f"{'single-item route':<22} {reviews / single_elapsed:>9.0f} reviews/s "
+        f"queries={single_queries} elapsed={single_elapsed:.2f}s"
+    )
+    print(
+        f"{'bulk route':<22} {reviews / bulk_elapsed:>9.0f} reviews/s "
+        f"queries={bulk_queries} elapsed={bulk_elapsed:.2f}s"
+    )
+    print(f"speedup: {single_elapsed / bulk_elapsed:.1f}x")
+    await dispose_benchmark_engine(engine)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--words", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.reviews, args.batch_size, args.words))
+
+if __name__ == "__main__":
+    main()
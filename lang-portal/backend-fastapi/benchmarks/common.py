@@ -0,0 +1,172 @@
+import os
+import random
+import statistics
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db import QueryCounter  # re-exported for the benchmark scripts
+from app.services.word_stats import rebuild_word_stats
+from app.database.models import (
+    Base, Word, Group, WordGroup, StudyActivity, StudySession, WordReviewItem
+)
+
+# Rows per executemany batch when seeding benchmark databases
+INSERT_BATCH_SIZE = 10_000
+
+@contextmanager
+def timer(samples: List[float]):
+    """Appends the elapsed wall time of the block (in ms) to ``samples``"""
+    start = time.perf_counter()
+    yield
+    samples.append((time.perf_counter() - start) * 1000)
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Returns min/median/p95/p99/max of latency samples in ms"""
+    ordered = sorted(samples)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": percentile(ordered, 0.95),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1]
+    }
+
+def format_summary(label: str, queries: int, samples: List[float]) -> str:
+    stats = summarize(samples)
+    return (
+        f"{label:<28} queries={queries:<6} "
+        f"median={stats['median']:.2f}ms p95={stats['p95']:.2f}ms max={stats['max']:.2f}ms"
+    )
+
+def create_benchmark_engine(db_path: Optional[str] = None) -> AsyncEngine:
+    """Creates an async engine on a scratch SQLite file"""
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix="lang-portal-bench-", suffix=".db")
+        os.close(fd)
+    return create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+
+async def dispose_benchmark_engine(engine: AsyncEngine) -> None:
+    """Disposes the engine and removes its scratch SQLite file"""
+    await engine.dispose()
+    db_path = engine.url.database
+    if db_path and os.path.exists(db_path):
+        os.remove(db_path)
+
+def session_factory(engine: AsyncEngine) -> Callable[[], AsyncSession]:
+    return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+@asynccontextmanager
+async def benchmark_client(engine: AsyncEngine) -> AsyncIterator[AsyncClient]:
+    """
+    An in-process HTTP client for the app with the database dependencies
+    bound to ``engine``, so requests go through routing and serialization.
+    """
+    from app.main import app
+    from app.db import get_db, get_engine, get_read_db, get_session_factory
+    Session = session_factory(engine)
+
+    async def override_get_db():
+        async with Session() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: Session
+    app.dependency_overrides[get_engine] = lambda: engine
+    try:
+        async with AsyncClient(app=app, base_url="http://bench", follow_redirects=True) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+async def _insert_batched(conn, model, rows: List[dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await conn.execute(insert(model), rows[start:start + INSERT_BATCH_SIZE])
+
+async def seed_benchmark_data(
+    engine: AsyncEngine,
+    words: int,
+    reviews: int,
+    groups: int = 10,
+    sessions: int = 1000,
+    days: int = 365,
+    seed: int = 42
+) -> None:
+    """
+    Creates the schema and fills it with synthetic vocabulary and review history.
+    Args:
+        engine: Target engine (usually from create_benchmark_engine)
+        words: Number of words to create
+        reviews: Number of word review items to create
+        groups: Number of groups, words are spread round-robin across them
+        sessions: Number of study sessions the reviews are spread across
+        days: Sessions are spread evenly over this many past days
+        seed: Random seed so runs are reproducible
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+        await _insert_batched(conn, Group, [
+            {"id": i, "name": f"Group {i}"} for i in range(1, groups + 1)
+        ])
+        await _insert_batched(conn, StudyActivity, [
+            {"id": 1, "name": "Vocabulary Quiz", "thumbnail_url": "", "description": ""}
+        ])
+        await _insert_batched(conn, Word, [
+            {"id": i, "japanese": f"単語{i}", "romaji": f"tango{i}", "english": f"word {i}"}
+            for i in range(1, words + 1)
+        ])
+        await _insert_batched(conn, WordGroup, [
+            {"word_id": i, "group_id": (i % groups) + 1} for i in range(1, words + 1)
+        ])
+
+        session_times = {}
+        session_rows = []
+        for i in range(1, sessions + 1):
+            created_at = now - timedelta(days=days * (sessions - i) / max(sessions, 1))
+            session_times[i] = created_at
+            session_rows.append({
+                "id": i,
+                "group_id": (i % groups) + 1,
+                "study_activity_id": 1,
+                "created_at": created_at
+            })
+        await _insert_batched(conn, StudySession, session_rows)
+
+        batch = []
+        for _ in range(reviews):
+            session_id = rng.randint(1, sessions)
+            batch.append({
+                "word_id": rng.randint(1, words),
+                "study_session_id": session_id,
+                "correct": rng.random() < 0.7,
+                "created_at": session_times[session_id]
+            })
+            if len(batch) >= INSERT_BATCH_SIZE:
+                await conn.execute(insert(WordReviewItem), batch)
+                batch = []
+        if batch:
+            await conn.execute(insert(WordReviewItem), batch)
+
+    async with session_factory(engine)() as db:
+        await rebuild_word_stats(db)
+        await db.commit()
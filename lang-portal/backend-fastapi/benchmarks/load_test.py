@@ -0,0 +1,393 @@
+"""
+Load test for the lang-portal API.
+
+Seeds a scratch database with tasks/seed_data.py, from synthetic seed
+files of --words words spread across --groups groups plus --scale
+generated reviews per word, then:
+
+1. profiles the SQL statements each endpoint runs, one request at a time
+   with the dashboard cache cleared, so the counts are reproducible
+2. drives a read/review workload from --users concurrent clients through
+   every router, in-process so the numbers measure the app, not a network
+
+and reports throughput, latency percentiles and histograms per endpoint
+and queries per request. --output writes the report as JSON, --baseline
+compares it with an earlier report and exits with status 1 if an
+endpoint runs more queries than before, e.g. after an N+1 regression.
+Resets, export and import are left out, they are not part of normal
+traffic.
+
+Usage:
+    python -m benchmarks.load_test --words 10000 --scale 20 --users 20 --requests 5000
+    python -m benchmarks.load_test --workload review --output after.json --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import func, select
+from app.cache import dashboard_cache
+from app.config import BACKEND_ROOT
+from app.database.models import Base, Group, StudyActivity, StudySession, Word
+from tasks.seed_data import seed_data
+from .common import (
+    QueryCounter, benchmark_client, create_benchmark_engine, dispose_benchmark_engine,
+    session_factory, summarize, timer
+)
+
+# Share of write requests (starting sessions, recording reviews) per workload
+WORKLOADS = {"read": 0.0, "mixed": 0.2, "review": 0.7}
+# Upper bounds of the latency histogram buckets in ms, the last bucket is open
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+PAGE_SIZE = 100
+BULK_REVIEW_SIZE = 20
+
+class Dataset(NamedTuple):
+    """Highest ids of the seeded tables, requests pick ids up to these"""
+    words: int
+    groups: int
+    activities: int
+    sessions: int
+
+Request = Tuple[str, str, Optional[dict]]
+
+class Endpoint(NamedTuple):
+    name: str
+    write: bool
+    weight: int
+    build: Callable[[random.Random, Dataset], Request]
+
+def _get(path: str) -> Callable[[random.Random, Dataset], Request]:
+    """A GET of a fixed path"""
+    return lambda rng, data: ("GET", path, None)
+
+def _page(count: int, rng: random.Random) -> int:
+    return rng.randint(1, max(1, (count + PAGE_SIZE - 1) // PAGE_SIZE))
+
+def _reviews(rng: random.Random, data: Dataset, size: int) -> List[dict]:
+    return [
+        {"word_id": rng.randint(1, data.words), "correct": rng.random() < 0.8}
+        for _ in range(size)
+    ]
+
+ENDPOINTS = (
+    # dashboard
+    Endpoint("GET /api/dashboard/last_study_session", False, 2, _get("/api/dashboard/last_study_session")),
+    Endpoint("GET /api/dashboard/study_progress", False, 2, _get("/api/dashboard/study_progress")),
+    Endpoint("GET /api/dashboard/quick-stats", False, 2, _get("/api/dashboard/quick-stats")),
+    Endpoint("GET /api/dashboard/review_history", False, 1, _get("/api/dashboard/review_history")),
+    # words
+    Endpoint("GET /api/words", False, 5, lambda rng, data: (
+        "GET", f"/api/words?page={_page(data.words, rng)}&items_per_page={PAGE_SIZE}", None
+    )),
+    Endpoint("GET /api/words/search", False, 3, lambda rng, data: (
+        "GET", f"/api/words/search?q=tango{rng.randint(1, data.words)}", None
+    )),
+    Endpoint("GET /api/words/{id}", False, 5, lambda rng, data: (
+        "GET", f"/api/words/{rng.randint(1, data.words)}", None
+    )),
+    # groups
+    Endpoint("GET /api/groups", False, 3, _get("/api/groups")),
+    Endpoint("GET /api/groups/{id}", False, 2, lambda rng, data: (
+        "GET", f"/api/groups/{rng.randint(1, data.groups)}", None
+    )),
+    Endpoint("GET /api/groups/{id}/words", False, 3, lambda rng, data: (
+        "GET",
+        f"/api/groups/{rng.randint(1, data.groups)}/words"
+        f"?page={_page(data.words // data.groups, rng)}&items_per_page={PAGE_SIZE}",
+        None
+    )),
+    Endpoint("GET /api/groups/{id}/due_words", False, 2, lambda rng, data: (
+        "GET", f"/api/groups/{rng.randint(1, data.groups)}/due_words", None
+    )),
+    Endpoint("GET /api/groups/{id}/review_history", False, 1, lambda rng, data: (
+        "GET", f"/api/groups/{rng.randint(1, data.groups)}/review_history", None
+    )),
+    Endpoint("GET /api/groups/{id}/study_sessions", False, 2, lambda rng, data: (
+        "GET", f"/api/groups/{rng.randint(1, data.groups)}/study_sessions", None
+    )),
+    # study activities
+    Endpoint("GET /api/study_activities", False, 1, _get("/api/study_activities")),
+    Endpoint("GET /api/study_activities/{id}", False, 1, lambda rng, data: (
+        "GET", f"/api/study_activities/{rng.randint(1, data.activities)}", None
+    )),
+    Endpoint("GET /api/study_activities/{id}/study_sessions", False, 1, lambda rng, data: (
+        "GET", f"/api/study_activities/{rng.randint(1, data.activities)}/study_sessions", None
+    )),
+    Endpoint("GET /api/study_activities/{id}/review_history", False, 1, lambda rng, data: (
+        "GET", f"/api/study_activities/{rng.randint(1, data.activities)}/review_history", None
+    )),
+    # study sessions
+    Endpoint("GET /api/study_sessions", False, 3, lambda rng, data: (
+        "GET", f"/api/study_sessions?page={_page(data.sessions, rng)}&items_per_page={PAGE_SIZE}", None
+    )),
+    Endpoint("GET /api/study_sessions/{id}", False, 2, lambda rng, data: (
+        "GET", f"/api/study_sessions/{rng.randint(1, data.sessions)}", None
+    )),
+    Endpoint("GET /api/study_sessions/{id}/words", False, 2, lambda rng, data: (
+        "GET", f"/api/study_sessions/{rng.randint(1, data.sessions)}/words", None
+    )),
+    # writes
+    Endpoint("POST /api/study_activities", True, 1, lambda rng, data: (
+        "POST", "/api/study_activities",
+        {"group_id": rng.randint(1, data.groups), "study_activity_id": rng.randint(1, data.activities)}
+    )),
+    Endpoint("POST /api/study_sessions/{id}/words/{id}/review", True, 3, lambda rng, data: (
+        "POST",
+        f"/api/study_sessions/{rng.randint(1, data.sessions)}/words/{rng.randint(1, data.words)}/review",
+        {"correct": rng.random() < 0.8}
+    )),
+    Endpoint("POST /api/study_sessions/{id}/review", True, 2, lambda rng, data: (
+        "POST",
+        f"/api/study_sessions/{rng.randint(1, data.sessions)}/review",
+        {"reviews": _reviews(rng, data, BULK_REVIEW_SIZE)}
+    )),
+)
+
+def write_seed_files(seeds_dir: Path, words: int, groups: int) -> None:
+    """Writes synthetic groups.json and words.json in the seed file format"""
+    names = [f"Group {i}" for i in range(1, groups + 1)]
+    (seeds_dir / "groups.json").write_text(
+        json.dumps({"groups": [{"name": name} for name in names]})
+    )
+    (seeds_dir / "words.json").write_text(json.dumps({"words": [
+        {
+            "japanese": f"単語{i}",
+            "romaji": f"tango{i}",
+            "english": f"word {i}",
+            "groups": [names[i % groups]]
+        }
+        for i in range(1, words + 1)
+    ]}, ensure_ascii=False))
+    shutil.copy(BACKEND_ROOT / "seeds" / "study_activities.json", seeds_dir)
+
+async def seed(engine, words: int, groups: int, scale: int) -> Dataset:
+    """
+    Creates the schema and seeds it with tasks/seed_data.py.
+    Raises:
+        RuntimeError: If seeding fails
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    with tempfile.TemporaryDirectory(prefix="lang-portal-seeds-") as seeds_dir:
+        write_seed_files(Path(seeds_dir), words, groups)
+        ok = await seed_data(
+            scale=scale,
+            seeds_dir=Path(seeds_dir),
+            database_url=engine.url.render_as_string(hide_password=False)
+        )
+    if not ok:
+        raise RuntimeError("Seeding the load test database failed, see the output above")
+
+    async with session_factory(engine)() as db:
+        ids = [
+            await db.scalar(select(func.max(model.id))) or 0
+            for model in (Word, Group, StudyActivity, StudySession)
+        ]
+    return Dataset(*ids)
+
+async def profile_queries(client, counter: QueryCounter, data: Dataset, rounds: int) -> Dict[str, int]:
+    """
+    Runs each endpoint ``rounds`` times, one request at a time.
+    Returns:
+        The most statements a single request of each endpoint ran
+    Raises:
+        httpx.HTTPStatusError: If an endpoint fails, the workload is broken
+    """
+    rng = random.Random(1)
+    queries = {}
+    for endpoint in ENDPOINTS:
+        counts = []
+        for _ in range(rounds):
+            method, url, body = endpoint.build(rng, data)
+            dashboard_cache.invalidate()
+            with counter:
+                response = await client.request(method, url, json=body)
+            response.raise_for_status()
+            counts.append(counter.count)
+        queries[endpoint.name] = max(counts)
+    return queries
+
+async def run_load(
+    client,
+    data: Dataset,
+    workload: str,
+    users: int,
+    requests: int,
+    seed: int
+) -> Tuple[Dict[str, List[float]], Counter, float]:
+    """
+    Sends ``requests`` requests from ``users`` concurrent clients, each
+    picking a read or write endpoint by the workload's write share and
+    the endpoint weights.
+    Returns:
+        Tuple of (latency samples in ms per endpoint, errors per endpoint,
+        elapsed seconds)
+    """
+    write_share = WORKLOADS[workload]
+    reads = [endpoint for endpoint in ENDPOINTS if not endpoint.write]
+    writes = [endpoint for endpoint in ENDPOINTS if endpoint.write]
+    samples: Dict[str, List[float]] = {endpoint.name: [] for endpoint in ENDPOINTS}
+    errors: Counter = Counter()
+    remaining = requests
+
+    async def user(index: int) -> None:
+        nonlocal remaining
+        rng = random.Random(seed + index)
+        while remaining > 0:
+            remaining -= 1
+            pool = writes if rng.random() < write_share else reads
+            endpoint = rng.choices(pool, weights=[e.weight for e in pool])[0]
+            method, url, body = endpoint.build(rng, data)
+            with timer(samples[endpoint.name]):
+                response = await client.request(method, url, json=body)
+            if response.status_code >= 400:
+                errors[endpoint.name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(users)))
+    return samples, errors, time.perf_counter() - started
+
+def histogram(samples: List[float]) -> Dict[str, int]:
+    """Counts the samples per latency bucket, keyed by the bucket's upper bound"""
+    labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+    counts = [0] * len(labels)
+    for sample in samples:
+        counts[bisect_left(HISTOGRAM_BOUNDS_MS, sample)] += 1
+    return dict(zip(labels, counts))
+
+def _latency(samples: List[float]) -> dict:
+    stats = {key: round(value, 2) for key, value in summarize(samples).items()}
+    stats["histogram"] = histogram(samples)
+    return stats
+
+def build_report(
+    config: dict,
+    data: Dataset,
+    queries: Dict[str, int],
+    samples: Dict[str, List[float]],
+    errors: Counter,
+    elapsed: float
+) -> dict:
+    all_samples = [sample for endpoint_samples in samples.values() for sample in endpoint_samples]
+    endpoints = {}
+    for name, count in queries.items():
+        entry = {"queries": count, "requests": len(samples[name]), "errors": errors[name]}
+        if samples[name]:
+            entry["latency_ms"] = _latency(samples[name])
+        endpoints[name] = entry
+    return {
+        "config": config,
+        "dataset": data._asdict(),
+        "requests": len(all_samples),
+        "errors": sum(errors.values()),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(all_samples) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": _latency(all_samples) if all_samples else None,
+        "endpoints": endpoints
+    }
+
+def print_report(report: dict) -> None:
+    print(
+        f"\n{report['requests']} requests in {report['elapsed_s']}s: "
+        f"{report['throughput_rps']} req/s, {report['errors']} errors"
+    )
+    for name, entry in report["endpoints"].items():
+        line = f"{name:<52} queries={entry['queries']:<4} requests={entry['requests']:<6}"
+        if "latency_ms" in entry:
+            latency = entry["latency_ms"]
+            line += (
+                f" errors={entry['errors']:<4} median={latency['median']:.2f}ms "
+                f"p95={latency['p95']:.2f}ms p99={latency['p99']:.2f}ms max={latency['max']:.2f}ms"
+            )
+        print(line)
+    if report["latency_ms"]:
+        latency = report["latency_ms"]
+        print(
+            f"\nAll requests: median={latency['median']:.2f}ms p95={latency['p95']:.2f}ms "
+            f"p99={latency['p99']:.2f}ms max={latency['max']:.2f}ms"
+        )
+        largest = max(latency["histogram"].values())
+        for label, count in latency["histogram"].items():
+            print(f"{label:>9} {count:>7} {'#' * round(50 * count / largest)}")
+
+def compare(report: dict, baseline: dict) -> List[str]:
+    """
+    Prints the query count and p95 changes against a baseline report.
+    Returns:
+        The endpoints that run more queries than in the baseline
+    """
+    regressions = []
+    print("\nCompared with the baseline:")
+    for name, entry in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            print(f"{name:<52} new endpoint")
+            continue
+        line = f"{name:<52} queries {before['queries']} -> {entry['queries']}"
+        if "latency_ms" in entry and "latency_ms" in before:
+            line += f", p95 {before['latency_ms']['p95']:.2f} -> {entry['latency_ms']['p95']:.2f}ms"
+        if entry["queries"] > before["queries"]:
+            regressions.append(name)
+            line += "  <- more queries"
+        print(line)
+    return regressions
+
+async def run(args: argparse.Namespace) -> int:
+    engine = create_benchmark_engine()
+    try:
+        print(f"Seeding {args.words} words in {args.groups} groups, scale {args.scale}...")
+        data = await seed(engine, args.words, args.groups, args.scale)
+
+        counter = QueryCounter(engine)
+        async with benchmark_client(engine) as client:
+            print(f"Profiling queries per endpoint ({args.profile_rounds} rounds)...")
+            queries = await profile_queries(client, counter, data, args.profile_rounds)
+            print(f"Running the {args.workload} workload: {args.users} users, {args.requests} requests...")
+            samples, errors, elapsed = await run_load(
+                client, data, args.workload, args.users, args.requests, args.seed
+            )
+    finally:
+        await dispose_benchmark_engine(engine)
+
+    config = {
+        key: getattr(args, key)
+        for key in ("words", "groups", "scale", "workload", "users", "requests", "seed")
+    }
+    report = build_report(config, data, queries, samples, errors, elapsed)
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()))
+        if regressions:
+            print(f"\n{len(regressions)} endpoints run more queries than the baseline")
+            return 1
+    return 0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=10_000)
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=20, help="Synthetic reviews per word")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--profile-rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare with")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main()
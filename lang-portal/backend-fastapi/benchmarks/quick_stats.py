@@ -0,0 +1,96 @@
+"""
+Benchmark for GET /api/dashboard/quick-stats.
+
+Seeds a year of daily study sessions and compares the old per-day streak
+loop with the single-statement endpoint. Exits non-zero if the endpoint
+runs more than the query budget.
+
+Usage:
+    python -m benchmarks.quick_stats --days 365 --reviews 1000000
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import select, func
+from app.database.models import StudySession, WordReviewItem
+from app.routers.dashboard import compute_quick_stats
+from .common import (
+    QueryCounter, create_benchmark_engine, dispose_benchmark_engine, format_summary,
+    seed_benchmark_data, session_factory, timer
+)
+
+# Statements the endpoint may run, independent of history length
+QUERY_BUDGET = 1
+
+async def legacy_quick_stats(db):
+    """The aggregates and per-day streak loop quick-stats used to run"""
+    correct_reviews = await db.scalar(
+        select(func.count()).select_from(WordReviewItem).where(WordReviewItem.correct == True)
+    )
+    total_reviews = await db.scalar(select(func.count()).select_from(WordReviewItem))
+    total_sessions = await db.scalar(select(func.count()).select_from(StudySession))
+    active_groups = await db.scalar(
+        select(func.count(StudySession.group_id.distinct())).select_from(StudySession)
+    )
+    streak = 0
+    current_date = datetime.utcnow().date()
+    while True:
+        has_session = await db.scalar(
+            select(StudySession.id)
+            .where(func.date(StudySession.created_at) == current_date.isoformat())
+            .limit(1)
+        )
+        if not has_session:
+            break
+        streak += 1
+        current_date -= timedelta(days=1)
+    return correct_reviews, total_reviews, total_sessions, active_groups, streak
+
+async def run(days: int, reviews: int, rounds: int) -> bool:
+    engine = create_benchmark_engine()
+    print(f"Seeding {days} days of sessions and {reviews} review items...")
+    # Three sessions per day with the newest one created now
+    await seed_benchmark_data(
+        engine, words=10_000, reviews=reviews, sessions=days * 3, days=days
+    )
+
+    Session = session_factory(engine)
+    counter = QueryCounter(engine)
+    results = {}
+    streaks = {}
+    for label, handler in (
+        ("per-day streak loop", legacy_quick_stats),
+        ("single-statement endpoint", lambda db: compute_quick_stats(db, datetime.utcnow().date())),
+    ):
+        samples = []
+        async with Session() as db:
+            for _ in range(rounds):
+                with counter, timer(samples):
+                    result = await handler(db)
+        streaks[label] = result[-1] if isinstance(result, tuple) else result.study_streak_days
+        results[label] = (counter.count, samples)
+
+    print(f"{rounds} rounds:")
+    for label, (queries, samples) in results.items():
+        print(format_summary(label, queries, samples) + f" streak={streaks[label]}")
+    await dispose_benchmark_engine(engine)
+
+    endpoint_queries = results["single-statement endpoint"][0]
+    if endpoint_queries > QUERY_BUDGET:
+        print(f"❌ quick-stats ran {endpoint_queries} queries, budget is {QUERY_BUDGET}")
+        return False
+    print(f"✅ quick-stats stays within the budget of {QUERY_BUDGET} queries")
+    return True
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    if not asyncio.run(run(args.days, args.reviews, args.rounds)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
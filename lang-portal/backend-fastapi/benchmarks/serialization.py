@@ -0,0 +1,103 @@
+"""
+Benchmark for serializing the words and study sessions list endpoints.
+
+Compares the default path, Pydantic items re-validated against the
+route's response_model and rendered with json.dumps, with the
+fast_json_responses path, plain rows rendered by FastJSONResponse. Each
+list is measured twice: serialization of an already loaded page alone,
+and end-to-end requests through the app.
+
+Usage:
+    python -m benchmarks.serialization --words 10000 --sessions 1000
+"""
+import argparse
+import asyncio
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import select
+from app.config import get_settings
+from app.database.models import Word
+from app.models import StudySessionInList, StudySessionListResponse, WordInList, WordListResponse
+from app.responses import FastJSONResponse, orjson
+from app.services.sessions import list_sessions
+from app.services.word_stats import build_word_list
+from app.utils import PaginationParams, create_paginated_response
+from .common import (
+    QueryCounter, benchmark_client, create_benchmark_engine, dispose_benchmark_engine,
+    format_summary, seed_benchmark_data, session_factory, timer
+)
+
+PAGE_SIZE = 100
+
+def _pagination() -> PaginationParams:
+    return PaginationParams(page=1, items_per_page=PAGE_SIZE, after=None, include_total=True)
+
+async def render_default(field, rows, item_model) -> bytes:
+    """What FastAPI does with a returned payload of Pydantic items"""
+    payload = create_paginated_response([item_model(**row) for row in rows], len(rows), _pagination())
+    content = await serialize_response(field=field, response_content=payload)
+    return JSONResponse(content).body
+
+async def render_fast(field, rows, item_model) -> bytes:
+    payload = create_paginated_response(rows, len(rows), _pagination())
+    return FastJSONResponse(payload).body
+
+async def load_rows(engine):
+    Session = session_factory(engine)
+    async with Session() as db:
+        words = (await db.execute(select(Word).order_by(Word.id).limit(PAGE_SIZE))).scalars().all()
+        word_rows = await build_word_list(db, words, as_rows=True)
+        session_rows, _ = await list_sessions(db, _pagination(), as_rows=True)
+    return word_rows, session_rows
+
+async def run(words: int, reviews: int, sessions: int, rounds: int) -> None:
+    engine = create_benchmark_engine()
+    print(f"Seeding {words} words, {sessions} sessions and {reviews} review items...")
+    await seed_benchmark_data(engine, words=words, reviews=reviews, sessions=sessions)
+
+    word_rows, session_rows = await load_rows(engine)
+    lists = (
+        ("words", word_rows, WordInList, WordListResponse, "/api/words"),
+        ("sessions", session_rows, StudySessionInList, StudySessionListResponse, "/api/study_sessions"),
+    )
+
+    print(f"Serialization only, page size {PAGE_SIZE}, {rounds * 20} rounds "
+          f"(orjson {'installed' if orjson else 'not installed'}):")
+    for name, rows, item_model, response_model, _ in lists:
+        field = create_response_field(name="response", type_=response_model, mode="serialization")
+        for label, render in (("default", render_default), ("fast path", render_fast)):
+            samples = []
+            for _ in range(rounds * 20):
+                with timer(samples):
+                    await render(field, rows, item_model)
+            print(format_summary(f"{name} {label}", 0, samples))
+
+    print(f"End-to-end requests, page size {PAGE_SIZE}, {rounds} rounds:")
+    counter = QueryCounter(engine)
+    settings = get_settings()
+    async with benchmark_client(engine) as client:
+        for name, _, _, _, path in lists:
+            for label, fast in (("default", False), ("fast path", True)):
+                settings.fast_json_responses = fast
+                samples = []
+                with counter:
+                    for _ in range(rounds):
+                        with timer(samples):
+                            response = await client.get(path, params={"items_per_page": PAGE_SIZE})
+                            response.raise_for_status()
+                print(format_summary(f"{name} {label}", counter.count, samples))
+    settings.fast_json_responses = False
+    await dispose_benchmark_engine(engine)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.words, args.reviews, args.sessions, args.rounds))
+
+if __name__ == "__main__":
+    main()
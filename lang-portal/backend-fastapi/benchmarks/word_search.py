@@ -0,0 +1,76 @@
+"""
+Benchmark for GET /api/words/search.
+
+Compares a LIKE '%q%' scan over the three word columns with the trigram
+FTS5 index used by ``app.services.search``, for exact, prefix, english,
+japanese, short (scan fallback) and misspelled (fuzzy) queries.
+
+Usage:
+    python -m benchmarks.word_search --words 100000
+"""
+import argparse
+import asyncio
+from sqlalchemy import func, or_, select
+from app.database.models import Word
+from app.services.search import search_words
+from app.utils import PaginationParams
+from .common import (
+    QueryCounter, create_benchmark_engine, dispose_benchmark_engine, format_summary,
+    seed_benchmark_data, session_factory, timer
+)
+
+def _pagination(page_size: int) -> PaginationParams:
+    return PaginationParams(page=1, items_per_page=page_size, after=None, include_total=True)
+
+async def like_scan_search(db, q, pagination):
+    """Unindexed substring match, what clients filtering whole lists amount to"""
+    pattern = f"%{q}%"
+    condition = or_(Word.japanese.like(pattern), Word.romaji.like(pattern), Word.english.like(pattern))
+    result = await db.execute(
+        select(Word).where(condition).order_by(Word.id).limit(pagination.items_per_page)
+    )
+    total = await db.scalar(select(func.count()).select_from(Word).where(condition))
+    return result.scalars().all(), total
+
+def queries(words: int):
+    target = words * 3 // 4
+    return (
+        ("romaji exact", f"tango{target}"),
+        ("romaji prefix", f"tango{target // 10}"),
+        ("english", f"word {target}"),
+        ("japanese", f"単語{target}"),
+        ("short (scan)", "語1"),
+        ("misspelled", f"tnago{target}"),
+    )
+
+async def run(words: int, page_size: int, rounds: int) -> None:
+    engine = create_benchmark_engine()
+    print(f"Seeding {words} words...")
+    await seed_benchmark_data(engine, words=words, reviews=0, sessions=1)
+
+    Session = session_factory(engine)
+    counter = QueryCounter(engine)
+    pagination = _pagination(page_size)
+    print(f"Page size {page_size}, {rounds} rounds:")
+    async with Session() as db:
+        for label, q in queries(words):
+            for method, search in (("LIKE scan", like_scan_search), ("search", search_words)):
+                samples = []
+                with counter:
+                    for _ in range(rounds):
+                        with timer(samples):
+                            found, total = await search(db, q, pagination)
+                print(format_summary(f"{label} {method}", counter.count // rounds, samples)
+                      + f" matches={total}")
+    await dispose_benchmark_engine(engine)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.words, args.page_size, args.rounds))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark for loading review stats of a page of words.
+
+Compares the old per-word COUNT queries, a single grouped scan of
+word_review_items and the materialized word_stats counters read by
+``app.services.word_stats``.
+
+Usage:
+    python -m benchmarks.word_stats --words 10000 --reviews 1000000
+"""
+import argparse
+import asyncio
+from sqlalchemy import select, func, case
+from app.database.models import Word, WordReviewItem
+from app.services.word_stats import build_word_list
+from .common import (
+    QueryCounter, create_benchmark_engine, dispose_benchmark_engine, format_summary,
+    seed_benchmark_data, session_factory, timer
+)
+
+async def legacy_word_stats(db, words):
+    """The per-word loop the list routers used before the batched loader"""
+    word_stats = {}
+    for word in words:
+        correct_count = await db.scalar(
+            select(func.count())
+            .select_from(WordReviewItem)
+            .where(WordReviewItem.word_id == word.id)
+            .where(WordReviewItem.correct == True)
+        )
+        wrong_count = await db.scalar(
+            select(func.count())
+            .select_from(WordReviewItem)
+            .where(WordReviewItem.word_id == word.id)
+            .where(WordReviewItem.correct == False)
+        )
+        word_stats[word.id] = {"correct": correct_count or 0, "wrong": wrong_count or 0}
+    return word_stats
+
+async def grouped_scan_word_stats(db, words):
+    """One grouped aggregate over word_review_items for the whole page"""
+    result = await db.execute(
+        select(
+            WordReviewItem.word_id,
+            func.sum(case((WordReviewItem.correct == True, 1), else_=0)),
+            func.sum(case((WordReviewItem.correct == False, 1), else_=0))
+        )
+        .where(WordReviewItem.word_id.in_([w.id for w in words]))
+        .group_by(WordReviewItem.word_id)
+    )
+    return {word_id: {"correct": c, "wrong": w} for word_id, c, w in result}
+
+async def run(words: int, reviews: int, page_size: int, rounds: int) -> None:
+    engine = create_benchmark_engine()
+    print(f"Seeding {words} words and {reviews} review items...")
+    await seed_benchmark_data(engine, words=words, reviews=reviews)
+
+    Session = session_factory(engine)
+    counter = QueryCounter(engine)
+    results = {}
+    for label, loader in (
+        ("per-word COUNT queries", legacy_word_stats),
+        ("grouped review scan", grouped_scan_word_stats),
+        ("materialized counters", build_word_list),
+    ):
+        samples = []
+        async with Session() as db:
+            for i in range(rounds):
+                page = (await db.execute(
+                    select(Word)
+                    .order_by(Word.id)
+                    .offset((i * page_size) % max(words - page_size, 1))
+                    .limit(page_size)
+                )).scalars().all()
+                with counter, timer(samples):
+                    await loader(db, page)
+        results[label] = (counter.count, samples)
+
+    print(f"Page size {page_size}, {rounds} rounds:")
+    for label, (queries, samples) in results.items():
+        print(format_summary(label, queries, samples))
+    await dispose_benchmark_engine(engine)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.words, args.reviews, args.page_size, args.rounds))
+
+if __name__ == "__main__":
+    main()
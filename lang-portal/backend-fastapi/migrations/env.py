@@ -6,24 +6,30 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 # Import your models
-from app.database.models import Base
+from app.database.models import Base, WORD_SEARCH_TABLE
 
 # this is the Alembic Config object
 config = context.config
 
-# Interpret the config file for Python logging
-if config.config_file_name is not None:
+# Interpret the config file for Python logging, unless the running server
+# migrates on startup and owns the logging setup
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # Add your model's MetaData object here for 'autogenerate' support
 target_metadata = Base.metadata
 
+def include_name(name, type_, parent_names) -> bool:
+    """Keeps autogenerate away from the FTS5 tables created by migration 0007"""
+    return not (type_ == "table" and name and name.startswith(WORD_SEARCH_TABLE))
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -32,7 +38,9 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_name=include_name
+    )
 
     with context.begin_transaction():
         context.run_migrations()
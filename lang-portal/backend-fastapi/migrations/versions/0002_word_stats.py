@@ -0,0 +1,40 @@
+"""Materialized per-word review counters
+
+Revision ID: 0002_word_stats
+Revises: 0001_initial
+Create Date: 2025-03-01
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002_word_stats'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Create word_stats table
+    op.create_table(
+        'word_stats',
+        sa.Column('word_id', sa.Integer, sa.ForeignKey('words.id'), primary_key=True),
+        sa.Column('correct_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('wrong_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('last_reviewed_at', sa.DateTime)
+    )
+    
+    # Backfill counters from the existing review history
+    op.execute(
+        """
+        INSERT INTO word_stats (word_id, correct_count, wrong_count, last_reviewed_at)
+        SELECT word_id,
+               SUM(CASE WHEN correct THEN 1 ELSE 0 END),
+               SUM(CASE WHEN correct THEN 0 ELSE 1 END),
+               MAX(created_at)
+        FROM word_review_items
+        GROUP BY word_id
+        """
+    )
+
+def downgrade():
+    op.drop_table('word_stats')
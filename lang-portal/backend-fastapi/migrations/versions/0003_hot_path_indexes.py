@@ -0,0 +1,62 @@
+"""Indexes for hot foreign-key lookups
+
+Revision ID: 0003_hot_path_indexes
+Revises: 0002_word_stats
+Create Date: 2025-03-08
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0003_hot_path_indexes'
+down_revision = '0002_word_stats'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Review lookups by word (stats) and by session (counts, start/end times)
+    op.create_index(
+        'ix_word_review_items_word_id_correct',
+        'word_review_items', ['word_id', 'correct']
+    )
+    op.create_index(
+        'ix_word_review_items_study_session_id_created_at',
+        'word_review_items', ['study_session_id', 'created_at']
+    )
+    
+    # Drop duplicate word/group links before enforcing uniqueness
+    op.execute(
+        """
+        DELETE FROM words_groups
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM words_groups GROUP BY word_id, group_id
+        )
+        """
+    )
+    op.create_index(
+        'uq_words_groups_word_id_group_id',
+        'words_groups', ['word_id', 'group_id'], unique=True
+    )
+    op.create_index(
+        'ix_words_groups_group_id_word_id',
+        'words_groups', ['group_id', 'word_id']
+    )
+    
+    # Session listings filter by group/activity and sort by creation time
+    op.create_index('ix_study_sessions_created_at', 'study_sessions', ['created_at'])
+    op.create_index(
+        'ix_study_sessions_group_id_created_at',
+        'study_sessions', ['group_id', 'created_at']
+    )
+    op.create_index(
+        'ix_study_sessions_study_activity_id_created_at',
+        'study_sessions', ['study_activity_id', 'created_at']
+    )
+
+def downgrade():
+    op.drop_index('ix_study_sessions_study_activity_id_created_at', 'study_sessions')
+    op.drop_index('ix_study_sessions_group_id_created_at', 'study_sessions')
+    op.drop_index('ix_study_sessions_created_at', 'study_sessions')
+    op.drop_index('ix_words_groups_group_id_word_id', 'words_groups')
+    op.drop_index('uq_words_groups_word_id_group_id', 'words_groups')
+    op.drop_index('ix_word_review_items_study_session_id_created_at', 'word_review_items')
+    op.drop_index('ix_word_review_items_word_id_correct', 'word_review_items')
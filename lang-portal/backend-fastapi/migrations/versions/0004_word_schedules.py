@@ -0,0 +1,32 @@
+"""Spaced-repetition schedule per word
+
+Revision ID: 0004_word_schedules
+Revises: 0003_hot_path_indexes
+Create Date: 2025-03-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004_word_schedules'
+down_revision = '0003_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Words without a row are new, run `python tasks.py rebuild-schedules`
+    # to derive schedules from an existing review history
+    op.create_table(
+        'word_schedules',
+        sa.Column('word_id', sa.Integer, sa.ForeignKey('words.id'), primary_key=True),
+        sa.Column('ease', sa.Float, nullable=False, server_default='2.5'),
+        sa.Column('interval_days', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('repetitions', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('due_at', sa.DateTime, nullable=False),
+        sa.Column('last_reviewed_at', sa.DateTime, nullable=False)
+    )
+    op.create_index('ix_word_schedules_due_at', 'word_schedules', ['due_at'])
+
+def downgrade():
+    op.drop_index('ix_word_schedules_due_at', table_name='word_schedules')
+    op.drop_table('word_schedules')
@@ -0,0 +1,45 @@
+"""Daily review rollups for analytics endpoints
+
+Revision ID: 0005_review_rollups
+Revises: 0004_word_schedules
+Create Date: 2025-03-22
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005_review_rollups'
+down_revision = '0004_word_schedules'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Rollups start empty, `python tasks.py catch-up-rollups` folds in the
+    # existing history and review writes keep them current afterwards
+    op.create_table(
+        'review_rollups',
+        sa.Column('dimension', sa.String, primary_key=True),
+        sa.Column('key_id', sa.Integer, primary_key=True),
+        sa.Column('day', sa.Date, primary_key=True),
+        sa.Column('reviews', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('correct_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('distinct_words', sa.Integer, nullable=False, server_default='0')
+    )
+    op.create_table(
+        'review_rollup_words',
+        sa.Column('dimension', sa.String, primary_key=True),
+        sa.Column('key_id', sa.Integer, primary_key=True),
+        sa.Column('day', sa.Date, primary_key=True),
+        sa.Column('word_id', sa.Integer, primary_key=True)
+    )
+    op.create_table(
+        'rollup_state',
+        sa.Column('name', sa.String, primary_key=True),
+        sa.Column('last_review_id', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime)
+    )
+
+def downgrade():
+    op.drop_table('rollup_state')
+    op.drop_table('review_rollup_words')
+    op.drop_table('review_rollups')
@@ -0,0 +1,25 @@
+"""Per-table change versions for conditional GETs
+
+Revision ID: 0006_table_versions
+Revises: 0005_review_rollups
+Create Date: 2025-03-29
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006_table_versions'
+down_revision = '0005_review_rollups'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Rows are created by the first write to each table
+    op.create_table(
+        'table_versions',
+        sa.Column('name', sa.String, primary_key=True),
+        sa.Column('version', sa.BigInteger, nullable=False)
+    )
+
+def downgrade():
+    op.drop_table('table_versions')
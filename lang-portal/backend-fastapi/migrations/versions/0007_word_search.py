@@ -0,0 +1,58 @@
+"""Trigram full-text index for word search
+
+Revision ID: 0007_word_search
+Revises: 0006_table_versions
+Create Date: 2025-04-05
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0007_word_search'
+down_revision = '0006_table_versions'
+branch_labels = None
+depends_on = None
+
+def _supported() -> bool:
+    # FTS5 trigram tokenizer, other databases fall back to LIKE scans
+    dialect = op.get_bind().dialect
+    return dialect.name == "sqlite" and dialect.server_version_info >= (3, 34)
+
+def upgrade():
+    if not _supported():
+        return
+    op.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+            japanese, romaji, english,
+            content='words', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+            INSERT INTO words_fts(rowid, japanese, romaji, english)
+            VALUES (new.id, new.japanese, new.romaji, new.english);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+            INSERT INTO words_fts(words_fts, rowid, japanese, romaji, english)
+            VALUES ('delete', old.id, old.japanese, old.romaji, old.english);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS words_fts_update AFTER UPDATE ON words BEGIN
+            INSERT INTO words_fts(words_fts, rowid, japanese, romaji, english)
+            VALUES ('delete', old.id, old.japanese, old.romaji, old.english);
+            INSERT INTO words_fts(rowid, japanese, romaji, english)
+            VALUES (new.id, new.japanese, new.romaji, new.english);
+        END
+    """)
+    # Index the existing words
+    op.execute("INSERT INTO words_fts(words_fts) VALUES ('rebuild')")
+
+def downgrade():
+    if not _supported():
+        return
+    op.execute("DROP TRIGGER IF EXISTS words_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS words_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS words_fts_insert")
+    op.execute("DROP TABLE IF EXISTS words_fts")
@@ -0,0 +1,62 @@
+"""Track rolled up reviews with a flag instead of an id high-water mark
+
+Revision ID: 0008_review_rollup_flags
+Revises: 0007_word_search
+Create Date: 2025-04-12
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008_review_rollup_flags'
+down_revision = '0007_word_search'
+branch_labels = None
+depends_on = None
+
+review_items = sa.table(
+    'word_review_items',
+    sa.column('id', sa.Integer),
+    sa.column('rolled_up', sa.Boolean)
+)
+rollup_state = sa.table(
+    'rollup_state',
+    sa.column('name', sa.String),
+    sa.column('last_review_id', sa.Integer)
+)
+
+def upgrade():
+    op.add_column(
+        'word_review_items',
+        sa.Column('rolled_up', sa.Boolean, nullable=False, server_default=sa.false())
+    )
+    # Reviews up to the old high-water mark are already in the rollups
+    op.execute(
+        review_items.update()
+        .where(review_items.c.id <= sa.select(rollup_state.c.last_review_id)
+               .where(rollup_state.c.name == 'review_rollups')
+               .scalar_subquery())
+        .values(rolled_up=True)
+    )
+    op.create_index(
+        'ix_word_review_items_pending_rollup', 'word_review_items', ['id'],
+        sqlite_where=sa.text("rolled_up = 0"),
+        postgresql_where=sa.text("NOT rolled_up")
+    )
+    with op.batch_alter_table('rollup_state') as batch_op:
+        batch_op.drop_column('last_review_id')
+
+def downgrade():
+    with op.batch_alter_table('rollup_state') as batch_op:
+        batch_op.add_column(sa.Column('last_review_id', sa.Integer, nullable=False, server_default='0'))
+    # Reviews below the oldest pending one are rolled up
+    pending = sa.select(sa.func.min(review_items.c.id)).where(review_items.c.rolled_up == False)
+    op.execute(
+        rollup_state.update().values(last_review_id=sa.func.coalesce(
+            pending.scalar_subquery() - 1,
+            sa.select(sa.func.max(review_items.c.id)).scalar_subquery(),
+            0
+        ))
+    )
+    op.drop_index('ix_word_review_items_pending_rollup', table_name='word_review_items')
+    with op.batch_alter_table('word_review_items') as batch_op:
+        batch_op.drop_column('rolled_up')
@@ -9,5 +9,10 @@ setup(
         "sqlalchemy",
         "alembic",
         "aiosqlite",
+        "pydantic-settings",
     ],
+    extras_require={
+        "postgres": ["asyncpg"],
+        "fast": ["orjson"],
+    },
 ) 
\ No newline at end of file
@@ -18,11 +18,72 @@ def migrate():
     migrate_db()
 
 @cli.command()
-def seed():
+@click.option("--scale", type=int, default=0, show_default=True,
+              help="Synthetic reviews to generate per word for load testing")
+@click.option("--batch-size", type=int, default=5000, show_default=True,
+              help="Rows per INSERT batch")
+def seed(scale, batch_size):
     """Seed database with initial data"""
     import asyncio
     from tasks.seed_data import seed_data
-    asyncio.run(seed_data())
+    ok = asyncio.run(seed_data(scale=scale, batch_size=batch_size))
+    if not ok:
+        raise SystemExit(1)
+
+@cli.command()
+@click.option("--verify-only", is_flag=True, help="Only report counters that are out of sync")
+def rebuild_stats(verify_only):
+    """Rebuild word review counters from the review history"""
+    import asyncio
+    from tasks.rebuild_word_stats import rebuild_stats
+    ok = asyncio.run(rebuild_stats(verify_only=verify_only))
+    if not ok:
+        raise SystemExit(1)
+
+@cli.command()
+@click.option("--batch-size", type=int, default=5000, show_default=True, help="Reviews per batch")
+def rebuild_schedules(batch_size):
+    """Rebuild spaced-repetition schedules from the review history"""
+    import asyncio
+    from tasks.rebuild_schedules import rebuild_schedules
+    ok = asyncio.run(rebuild_schedules(batch_size=batch_size))
+    if not ok:
+        raise SystemExit(1)
+
+@cli.command()
+@click.option("--rebuild", is_flag=True, help="Recompute the rollups from the whole history")
+@click.option("--batch-size", type=int, default=5000, show_default=True, help="Reviews per batch")
+def catch_up_rollups(rebuild, batch_size):
+    """Fold new reviews into the daily analytics rollups"""
+    import asyncio
+    from tasks.catch_up_rollups import catch_up_rollups
+    ok = asyncio.run(catch_up_rollups(rebuild=rebuild, batch_size=batch_size))
+    if not ok:
+        raise SystemExit(1)
+
+@cli.command()
+@click.argument("output", default="-")
+@click.option("--batch-size", type=int, default=1000, show_default=True, help="Rows read per query")
+def export_data(output, batch_size):
+    """Export the database as NDJSON to OUTPUT (default: stdout)"""
+    import asyncio
+    from tasks.transfer_data import export_data
+    ok = asyncio.run(export_data(output, batch_size=batch_size))
+    if not ok:
+        raise SystemExit(1)
+
+@cli.command()
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--start-line", type=int, default=0, show_default=True,
+              help="Resume after this many lines, as printed by an interrupted import")
+@click.option("--chunk-size", type=int, default=1000, show_default=True, help="Lines per transaction")
+def import_data(path, start_line, chunk_size):
+    """Import an NDJSON export created by export-data"""
+    import asyncio
+    from tasks.transfer_data import import_data
+    ok = asyncio.run(import_data(path, start_line=start_line, chunk_size=chunk_size))
+    if not ok:
+        raise SystemExit(1)
 
 if __name__ == "__main__":
     cli() 
\ No newline at end of file
@@ -0,0 +1,37 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.config import absolute_database_url, get_settings
+from app.db import create_engine_from_settings
+from app.services.rollups import catch_up_rollups as catch_up, rebuild_rollups
+
+async def catch_up_rollups(rebuild: bool = False, batch_size: int = 5000):
+    """Fold the reviews not rolled up yet into the daily rollups, or rebuild them"""
+    engine = create_engine_from_settings(url=absolute_database_url(get_settings().database_url))
+    try:
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        
+        async with async_session() as db:
+            if rebuild:
+                reviews = await rebuild_rollups(db)
+                await db.commit()
+                print(f"✅ Rebuilt rollups from {reviews} reviews")
+                return True
+            
+            # Commit per batch so a long backlog does not hold the write lock
+            total = 0
+            while reviews := await catch_up(db, batch_size, max_reviews=batch_size):
+                await db.commit()
+                total += reviews
+            await db.commit()
+            print(f"✅ Folded {total} new reviews into the rollups")
+            return True
+            
+    except Exception as e:
+        print(f"❌ Error updating rollups: {str(e)}")
+        return False
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(catch_up_rollups())
@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator, TextIO, Union
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+class _Buffer:
+    """Sliding window over a text file that JSON values are decoded from"""
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+
+    def fill(self) -> bool:
+        """Drops consumed text and reads the next chunk, False at end of file"""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character, '' at end of file"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON stream, got {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number ending the window may continue in the next chunk
+            if end == len(self.text) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+def iter_json_array(
+    path: Union[str, Path],
+    key: str,
+    chunk_size: int = 1 << 16
+) -> Iterator[Any]:
+    """
+    Streams the items of one array member of a top-level JSON object,
+    e.g. the words of ``{"words": [...]}``, without loading the whole file.
+    Only one item is decoded and held in memory at a time.
+    Args:
+        path: JSON file to read
+        key: Name of the array member to stream
+        chunk_size: Characters read from the file at a time
+    Returns:
+        Iterator over the decoded array items
+    Raises:
+        KeyError: If the object has no ``key`` member
+        ValueError: If the file is not a JSON object of the expected shape
+    """
+    with open(path, encoding="utf-8") as f:
+        buffer = _Buffer(f, chunk_size)
+        buffer.expect("{")
+        if buffer.peek() == "}":
+            raise KeyError(key)
+        while True:
+            name = buffer.value()
+            buffer.expect(":")
+            if name == key:
+                buffer.expect("[")
+                if buffer.peek() == "]":
+                    return
+                while True:
+                    yield buffer.value()
+                    if buffer.expect(",]") == "]":
+                        return
+            # Skip members we are not streaming
+            buffer.value()
+            if buffer.expect(",}") == "}":
+                raise KeyError(key)
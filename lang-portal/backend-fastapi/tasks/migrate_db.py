@@ -1,28 +1,42 @@
 import os
 from pathlib import Path
+from typing import Optional
 from alembic import command
 from alembic.config import Config
+from app.config import absolute_database_url, get_settings
 
-def migrate_db():
+def alembic_config(database_url: Optional[str] = None, configure_logging: bool = True) -> Config:
+    """
+    Builds the Alembic config for the backend's migrations.
+    Args:
+        database_url: Database to migrate, defaults to the configured one
+        configure_logging: Let env.py apply alembic.ini's logging config,
+            turned off when migrating inside the running server
+    """
+    # Get root directory and create alembic.ini path
+    root_dir = Path(__file__).parent.parent
+    alembic_cfg = Config(str(root_dir / "alembic.ini"))
+
+    # Set migrations directory
+    alembic_cfg.set_main_option("script_location", str(root_dir / "migrations"))
+    database_url = absolute_database_url(database_url or get_settings().database_url)
+    # ConfigParser treats % as interpolation, e.g. in URL-encoded passwords
+    alembic_cfg.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+    alembic_cfg.attributes["configure_logger"] = configure_logging
+    return alembic_cfg
+
+def migrate_db(database_url: Optional[str] = None, configure_logging: bool = True):
     """Run database migrations"""
     try:
-        # Get root directory and create alembic.ini path
-        root_dir = Path(__file__).parent.parent
-        alembic_cfg = Config(str(root_dir / "alembic.ini"))
-        
-        # Set migrations directory
-        alembic_cfg.set_main_option("script_location", str(root_dir / "migrations"))
-        alembic_cfg.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{root_dir}/words.db")
-        
         # Run migrations
-        command.upgrade(alembic_cfg, "head")
-        
+        command.upgrade(alembic_config(database_url, configure_logging), "head")
+
         print("✅ Database migrations completed successfully")
         return True
-        
+
     except Exception as e:
         print(f"❌ Error running migrations: {str(e)}")
         return False
 
 if __name__ == "__main__":
-    migrate_db() 
\ No newline at end of file
+    migrate_db()
@@ -0,0 +1,27 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.config import absolute_database_url, get_settings
+from app.db import create_engine_from_settings
+from app.services.scheduler import rebuild_schedules as rebuild_word_schedules
+
+async def rebuild_schedules(batch_size: int = 5000):
+    """Recompute the spaced-repetition schedules by replaying word_review_items"""
+    engine = create_engine_from_settings(url=absolute_database_url(get_settings().database_url))
+    try:
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        
+        async with async_session() as db:
+            rows = await rebuild_word_schedules(db, batch_size)
+            await db.commit()
+            print(f"✅ Rebuilt schedules for {rows} words")
+            return True
+            
+    except Exception as e:
+        print(f"❌ Error rebuilding schedules: {str(e)}")
+        return False
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(rebuild_schedules())
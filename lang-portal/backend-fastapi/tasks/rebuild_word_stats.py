@@ -0,0 +1,37 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.config import absolute_database_url, get_settings
+from app.db import create_engine_from_settings
+from app.services.word_stats import rebuild_word_stats, verify_word_stats
+
+async def rebuild_stats(verify_only: bool = False):
+    """Recompute (or only verify) the word_stats counters from word_review_items"""
+    engine = create_engine_from_settings(url=absolute_database_url(get_settings().database_url))
+    try:
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        
+        async with async_session() as db:
+            mismatches = await verify_word_stats(db)
+            if verify_only:
+                if mismatches:
+                    print(f"❌ {len(mismatches)} words have out of sync review counters")
+                    for word_id, counts in sorted(mismatches.items())[:20]:
+                        print(f"   word {word_id}: stored={counts['stored']} actual={counts['actual']}")
+                    return False
+                print("✅ Word review counters are consistent")
+                return True
+            
+            rows = await rebuild_word_stats(db)
+            await db.commit()
+            print(f"✅ Rebuilt review counters for {rows} words ({len(mismatches)} were out of sync)")
+            return True
+            
+    except Exception as e:
+        print(f"❌ Error rebuilding word stats: {str(e)}")
+        return False
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(rebuild_stats())
@@ -1,101 +1,247 @@
-import json
+import random
+import time
+from itertools import islice
 from pathlib import Path
 from datetime import datetime, timedelta
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from typing import Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
+from app.config import BACKEND_ROOT, absolute_database_url, get_settings
+from app.db import create_engine_from_settings
+from app.services.rollups import rebuild_rollups
+from app.services.scheduler import rebuild_schedules
+from app.services.versions import bump_versions
+from app.services.word_stats import rebuild_word_stats
 from app.database.models import (
     Word, Group, WordGroup, StudyActivity,
     StudySession, WordReviewItem
 )
+from tasks.json_stream import iter_json_array
 
-async def seed_data():
-    """Seed database with initial data"""
+# Rows sent per INSERT batch
+BATCH_SIZE = 5000
+# Synthetic history generated by --scale
+REVIEWS_PER_SESSION = 50
+HISTORY_DAYS = 365
+CORRECT_RATIO = 0.8
+# Words reviewed in the small sample history of the last 3 days
+SAMPLE_WORDS = ("こんにちは", "ありがとう")
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+async def _insert_ids(db: AsyncSession, model, rows: List[dict]) -> List[int]:
+    """
+    Inserts rows in one executemany and returns their ids in input order.
+    The ids are read back above the previous maximum. That matches the
+    insert order because the seed runs as the only writer in one
+    transaction; RETURNING with a guaranteed order would make SQLite fall
+    back to one statement per row.
+    """
+    last_id = await db.scalar(select(func.max(model.id))) or 0
+    await db.execute(model.__table__.insert(), rows)
+    result = await db.execute(
+        select(model.id).where(model.id > last_id).order_by(model.id)
+    )
+    ids = list(result.scalars())
+    if len(ids) != len(rows):
+        raise RuntimeError(f"Concurrent writes to {model.__tablename__} while seeding")
+    return ids
+
+async def _insert_groups(db: AsyncSession, names: List[str], groups_map: Dict[str, int]) -> None:
+    names = [name for name in dict.fromkeys(names) if name not in groups_map]
+    if names:
+        ids = await _insert_ids(db, Group, [{"name": name} for name in names])
+        groups_map.update(zip(names, ids))
+
+async def _seed_sample_history(
+    db: AsyncSession,
+    group_ids: List[int],
+    activity_ids: List[int],
+    sample_word_ids: List[int]
+) -> None:
+    """One session per activity and group for each of the last 3 days"""
+    now = datetime.utcnow()
+    sessions = [
+        {
+            "group_id": group_id,
+            "study_activity_id": activity_id,
+            "created_at": now - timedelta(days=days_ago)
+        }
+        for days_ago in range(3)
+        for activity_id in activity_ids
+        for group_id in group_ids
+    ]
+    if not sessions:
+        return
+    session_ids = await _insert_ids(db, StudySession, sessions)
+    reviews = [
+        {
+            "word_id": word_id,
+            "study_session_id": session_id,
+            "correct": True,
+            "created_at": session["created_at"]
+        }
+        for session_id, session in zip(session_ids, sessions)
+        for word_id in sample_word_ids
+    ]
+    if reviews:
+        await db.execute(WordReviewItem.__table__.insert(), reviews)
+
+async def _seed_synthetic_history(
+    db: AsyncSession,
+    scale: int,
+    group_words: Dict[int, List[int]],
+    activity_ids: List[int],
+    batch_size: int
+) -> int:
+    """
+    Generates about ``scale`` reviews per word, spread over sessions of the
+    last HISTORY_DAYS days. Uses a fixed seed so runs are reproducible.
+    Returns:
+        Number of review items generated
+    """
+    group_words = {group_id: ids for group_id, ids in group_words.items() if ids}
+    if not group_words or not activity_ids:
+        return 0
+    rng = random.Random(42)
+    group_ids = list(group_words)
+    total_reviews = scale * len({w for ids in group_words.values() for w in ids})
+    sessions_per_batch = max(1, batch_size // REVIEWS_PER_SESSION)
+    now = datetime.utcnow()
+
+    generated = 0
+    while generated < total_reviews:
+        sessions = []
+        for _ in range(sessions_per_batch):
+            if generated + len(sessions) * REVIEWS_PER_SESSION >= total_reviews:
+                break
+            sessions.append({
+                "group_id": rng.choice(group_ids),
+                "study_activity_id": rng.choice(activity_ids),
+                "created_at": now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+            })
+        session_ids = await _insert_ids(db, StudySession, sessions)
+
+        reviews = []
+        for session_id, session in zip(session_ids, sessions):
+            words = group_words[session["group_id"]]
+            for i in range(min(REVIEWS_PER_SESSION, total_reviews - generated - len(reviews))):
+                reviews.append({
+                    "word_id": rng.choice(words),
+                    "study_session_id": session_id,
+                    "correct": rng.random() < CORRECT_RATIO,
+                    "created_at": session["created_at"] + timedelta(seconds=10 * i)
+                })
+        await db.execute(WordReviewItem.__table__.insert(), reviews)
+        generated += len(reviews)
+    return generated
+
+async def seed_data(
+    scale: int = 0,
+    batch_size: int = BATCH_SIZE,
+    seeds_dir: Optional[Path] = None,
+    database_url: Optional[str] = None
+):
+    """
+    Seed database with initial data.
+    Seed files are streamed and inserted with batched Core INSERTs in a
+    single transaction, group links are resolved from an in-memory
+    name -> id map. Groups named by words but missing from groups.json
+    are created on the fly.
+    Args:
+        scale: Generate about this many synthetic reviews per word, spread
+            over the last year, for load testing. 0 only adds the small
+            sample history of the last 3 days.
+        batch_size: Rows per INSERT batch
+        seeds_dir: Directory with the seed files, defaults to seeds/
+        database_url: Database to seed, defaults to the configured one
+    """
+    engine = None
     try:
-        root_dir = Path(__file__).parent.parent
-        engine = create_async_engine(f"sqlite+aiosqlite:///{root_dir}/words.db")
+        started = time.perf_counter()
+        seeds_dir = Path(seeds_dir or BACKEND_ROOT / "seeds")
+        engine = create_engine_from_settings(
+            url=absolute_database_url(database_url or get_settings().database_url)
+        )
         async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-        
+
         async with async_session() as db:
-            # 1. Load and insert groups
-            with open(root_dir / "seeds" / "groups.json") as f:
-                groups_data = json.load(f)
-            
-            groups_map = {}  # Store group id mapping
-            for group_data in groups_data["groups"]:
-                group = Group(name=group_data["name"])
-                db.add(group)
-                await db.flush()
-                groups_map[group.name] = group
-            
-            # 2. Load and insert words with group associations
-            with open(root_dir / "seeds" / "words.json") as f:
-                words_data = json.load(f)
-            
-            words_map = {}  # Store word id mapping
-            for word_data in words_data["words"]:
-                word = Word(
-                    japanese=word_data["japanese"],
-                    romaji=word_data["romaji"],
-                    english=word_data["english"]
+            # 1. Groups
+            groups_map: Dict[str, int] = {}
+            groups_file = seeds_dir / "groups.json"
+            if groups_file.exists():
+                for batch in _batched(iter_json_array(groups_file, "groups"), batch_size):
+                    await _insert_groups(db, [g["name"] for g in batch], groups_map)
+
+            # 2. Words and their group links
+            group_words: Dict[int, List[int]] = {}
+            sample_word_ids = []
+            words_count = 0
+            for batch in _batched(iter_json_array(seeds_dir / "words.json", "words"), batch_size):
+                await _insert_groups(
+                    db, [name for w in batch for name in w.get("groups", [])], groups_map
+                )
+                word_ids = await _insert_ids(db, Word, [
+                    {"japanese": w["japanese"], "romaji": w["romaji"], "english": w["english"]}
+                    for w in batch
+                ])
+                links = []
+                for word_id, word_data in zip(word_ids, batch):
+                    if word_data["japanese"] in SAMPLE_WORDS:
+                        sample_word_ids.append(word_id)
+                    for group_name in dict.fromkeys(word_data.get("groups", [])):
+                        group_id = groups_map[group_name]
+                        links.append({"word_id": word_id, "group_id": group_id})
+                        group_words.setdefault(group_id, []).append(word_id)
+                if links:
+                    await db.execute(WordGroup.__table__.insert(), links)
+                words_count += len(word_ids)
+
+            # 3. Study activities
+            activity_ids = []
+            for batch in _batched(
+                iter_json_array(seeds_dir / "study_activities.json", "activities"), batch_size
+            ):
+                activity_ids += await _insert_ids(db, StudyActivity, batch)
+
+            # 4. Review history
+            await _seed_sample_history(
+                db, list(groups_map.values()), activity_ids, sample_word_ids
+            )
+            reviews_count = 0
+            if scale > 0:
+                reviews_count = await _seed_synthetic_history(
+                    db, scale, group_words, activity_ids, batch_size
                 )
-                db.add(word)
-                await db.flush()
-                words_map[word.japanese] = word
-                
-                # Create word-group associations
-                for group_name in word_data["groups"]:
-                    group = groups_map[group_name]
-                    word_group = WordGroup(word_id=word.id, group_id=group.id)
-                    db.add(word_group)
-            
-            # 3. Load and insert study activities
-            with open(root_dir / "seeds" / "study_activities.json") as f:
-                activities_data = json.load(f)
-            
-            activities_map = {}  # Store activity id mapping
-            for activity_data in activities_data["activities"]:
-                activity = StudyActivity(**activity_data)
-                db.add(activity)
-                await db.flush()
-                activities_map[activity.name] = activity
-            
-            # 4. Create sample study sessions and reviews
-            # Last 3 days of study sessions
-            for days_ago in range(3):
-                session_date = datetime.utcnow() - timedelta(days=days_ago)
-                
-                # Create one session per activity per day
-                for activity in activities_map.values():
-                    for group in groups_map.values():
-                        session = StudySession(
-                            group_id=group.id,
-                            study_activity_id=activity.id,
-                            created_at=session_date
-                        )
-                        db.add(session)
-                        await db.flush()
-                        
-                        # Add some word reviews for each session
-                        for word in words_map.values():
-                            # Randomly review some words (simulate real usage)
-                            if word.japanese in ["こんにちは", "ありがとう"]:  # Sample frequently reviewed words
-                                review = WordReviewItem(
-                                    word_id=word.id,
-                                    study_session_id=session.id,
-                                    correct=True,  # Simulate mostly correct answers
-                                    created_at=session_date
-                                )
-                                db.add(review)
-            
+
+            # 5. Materialize the per-word review counters, schedules and rollups
+            await rebuild_word_stats(db)
+            await rebuild_schedules(db, batch_size)
+            await rebuild_rollups(db)
+            await bump_versions(
+                db, Group, Word, WordGroup, StudyActivity, StudySession, WordReviewItem
+            )
+
             await db.commit()
-            print("✅ Database seeded successfully")
+            total_sessions = await db.scalar(select(func.count()).select_from(StudySession))
+            print(
+                f"✅ Database seeded successfully: {words_count} words, {len(groups_map)} groups, "
+                f"{len(activity_ids)} activities, {total_sessions} sessions "
+                f"({reviews_count} synthetic reviews) in {time.perf_counter() - started:.1f}s"
+            )
             return True
-            
+
     except Exception as e:
         print(f"❌ Error seeding database: {str(e)}")
         return False
+    finally:
+        if engine is not None:
+            await engine.dispose()
 
 if __name__ == "__main__":
     import asyncio
-    asyncio.run(seed_data()) 
\ No newline at end of file
+    asyncio.run(seed_data())
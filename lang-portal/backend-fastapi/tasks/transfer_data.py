@@ -0,0 +1,71 @@
+import sys
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.config import absolute_database_url, get_settings
+from app.db import create_engine_from_settings
+from app.services.transfer import InvalidImportLine, export_ndjson, import_ndjson
+
+def _session_factory(database_url=None):
+    engine = create_engine_from_settings(
+        url=absolute_database_url(database_url or get_settings().database_url)
+    )
+    return engine, sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+async def export_data(output: str, batch_size: int = 1000, database_url=None):
+    """Export the database as NDJSON to a file, or stdout for '-'"""
+    engine, async_session = _session_factory(database_url)
+    try:
+        lines = 0
+        out = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+        try:
+            async with async_session() as db:
+                async for chunk in export_ndjson(db, batch_size=batch_size):
+                    out.write(chunk)
+                    lines += chunk.count("\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        print(f"✅ Exported {lines} records to {output}", file=sys.stderr)
+        return True
+
+    except Exception as e:
+        print(f"❌ Error exporting data: {str(e)}", file=sys.stderr)
+        return False
+    finally:
+        await engine.dispose()
+
+async def import_data(path: str, start_line: int = 0, chunk_size: int = 1000, database_url=None):
+    """
+    Import an NDJSON export. Prints a checkpoint after every committed chunk,
+    an interrupted import is resumed with --start-line <checkpoint>.
+    """
+    engine, async_session = _session_factory(database_url)
+    checkpoint = start_line
+
+    def on_commit(committed: int) -> None:
+        nonlocal checkpoint
+        if committed != checkpoint:
+            checkpoint = committed
+            print(f"   committed through line {committed}")
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            async with async_session() as db:
+                result = await import_ndjson(
+                    db, f, start_line=start_line, chunk_size=chunk_size, on_commit=on_commit
+                )
+        print(f"✅ Imported {sum(result.rows.values())} records from {result.lines} lines: {result.rows}")
+        return True
+
+    except InvalidImportLine as e:
+        print(f"❌ {e}. Resume with --start-line {e.committed_lines}")
+        return False
+    except Exception as e:
+        print(f"❌ Error importing data: {str(e)}. Resume with --start-line {checkpoint}")
+        return False
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(export_data("-"))
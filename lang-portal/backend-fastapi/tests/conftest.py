@@ -1,6 +1,5 @@
 import os
 import pytest
-import asyncio
 from typing import AsyncGenerator, Generator
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
@@ -9,16 +8,18 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.db import get_db
+from app.db import QueryCounter, get_db, get_engine, get_read_db, get_session_factory
 from app.database.models import Base
 
-# Test database URL
-TEST_DB_URL = "sqlite+aiosqlite:///./test.db"
+# Test database URL, point TEST_DATABASE_URL at a Postgres database
+# (see docker-compose.test.yml) to run the suite against asyncpg
+TEST_DB_URL = os.environ.get("TEST_DATABASE_URL", "sqlite+aiosqlite:///./test.db")
+IS_SQLITE = TEST_DB_URL.startswith("sqlite")
 
 # Create async engine for tests
 engine = create_async_engine(
     TEST_DB_URL,
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
     poolclass=NullPool
 )
 
@@ -31,16 +32,6 @@ TestingSessionLocal = sessionmaker(
     autoflush=False
 )
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for tests."""
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
-
 @pytest.fixture(autouse=True)
 async def setup_db():
     async with engine.begin() as conn:
@@ -49,6 +40,13 @@ async def setup_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Cached responses must not leak between tests"""
+    from app.cache import dashboard_cache
+    dashboard_cache.invalidate()
+    yield
+
 @pytest.fixture
 async def db():
     async with TestingSessionLocal() as session:
@@ -57,10 +55,23 @@ async def db():
         finally:
             await session.close()
 
+@pytest.fixture
+async def db_session(db):
+    """Alias of ``db`` used by the model and API fixtures."""
+    return db
+
+@pytest.fixture
+def query_counter():
+    """Counts SQL statements run on the test engine inside ``with query_counter:``"""
+    return QueryCounter(engine)
+
 @pytest.fixture
 async def client(db):
     """Get test client."""
     app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_read_db] = lambda: db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    app.dependency_overrides[get_engine] = lambda: engine
     async with AsyncClient(app=app, base_url="http://test", follow_redirects=True) as ac:
         yield ac
     app.dependency_overrides.clear()
@@ -0,0 +1,252 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from app.database.models import (
+    Group, Word, StudySession, WordReviewItem, ReviewRollup, ReviewRollupWord, RollupState
+)
+from app.services.rollups import catch_up_rollups, rebuild_rollups
+
+# Statements quick-stats may run, independent of history length
+QUICK_STATS_QUERY_BUDGET = 1
+
+async def add_sessions(db_session, group, activity, days_ago):
+    now = datetime.utcnow()
+    db_session.add_all([
+        StudySession(
+            group_id=group.id,
+            study_activity_id=activity.id,
+            created_at=now - timedelta(days=d)
+        ) for d in days_ago
+    ])
+    await db_session.commit()
+
+@pytest.mark.asyncio
+async def test_quick_stats_year_long_streak(
+    client, db_session, test_group, test_study_activity, query_counter
+):
+    # Two sessions on some days must not double count
+    await add_sessions(db_session, test_group, test_study_activity, list(range(365)) + [0, 10])
+
+    with query_counter:
+        response = await client.get("/api/dashboard/quick-stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["study_streak_days"] == 365
+    assert data["total_study_sessions"] == 367
+    assert data["total_active_groups"] == 1
+    assert query_counter.count <= QUICK_STATS_QUERY_BUDGET
+
+@pytest.mark.asyncio
+async def test_quick_stats_streak_stops_at_gap(client, db_session, test_group, test_study_activity):
+    await add_sessions(db_session, test_group, test_study_activity, [0, 1, 2, 4, 5])
+    response = await client.get("/api/dashboard/quick-stats")
+    assert response.json()["study_streak_days"] == 3
+
+@pytest.mark.asyncio
+async def test_quick_stats_no_session_today(client, db_session, test_group, test_study_activity):
+    await add_sessions(db_session, test_group, test_study_activity, [1, 2])
+    response = await client.get("/api/dashboard/quick-stats")
+    assert response.json()["study_streak_days"] == 0
+
+@pytest.mark.asyncio
+async def test_quick_stats_success_rate(client, test_word, test_study_session):
+    for correct in (True, True, True, False):
+        await client.post(
+            f"/api/study_sessions/{test_study_session.id}/words/{test_word.id}/review",
+            json={"correct": correct}
+        )
+    response = await client.get("/api/dashboard/quick-stats")
+    data = response.json()
+    assert data["success_rate"] == 75.0
+    assert data["study_streak_days"] == 1
+
+@pytest.mark.asyncio
+async def test_dashboard_cache_invalidated_by_review(client, test_word, test_study_session):
+    before = (await client.get("/api/dashboard/cache_stats")).json()
+    response = await client.get("/api/dashboard/study_progress")
+    assert response.json()["total_words_studied"] == 0
+    response = await client.get("/api/dashboard/study_progress")
+    assert response.json()["total_words_studied"] == 0
+
+    stats = (await client.get("/api/dashboard/cache_stats")).json()
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 1
+
+    await client.post(
+        f"/api/study_sessions/{test_study_session.id}/words/{test_word.id}/review",
+        json={"correct": True}
+    )
+    response = await client.get("/api/dashboard/study_progress")
+    assert response.json()["total_words_studied"] == 1
+
+@pytest.mark.asyncio
+async def test_dashboard_cache_invalidated_by_new_session(client, test_group, test_study_activity):
+    response = await client.get("/api/dashboard/last_study_session")
+    assert response.status_code == 404
+
+    response = await client.post(
+        "/api/study_activities",
+        json={"group_id": test_group.id, "study_activity_id": test_study_activity.id}
+    )
+    assert response.status_code == 200
+    session_id = response.json()["id"]
+
+    response = await client.get("/api/dashboard/last_study_session")
+    assert response.status_code == 200
+    assert response.json()["id"] == session_id
+
+@pytest.mark.asyncio
+async def test_review_history_from_rollups(
+    client, db_session, test_word, test_group, test_study_activity, test_study_session, query_counter
+):
+    other_word = Word(japanese="猫", romaji="neko", english="cat")
+    db_session.add(other_word)
+    await db_session.commit()
+
+    # Reviews written directly are picked up by the catch-up job
+    three_days_ago = datetime.utcnow() - timedelta(days=3)
+    db_session.add_all([
+        WordReviewItem(word_id=test_word.id, study_session_id=test_study_session.id,
+                       correct=correct, created_at=three_days_ago)
+        for correct in (True, False, True, True)
+    ])
+    await db_session.commit()
+    assert await catch_up_rollups(db_session) == 4
+    await db_session.commit()
+    assert await catch_up_rollups(db_session) == 0
+
+    # Reviews through the API update the rollups in the same transaction
+    response = await client.post(
+        f"/api/study_sessions/{test_study_session.id}/review",
+        json={"reviews": [
+            {"word_id": test_word.id, "correct": True},
+            {"word_id": other_word.id, "correct": False},
+            {"word_id": other_word.id, "correct": True},
+        ]}
+    )
+    assert response.status_code == 200
+
+    with query_counter:
+        response = await client.get("/api/dashboard/review_history", params={"days": 7})
+    assert response.status_code == 200
+    assert query_counter.count == 1
+    data = response.json()
+    assert data["total_reviews"] == 7
+    assert data["success_rate"] == 71.4
+    assert len(data["items"]) == 7
+    assert data["items"][3] == {
+        "day": three_days_ago.date().isoformat(),
+        "reviews": 4, "correct_count": 3, "success_rate": 75.0, "distinct_words": 1
+    }
+    assert data["items"][-1]["reviews"] == 3
+    assert data["items"][-1]["distinct_words"] == 2
+
+    response = await client.get(f"/api/groups/{test_group.id}/review_history", params={"days": 7})
+    assert response.json()["key_id"] == test_group.id
+    assert response.json()["total_reviews"] == 7
+
+    # A session in another group only counts towards that group and the activity
+    other_group = Group(name="Other Group")
+    db_session.add(other_group)
+    await db_session.flush()
+    other_session = StudySession(group_id=other_group.id, study_activity_id=test_study_activity.id)
+    db_session.add(other_session)
+    await db_session.commit()
+    await client.post(
+        f"/api/study_sessions/{other_session.id}/review",
+        json={"reviews": [{"word_id": test_word.id, "correct": True}]}
+    )
+    group_history = (await client.get(f"/api/groups/{test_group.id}/review_history")).json()
+    activity_history = (
+        await client.get(f"/api/study_activities/{test_study_activity.id}/review_history")
+    ).json()
+    assert len(group_history["items"]) == 90
+    assert group_history["total_reviews"] == 7
+    assert activity_history["total_reviews"] == 8
+
+@pytest.mark.asyncio
+async def test_reset_history_clears_rollups(client, db_session, test_word, test_study_session):
+    await client.post(
+        f"/api/study_sessions/{test_study_session.id}/review",
+        json={"reviews": [{"word_id": test_word.id, "correct": True}]}
+    )
+    assert (await client.post("/api/reset_history")).status_code == 200
+    response = await client.get("/api/dashboard/review_history")
+    assert response.json()["total_reviews"] == 0
+
+@pytest.mark.asyncio
+async def test_rollup_rebuild_matches_incremental(
+    db_session, test_word, test_group, test_study_activity, test_study_session
+):
+    other_word = Word(japanese="猫", romaji="neko", english="cat")
+    other_session = StudySession(group_id=test_group.id, study_activity_id=test_study_activity.id)
+    db_session.add_all([other_word, other_session])
+    await db_session.flush()
+    now = datetime.utcnow()
+    db_session.add_all([
+        WordReviewItem(
+            word_id=(test_word.id, other_word.id)[i % 2],
+            study_session_id=(test_study_session.id, other_session.id)[i % 3 == 0],
+            correct=i % 4 != 0,
+            created_at=now - timedelta(days=i % 5, minutes=i)
+        ) for i in range(40)
+    ])
+    await db_session.commit()
+
+    async def snapshot():
+        rollups = (await db_session.execute(select(ReviewRollup.__table__).order_by(
+            ReviewRollup.dimension, ReviewRollup.key_id, ReviewRollup.day
+        ))).all()
+        words = (await db_session.execute(select(func.count()).select_from(ReviewRollupWord))).scalar()
+        return rollups, words
+
+    # Small batches split days and cells across several catch-up rounds
+    assert await catch_up_rollups(db_session, batch_size=7) == 40
+    await db_session.commit()
+    incremental = await snapshot()
+
+    assert await rebuild_rollups(db_session) == 40
+    await db_session.commit()
+    assert await snapshot() == incremental
+    assert await catch_up_rollups(db_session) == 0
+
+@pytest.mark.asyncio
+async def test_catch_up_counts_reviews_committed_out_of_id_order(
+    client, db_session, test_word, test_study_session
+):
+    # On Postgres a review with a lower id can commit after a higher one
+    # was folded in, as if its transaction had been open meanwhile
+    now = datetime.utcnow()
+    db_session.add(WordReviewItem(
+        id=11, word_id=test_word.id, study_session_id=test_study_session.id,
+        correct=True, created_at=now
+    ))
+    await db_session.commit()
+    assert await catch_up_rollups(db_session) == 1
+    await db_session.commit()
+
+    db_session.add(WordReviewItem(
+        id=10, word_id=test_word.id, study_session_id=test_study_session.id,
+        correct=False, created_at=now
+    ))
+    await db_session.commit()
+    assert await catch_up_rollups(db_session) == 1
+    await db_session.commit()
+
+    response = await client.get("/api/dashboard/review_history", params={"days": 1})
+    assert response.json()["total_reviews"] == 2
+    assert await rebuild_rollups(db_session) == 2
+
+@pytest.mark.asyncio
+async def test_catch_up_creates_missing_state_row(db_session, test_word, test_study_session):
+    # A reset deletes the state row, the next catch-up recreates it
+    db_session.add(WordReviewItem(
+        word_id=test_word.id, study_session_id=test_study_session.id, correct=True
+    ))
+    await db_session.commit()
+    assert await catch_up_rollups(db_session) == 1
+    await db_session.commit()
+    await db_session.execute(RollupState.__table__.delete())
+    await db_session.commit()
+    assert await catch_up_rollups(db_session) == 0
+    assert await db_session.scalar(select(func.count()).select_from(RollupState)) == 1
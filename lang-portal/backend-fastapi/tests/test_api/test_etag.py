@@ -0,0 +1,63 @@
+import pytest
+
+async def review(client, session_id, word_id, correct=True):
+    response = await client.post(
+        f"/api/study_sessions/{session_id}/words/{word_id}/review",
+        json={"correct": correct}
+    )
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_words_conditional_get(client, test_word, test_study_session, query_counter):
+    response = await client.get("/api/words")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    # An unchanged list costs one version lookup
+    with query_counter:
+        response = await client.get("/api/words", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert query_counter.count == 1
+
+    # Query parameters are part of the tag
+    response = await client.get("/api/words", params={"page": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+    # A review changes the counts, so the tag changes
+    await review(client, test_study_session.id, test_word.id)
+    response = await client.get("/api/words", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["items"][0]["correct_count"] == 1
+
+@pytest.mark.asyncio
+async def test_group_words_conditional_get(
+    client, db_session, test_word, test_group, test_study_session
+):
+    from app.database.models import WordGroup
+    db_session.add(WordGroup(word_id=test_word.id, group_id=test_group.id))
+    await db_session.commit()
+    url = f"/api/groups/{test_group.id}/words"
+
+    etag = (await client.get(url)).headers["etag"]
+    assert (await client.get(url, headers={"If-None-Match": f'"other", {etag}'})).status_code == 304
+
+    # Starting a study session does not touch the words of a group
+    response = await client.post("/api/study_activities", json={
+        "group_id": test_group.id, "study_activity_id": test_study_session.study_activity_id
+    })
+    assert response.status_code == 200
+    assert (await client.get(url, headers={"If-None-Match": etag})).status_code == 304
+
+    await client.post("/api/reset_history")
+    assert (await client.get(url, headers={"If-None-Match": etag})).status_code == 200
+
+@pytest.mark.asyncio
+async def test_time_dependent_routes_have_no_etag(client, test_group):
+    response = await client.get(f"/api/groups/{test_group.id}/due_words")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    response = await client.get("/api/dashboard/quick-stats")
+    assert "etag" not in response.headers
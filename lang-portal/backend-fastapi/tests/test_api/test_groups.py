@@ -1,5 +1,9 @@
 import pytest
+from datetime import datetime, timedelta
 from httpx import AsyncClient
+from sqlalchemy import select
+from app.database.models import Word, WordGroup, WordSchedule
+from app.services.scheduler import load_due_words, update_schedules
 
 @pytest.mark.asyncio
 async def test_get_groups(client, test_group):
@@ -20,7 +24,6 @@ async def test_get_group_detail(client, test_group):
 @pytest.mark.asyncio
 async def test_get_group_words(client, test_group, test_word):
     # Add word to group first
-    from app.database.models import WordGroup
     async with AsyncClient(app=client.app) as ac:
         await ac.post(f"/api/groups/{test_group.id}/words/{test_word.id}")
     
@@ -28,4 +31,66 @@ async def test_get_group_words(client, test_group, test_word):
     assert response.status_code == 200
     data = response.json()
     assert len(data["items"]) == 1
-    assert data["items"][0]["japanese"] == "テスト" 
\ No newline at end of file
+    assert data["items"][0]["japanese"] == "テスト" 
+
+async def add_group_words(db_session, group, count):
+    words = [Word(japanese=f"語{i}", romaji=f"go{i}", english=f"word {i}") for i in range(count)]
+    db_session.add_all(words)
+    await db_session.flush()
+    db_session.add_all([WordGroup(word_id=w.id, group_id=group.id) for w in words])
+    await db_session.commit()
+    return words
+
+@pytest.mark.asyncio
+async def test_due_words_scheduling(client, db_session, test_group, test_study_session):
+    words = await add_group_words(db_session, test_group, 4)
+
+    # Nothing reviewed yet: all words are new, in id order
+    response = await client.get(f"/api/groups/{test_group.id}/due_words", params={"limit": 3})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [w.id for w in words[:3]]
+    assert all(item["is_new"] for item in items)
+
+    # Answering through the API schedules the words
+    response = await client.post(
+        f"/api/study_sessions/{test_study_session.id}/review",
+        json={"reviews": [
+            {"word_id": words[0].id, "correct": True},
+            {"word_id": words[1].id, "correct": False},
+        ]}
+    )
+    assert response.status_code == 200
+    response = await client.get(f"/api/groups/{test_group.id}/due_words")
+    assert [item["id"] for item in response.json()["items"]] == [words[2].id, words[3].id]
+
+    # A day later both are due again (ties by id), followed by the new words
+    later = datetime.utcnow() + timedelta(days=2)
+    due = await load_due_words(db_session, test_group.id, 10, now=later)
+    assert [(w.id, w.is_new) for w in due] == [
+        (words[0].id, False), (words[1].id, False), (words[2].id, True), (words[3].id, True)
+    ]
+    assert (due[0].interval_days, due[0].repetitions) == (1, 1)
+    assert (due[1].interval_days, due[1].repetitions, due[1].ease) == (1, 0, 1.96)
+
+    # Another correct answer pushes the word out six days
+    await update_schedules(db_session, [(words[0].id, True)], later)
+    await db_session.commit()
+    due = await load_due_words(db_session, test_group.id, 10, now=later + timedelta(days=5))
+    assert words[0].id not in [w.id for w in due]
+
+@pytest.mark.asyncio
+async def test_bulk_review_repeats_are_one_schedule_step(client, db_session, test_word, test_study_session):
+    # Compounding 40 correct answers would overflow the due date
+    response = await client.post(
+        f"/api/study_sessions/{test_study_session.id}/review",
+        json={"reviews": [{"word_id": test_word.id, "correct": True}] * 40}
+    )
+    assert response.status_code == 200
+    schedule = await db_session.scalar(select(WordSchedule))
+    assert (schedule.interval_days, schedule.repetitions) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_due_words_unknown_group(client):
+    response = await client.get("/api/groups/999/due_words")
+    assert response.status_code == 404
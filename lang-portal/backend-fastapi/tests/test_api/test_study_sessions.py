@@ -1,10 +1,14 @@
 import pytest
+from datetime import datetime, timedelta
 from httpx import AsyncClient
+from app.config import get_settings
+from app.database.models import StudySession, WordReviewItem
+from app.services.word_stats import load_word_stats, verify_word_stats
+from app.utils import encode_cursor
 
 @pytest.mark.asyncio
 async def test_get_sessions(client, test_group, test_study_activity):
     # Create a study session first
-    from app.database.models import StudySession
     async with AsyncClient(app=client.app) as ac:
         response = await ac.post(
             "/api/study_sessions",
@@ -42,4 +46,164 @@ async def test_review_word(client, test_word, test_group, test_study_activity):
     assert response.status_code == 200
     data = response.json()
     assert data["success"] == True
-    assert data["data"]["correct"] == True 
\ No newline at end of file
+    assert data["data"]["correct"] == True 
+
+@pytest.mark.asyncio
+async def test_get_sessions_cursor_pagination(client, db_session, test_group, test_study_activity):
+    start = datetime(2025, 1, 1, 9, 30)
+    db_session.add_all([
+        StudySession(
+            group_id=test_group.id,
+            study_activity_id=test_study_activity.id,
+            created_at=start + timedelta(hours=i)
+        ) for i in range(5)
+    ])
+    await db_session.commit()
+
+    ids = []
+    params = {"items_per_page": 2, "include_total": False}
+    while True:
+        response = await client.get("/api/study_sessions", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        ids.extend(item["id"] for item in data["items"])
+        if not data["pagination"]["next_cursor"]:
+            break
+        params["after"] = data["pagination"]["next_cursor"]
+
+    assert len(ids) == 5
+    assert ids == sorted(ids)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("values", [[1, 1], [None, 1], ["2025-01-01T09:30:00", "1"], ["yesterday", 1]])
+async def test_get_sessions_tampered_cursor(client, test_study_session, values):
+    response = await client.get("/api/study_sessions", params={"after": encode_cursor(values)})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+@pytest.mark.asyncio
+async def test_review_words_bulk(client, db_session, test_word, test_study_session, query_counter):
+    reviews = [{"word_id": test_word.id, "correct": i % 3 != 0} for i in range(30)]
+    reviews.append({"word_id": 999, "correct": True})
+
+    with query_counter:
+        response = await client.post(
+            f"/api/study_sessions/{test_study_session.id}/review",
+            json={"reviews": reviews}
+        )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["recorded_count"] == 30
+    assert data["failed_count"] == 1
+    assert data["success"] is False
+    assert data["results"][-1] == {
+        "word_id": 999, "correct": True, "recorded": False, "error": "Word not found"
+    }
+    # session + word ids + executemany insert + counters upsert + schedules
+    # select/upsert + rollup catch-up (state lock, new reviews, cells, words,
+    # distinct recount, rolled_up flags) + table version bump, independent
+    # of batch size
+    assert query_counter.count <= 13
+
+    stats = await load_word_stats(db_session, [test_word.id])
+    assert stats[test_word.id].correct_count == 20
+    assert stats[test_word.id].wrong_count == 10
+    assert await verify_word_stats(db_session) == {}
+
+@pytest.mark.asyncio
+async def test_review_words_bulk_unknown_session(client, test_word):
+    response = await client.post(
+        "/api/study_sessions/999/review",
+        json={"reviews": [{"word_id": test_word.id, "correct": True}]}
+    )
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_review_words_bulk_rejects_empty_batch(client, test_study_session):
+    response = await client.post(
+        f"/api/study_sessions/{test_study_session.id}/review",
+        json={"reviews": []}
+    )
+    assert response.status_code == 422
+
+async def add_reviewed_sessions(db_session, test_word, test_group, test_study_activity, count):
+    start = datetime(2025, 2, 1, 8, 0)
+    sessions = []
+    for i in range(count):
+        session = StudySession(
+            group_id=test_group.id,
+            study_activity_id=test_study_activity.id,
+            created_at=start + timedelta(days=i)
+        )
+        db_session.add(session)
+        await db_session.flush()
+        db_session.add_all([
+            WordReviewItem(
+                word_id=test_word.id,
+                study_session_id=session.id,
+                correct=True,
+                created_at=session.created_at + timedelta(minutes=minute)
+            ) for minute in range(1, i + 1)
+        ])
+        sessions.append(session)
+    await db_session.commit()
+    return sessions
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", [
+    "/api/study_sessions",
+    "/api/groups/{group_id}/study_sessions",
+    "/api/study_activities/{activity_id}/study_sessions",
+])
+async def test_session_lists_single_query(
+    client, db_session, test_word, test_group, test_study_activity, query_counter, path
+):
+    sessions = await add_reviewed_sessions(db_session, test_word, test_group, test_study_activity, 4)
+    url = path.format(group_id=test_group.id, activity_id=test_study_activity.id)
+
+    with query_counter:
+        response = await client.get(url, params={"include_total": False})
+    assert response.status_code == 200
+    # one ETag version lookup, one existence check for the parent resource
+    # at most, one projection
+    assert query_counter.count <= 3
+
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [session.id for session in sessions]
+    assert [item["review_items_count"] for item in items] == [0, 1, 2, 3]
+    assert items[0]["start_time"] == items[0]["created_at"]
+    assert items[3]["start_time"] == "2025-02-04T08:01:00"
+    assert items[3]["end_time"] == "2025-02-04T08:03:00"
+    assert {item["group_name"] for item in items} == {"Test Group"}
+    assert {item["activity_name"] for item in items} == {"Test Activity"}
+
+@pytest.mark.asyncio
+async def test_get_session_review_times(client, db_session, test_word, test_group, test_study_activity):
+    sessions = await add_reviewed_sessions(db_session, test_word, test_group, test_study_activity, 3)
+    response = await client.get(f"/api/study_sessions/{sessions[2].id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["review_items_count"] == 2
+    assert data["start_time"] == "2025-02-03T08:01:00"
+    assert data["end_time"] == "2025-02-03T08:02:00"
+
+    response = await client.get("/api/dashboard/last_study_session")
+    assert response.json()["id"] == sessions[2].id
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", [
+    "/api/study_sessions",
+    "/api/groups/{group_id}/study_sessions",
+    "/api/study_activities/{activity_id}/study_sessions",
+])
+async def test_session_lists_fast_json_responses(
+    client, db_session, test_word, test_group, test_study_activity, monkeypatch, path
+):
+    await add_reviewed_sessions(db_session, test_word, test_group, test_study_activity, 3)
+    url = path.format(group_id=test_group.id, activity_id=test_study_activity.id)
+    default = await client.get(url)
+
+    monkeypatch.setattr(get_settings(), "fast_json_responses", True)
+    fast = await client.get(url)
+    assert fast.status_code == 200
+    assert fast.json() == default.json()
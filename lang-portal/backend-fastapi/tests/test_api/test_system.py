@@ -0,0 +1,154 @@
+import json
+import pytest
+from sqlalchemy import select, func
+from app.config import get_settings
+from app.db import get_session_factory
+from app.database.models import Word, WordGroup, WordReviewItem
+from app.jobs import jobs
+from app.main import app
+from app.services.resets import RESET_HISTORY_MODELS, reset_tables
+from app.services.word_stats import load_word_stats
+from tests.conftest import TestingSessionLocal
+
+async def add_history(db_session, test_word, test_group, test_study_session):
+    db_session.add(WordGroup(word_id=test_word.id, group_id=test_group.id))
+    db_session.add_all([
+        WordReviewItem(word_id=test_word.id, study_session_id=test_study_session.id, correct=correct)
+        for correct in (True, True, False)
+    ])
+    await db_session.commit()
+
+@pytest.mark.asyncio
+async def test_export_streams_ndjson(client, db_session, test_word, test_group, test_study_session):
+    await add_history(db_session, test_word, test_group, test_study_session)
+
+    response = await client.get("/api/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["type"] for r in records] == [
+        "group", "study_activity", "word", "word_group", "study_session",
+        "word_review_item", "word_review_item", "word_review_item"
+    ]
+    assert records[2] == {
+        "type": "word", "id": test_word.id, "japanese": "テスト", "romaji": "tesuto", "english": "test"
+    }
+
+@pytest.mark.asyncio
+async def test_import_round_trip_and_resume(
+    client, db_session, test_word, test_group, test_study_session
+):
+    await add_history(db_session, test_word, test_group, test_study_session)
+    export = (await client.get("/api/export")).text
+    lines = export.splitlines()
+
+    assert (await client.post("/api/full_reset")).status_code == 200
+
+    # Import stops at a broken line after committing the lines before it
+    broken = "\n".join(lines[:6] + ["not json"] + lines[6:]) + "\n"
+    response = await client.post("/api/import", params={"chunk_size": 2}, content=broken.encode())
+    assert response.status_code == 400
+    assert "Line 7" in response.json()["detail"]
+    assert "start_line=6" in response.json()["detail"]
+    assert await db_session.scalar(select(func.count()).select_from(WordReviewItem)) == 1
+
+    # Resuming from an earlier line is safe, existing rows are skipped
+    response = await client.post(
+        "/api/import", params={"start_line": 4, "chunk_size": 2}, content=export.encode()
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["lines"] == len(lines)
+    assert data["rows"]["word_review_item"] == 3
+
+    assert await db_session.scalar(select(func.count()).select_from(WordReviewItem)) == 3
+    stats = await load_word_stats(db_session, [test_word.id])
+    assert (stats[test_word.id].correct_count, stats[test_word.id].wrong_count) == (2, 1)
+    assert (await client.get("/api/export")).text == export
+
+@pytest.mark.asyncio
+async def test_full_reset_runs_in_batches(
+    client, db_session, monkeypatch, test_word, test_group, test_study_session
+):
+    await add_history(db_session, test_word, test_group, test_study_session)
+    db_session.add_all([Word(japanese=f"語{i}", romaji=f"go{i}", english=f"word {i}") for i in range(4)])
+    await db_session.commit()
+    monkeypatch.setattr(get_settings(), "reset_batch_size", 2)
+    monkeypatch.setattr(get_settings(), "reset_batch_pause_ms", 0)
+
+    response = await client.post("/api/full_reset")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status_url"] == f"/api/jobs/{data['job_id']}"
+
+    # The ASGI test transport runs background tasks before returning
+    job = (await client.get(data["status_url"])).json()
+    assert job["kind"] == "full_reset"
+    assert job["status"] == "succeeded"
+    assert job["error"] is None
+    assert job["progress"]["words"] == 5
+    assert job["progress"]["word_review_items"] == 3
+    assert job["progress"]["groups"] == 1
+    for model in (Word, WordReviewItem):
+        assert await db_session.scalar(select(func.count()).select_from(model)) == 0
+
+    assert (await client.get("/api/jobs/unknown")).status_code == 404
+
+@pytest.mark.asyncio
+async def test_reset_history_keeps_words_and_vacuums(
+    client, db_session, test_word, test_group, test_study_session
+):
+    await add_history(db_session, test_word, test_group, test_study_session)
+
+    response = await client.post("/api/reset_history", params={"vacuum": True})
+    job = (await client.get(response.json()["status_url"])).json()
+    assert job["status"] == "succeeded"
+    assert job["progress"]["study_sessions"] == 1
+    assert "words" not in job["progress"]
+    assert await db_session.scalar(select(func.count()).select_from(WordReviewItem)) == 0
+    assert await db_session.scalar(select(func.count()).select_from(Word)) == 1
+
+@pytest.mark.asyncio
+async def test_reset_vacuums_with_a_plain_session_factory(
+    client, db_session, test_word, test_group, test_study_session
+):
+    await add_history(db_session, test_word, test_group, test_study_session)
+    # Any callable returning a session may stand in for the sessionmaker
+    app.dependency_overrides[get_session_factory] = lambda: lambda: TestingSessionLocal()
+
+    response = await client.post("/api/reset_history", params={"vacuum": True})
+    job = (await client.get(response.json()["status_url"])).json()
+    assert job["status"] == "succeeded"
+    assert await db_session.scalar(select(func.count()).select_from(WordReviewItem)) == 0
+
+@pytest.mark.asyncio
+async def test_reset_rejected_while_a_job_runs(client):
+    job = jobs.create("full_reset")
+    try:
+        response = await client.post("/api/reset_history")
+        assert response.status_code == 409
+        assert job.id in response.json()["detail"]
+    finally:
+        job.status = "failed"
+
+@pytest.mark.asyncio
+async def test_failed_reset_changes_etags(client, db_session, test_word, test_study_session):
+    response = await client.post(
+        f"/api/study_sessions/{test_study_session.id}/review",
+        json={"reviews": [{"word_id": test_word.id, "correct": True}] * 2}
+    )
+    assert response.status_code == 200
+    response = await client.get("/api/words")
+    assert response.json()["items"][0]["correct_count"] == 2
+    etag = response.headers["etag"]
+
+    def fail_before_sweep(stage):
+        if stage == "final sweep":
+            raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        await reset_tables(TestingSessionLocal, RESET_HISTORY_MODELS, on_stage=fail_before_sweep)
+    assert await db_session.scalar(select(func.count()).select_from(WordReviewItem)) == 0
+    response = await client.get("/api/words", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["correct_count"] == 0
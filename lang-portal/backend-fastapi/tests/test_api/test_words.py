@@ -1,6 +1,10 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import delete
+from app.config import get_settings
+from app.database.models import Word, WordGroup
 from app.main import app
+from app.utils import encode_cursor
 
 @pytest.mark.asyncio
 async def test_get_words(client, test_word):
@@ -24,4 +28,158 @@ async def test_get_word_detail(client, test_word):
 async def test_get_nonexistent_word(client):
     response = await client.get("/api/words/999")
     assert response.status_code == 404
-    assert response.json()["detail"] == "Word not found" 
\ No newline at end of file
+    assert response.json()["detail"] == "Word not found" 
+
+@pytest.mark.asyncio
+async def test_get_words_review_counts(client, db_session, test_word, test_study_session):
+    other_word = Word(japanese="水", romaji="mizu", english="water")
+    db_session.add(other_word)
+    await db_session.commit()
+
+    for correct in (True, True, False):
+        response = await client.post(
+            f"/api/study_sessions/{test_study_session.id}/words/{test_word.id}/review",
+            json={"correct": correct}
+        )
+        assert response.status_code == 200
+
+    response = await client.get("/api/words")
+    assert response.status_code == 200
+    items = {item["japanese"]: item for item in response.json()["items"]}
+    assert items["テスト"]["correct_count"] == 2
+    assert items["テスト"]["wrong_count"] == 1
+    assert items["水"]["correct_count"] == 0
+    assert items["水"]["wrong_count"] == 0
+
+    response = await client.get(f"/api/words/{test_word.id}")
+    assert response.json()["stats"] == {"correct_count": 2, "wrong_count": 1}
+
+@pytest.mark.asyncio
+async def test_get_words_cursor_pagination(client, db_session):
+    db_session.add_all([
+        Word(japanese=f"単語{i}", romaji=f"tango{i}", english=f"word {i}") for i in range(5)
+    ])
+    await db_session.commit()
+
+    response = await client.get("/api/words", params={"items_per_page": 2})
+    first_page = response.json()
+    assert first_page["pagination"]["total_items"] == 5
+    assert first_page["pagination"]["next_cursor"] is not None
+
+    seen = [item["romaji"] for item in first_page["items"]]
+    cursor = first_page["pagination"]["next_cursor"]
+    while cursor:
+        response = await client.get(
+            "/api/words",
+            params={"items_per_page": 2, "after": cursor, "include_total": False}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["pagination"]["total_items"] is None
+        assert data["pagination"]["current_page"] is None
+        seen.extend(item["romaji"] for item in data["items"])
+        cursor = data["pagination"]["next_cursor"]
+
+    assert seen == [f"tango{i}" for i in range(5)]
+
+@pytest.mark.asyncio
+async def test_get_words_invalid_cursor(client):
+    response = await client.get("/api/words", params={"after": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("values", [[None], [{"a": 1}], [[1, 2]], ["1"], [True], [1.5]])
+async def test_get_words_tampered_cursor(client, test_word, values):
+    response = await client.get("/api/words", params={"after": encode_cursor(values)})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", [
+    "/api/words",
+    "/api/groups/{group_id}/words",
+    "/api/study_sessions/{session_id}/words",
+])
+async def test_word_lists_fast_json_responses(
+    client, db_session, test_word, test_group, test_study_session, monkeypatch, path
+):
+    db_session.add(WordGroup(word_id=test_word.id, group_id=test_group.id))
+    await db_session.commit()
+    response = await client.post(
+        f"/api/study_sessions/{test_study_session.id}/words/{test_word.id}/review",
+        json={"correct": True}
+    )
+    assert response.status_code == 200
+    url = path.format(group_id=test_group.id, session_id=test_study_session.id)
+    default = await client.get(url)
+
+    monkeypatch.setattr(get_settings(), "fast_json_responses", True)
+    fast = await client.get(url)
+    assert fast.status_code == 200
+    assert fast.json() == default.json()
+    assert fast.json()["items"][0]["correct_count"] == 1
+
+async def add_words(db_session):
+    words = [
+        Word(japanese="こんにちは", romaji="konnichiwa", english="hello"),
+        Word(japanese="こんばんは", romaji="konbanwa", english="good evening"),
+        Word(japanese="水", romaji="mizu", english="water"),
+        Word(japanese="水曜日", romaji="suiyoubi", english="wednesday"),
+        Word(japanese="100%", romaji="hyaku paasento", english="one hundred percent"),
+    ]
+    db_session.add_all(words)
+    await db_session.commit()
+    return words
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("q, expected", [
+    ("konn", ["konnichiwa"]),
+    ("kon", ["konnichiwa", "konbanwa"]),
+    ("ICHI", ["konnichiwa"]),
+    ("こんにち", ["konnichiwa"]),
+    ("good even", ["konbanwa"]),
+    ("水", ["mizu", "suiyoubi"]),
+    ("mi", ["mizu"]),
+    ("%", ["hyaku paasento"]),
+    # misspelled, found by trigram overlap, best overlap first
+    ("konichiwa", ["konnichiwa", "konbanwa"]),
+])
+async def test_search_words(client, db_session, q, expected):
+    await add_words(db_session)
+    response = await client.get("/api/words/search", params={"q": q})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["romaji"] for item in data["items"]] == expected
+
+@pytest.mark.asyncio
+async def test_search_words_ranking_and_pagination(client, db_session):
+    await add_words(db_session)
+    # The exact match of a short query ranks before the longer word
+    response = await client.get("/api/words/search", params={"q": "水"})
+    assert [item["japanese"] for item in response.json()["items"]] == ["水", "水曜日"]
+
+    response = await client.get(
+        "/api/words/search", params={"q": "kon", "items_per_page": 1, "page": 2}
+    )
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["pagination"]["total_items"] == 2
+
+    response = await client.get("/api/words/search", params={"q": "xyzzy", "fuzzy": False})
+    assert response.json()["items"] == []
+    response = await client.get("/api/words/search", params={"q": "kon", "after": "abc"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_search_index_follows_word_changes(client, db_session):
+    words = await add_words(db_session)
+    words[0].romaji = "konnitiwa"
+    await db_session.commit()
+    response = await client.get("/api/words/search", params={"q": "nitiwa", "fuzzy": False})
+    assert [item["japanese"] for item in response.json()["items"]] == ["こんにちは"]
+
+    await db_session.execute(delete(Word).where(Word.id == words[0].id))
+    await db_session.commit()
+    response = await client.get("/api/words/search", params={"q": "nitiwa", "fuzzy": False})
+    assert response.json()["items"] == []
@@ -0,0 +1,79 @@
+import pytest
+import app.cache
+from app.cache import TTLCache
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(app.cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+@pytest.mark.asyncio
+async def test_get_or_compute_counts_hits_and_misses():
+    cache = TTLCache(maxsize=4, ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return "value"
+
+    assert await cache.get_or_compute("key", compute) == "value"
+    assert await cache.get_or_compute("key", compute) == "value"
+    assert len(calls) == 1
+    cache.invalidate()
+    assert await cache.get_or_compute("key", compute) == "value"
+    assert len(calls) == 2
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+
+@pytest.mark.asyncio
+async def test_value_computed_across_invalidation_is_not_stored():
+    cache = TTLCache(maxsize=4, ttl=60)
+
+    async def stale_compute():
+        # A write commits and invalidates while the old value is computed
+        cache.invalidate()
+        return "stale"
+
+    assert await cache.get_or_compute("key", stale_compute) == "stale"
+    assert cache.get("key") is None
+    assert cache.stats()["discarded"] == 1
+
+    async def compute():
+        return "fresh"
+
+    assert await cache.get_or_compute("key", compute) == "fresh"
+    assert cache.get("key") == "fresh"
+
+@pytest.mark.asyncio
+async def test_values_not_stored_while_replica_settles(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(app.cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=4, ttl=60, settle=1.0)
+
+    async def compute():
+        return "value"
+
+    cache.invalidate()
+    now[0] += 0.5
+    await cache.get_or_compute("key", compute)
+    assert cache.get("key") is None
+    now[0] += 1
+    await cache.get_or_compute("key", compute)
+    assert cache.get("key") == "value"
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool, StaticPool
+from app.config import Settings
+from app.db import create_engine_from_settings
+
+@pytest.mark.asyncio
+async def test_sqlite_engine_applies_pragmas(tmp_path):
+    settings = Settings(database_url=f"sqlite+aiosqlite:///{tmp_path}/pragmas.db")
+    engine = create_engine_from_settings(settings)
+    assert not isinstance(engine.pool, NullPool)
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.scalar(text("PRAGMA journal_mode"))).lower() == "wal"
+            assert await conn.scalar(text("PRAGMA synchronous")) == 1  # NORMAL
+            assert await conn.scalar(text("PRAGMA foreign_keys")) == 1
+            assert await conn.scalar(text("PRAGMA cache_size")) == settings.sqlite_cache_size
+            assert await conn.scalar(text("PRAGMA busy_timeout")) == settings.sqlite_busy_timeout
+    finally:
+        await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_sqlite_engine_reuses_pooled_connections(tmp_path):
+    settings = Settings(database_url=f"sqlite+aiosqlite:///{tmp_path}/pool.db", pool_size=1)
+    engine = create_engine_from_settings(settings)
+    try:
+        async with engine.connect() as conn:
+            first = (await conn.get_raw_connection()).driver_connection
+        async with engine.connect() as conn:
+            second = (await conn.get_raw_connection()).driver_connection
+        assert first is second
+    finally:
+        await engine.dispose()
+
+def test_in_memory_engine_uses_static_pool():
+    engine = create_engine_from_settings(Settings(database_url="sqlite+aiosqlite://"))
+    assert isinstance(engine.pool, StaticPool)
+
+def test_settings_read_from_environment(monkeypatch):
+    monkeypatch.setenv("LANG_PORTAL_POOL_SIZE", "12")
+    monkeypatch.setenv("LANG_PORTAL_SQLITE_SYNCHRONOUS", "FULL")
+    settings = Settings()
+    assert settings.pool_size == 12
+    assert settings.sqlite_synchronous == "FULL"
+
+def _route_dependencies(route):
+    return {dep.call for dep in route.dependant.dependencies}
+
+def test_read_routes_use_read_session():
+    from fastapi.routing import APIRoute
+    from app.main import app
+    from app.db import get_db, get_read_db
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        deps = _route_dependencies(route)
+        if "GET" in route.methods:
+            assert get_db not in deps, f"GET {route.path} uses the primary session"
+        elif deps & {get_db, get_read_db}:
+            assert get_read_db not in deps, f"{route.methods} {route.path} writes through the read session"
+
+def test_absolute_database_url():
+    from app.config import BACKEND_ROOT, absolute_database_url
+    assert absolute_database_url("sqlite+aiosqlite:///words.db") == (
+        f"sqlite+aiosqlite:///{BACKEND_ROOT / 'words.db'}"
+    )
+    assert absolute_database_url("sqlite+aiosqlite:////tmp/words.db") == "sqlite+aiosqlite:////tmp/words.db"
+    pg_url = "postgresql+asyncpg://user:secret@db:5432/lang_portal"
+    assert absolute_database_url(pg_url) == pg_url
@@ -0,0 +1,124 @@
+import pytest
+from sqlalchemy import select, func, text
+from datetime import datetime
+from app.database.models import Word, WordGroup, StudySession, WordReviewItem, WordSchedule
+from app.services.scheduler import due_in_group
+from tests.conftest import IS_SQLITE
+
+pytestmark = pytest.mark.skipif(not IS_SQLITE, reason="EXPLAIN QUERY PLAN is SQLite specific")
+
+async def explain(db_session, stmt):
+    """Returns the SQLite query plan details of a statement"""
+    sql = stmt.compile(
+        dialect=db_session.get_bind().dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    result = await db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    return [row[-1] for row in result]
+
+def assert_uses_index(plan, table, index):
+    details = [d for d in plan if f" {table} " in f" {d} "]
+    assert details, f"{table} not in plan: {plan}"
+    for detail in details:
+        # "SCAN t USING INDEX i" walks an index in order, a bare "SCAN t" reads the table
+        is_table_scan = detail.startswith(f"SCAN {table}") and "INDEX" not in detail
+        assert not is_table_scan, f"table scan on {table}: {plan}"
+    assert any(index in d for d in details), f"{index} not used: {plan}"
+
+HOT_QUERIES = [
+    (
+        "review count per session",
+        select(func.count()).select_from(WordReviewItem)
+        .where(WordReviewItem.study_session_id == 1),
+        "word_review_items",
+        "ix_word_review_items_study_session_id_created_at"
+    ),
+    (
+        "review stats per word",
+        select(WordReviewItem.word_id, func.count())
+        .where(WordReviewItem.word_id.in_([1, 2, 3]))
+        .where(WordReviewItem.correct == True)
+        .group_by(WordReviewItem.word_id),
+        "word_review_items",
+        "ix_word_review_items_word_id_correct"
+    ),
+    (
+        "words of a group",
+        select(Word).join(WordGroup).where(WordGroup.group_id == 1).order_by(Word.id),
+        "words_groups",
+        "ix_words_groups_group_id_word_id"
+    ),
+    (
+        "sessions of a group",
+        select(StudySession).where(StudySession.group_id == 1)
+        .order_by(StudySession.created_at, StudySession.id),
+        "study_sessions",
+        "ix_study_sessions_group_id_created_at"
+    ),
+    (
+        "sessions of an activity",
+        select(StudySession).where(StudySession.study_activity_id == 1)
+        .order_by(StudySession.created_at, StudySession.id),
+        "study_sessions",
+        "ix_study_sessions_study_activity_id_created_at"
+    ),
+    (
+        "last study session",
+        select(StudySession).order_by(StudySession.created_at.desc()).limit(1),
+        "study_sessions",
+        "ix_study_sessions_created_at"
+    ),
+    (
+        "due words of a group",
+        select(WordSchedule.word_id)
+        .where(WordSchedule.due_at <= datetime(2025, 1, 1))
+        .where(due_in_group(1))
+        .order_by(WordSchedule.due_at, WordSchedule.word_id)
+        .limit(20),
+        "word_schedules",
+        "ix_word_schedules_due_at"
+    ),
+    (
+        "reviews to roll up",
+        select(WordReviewItem.id, StudySession.group_id)
+        .join(StudySession, StudySession.id == WordReviewItem.study_session_id)
+        .where(WordReviewItem.rolled_up == False)
+        .order_by(WordReviewItem.id)
+        .limit(5000),
+        "word_review_items",
+        "ix_word_review_items_pending_rollup"
+    ),
+]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "stmt,table,index",
+    [q[1:] for q in HOT_QUERIES],
+    ids=[q[0] for q in HOT_QUERIES]
+)
+async def test_hot_queries_use_indexes(db_session, stmt, table, index):
+    plan = await explain(db_session, stmt)
+    assert_uses_index(plan, table, index)
+
+@pytest.mark.asyncio
+async def test_word_group_link_is_unique(db_session, test_word, test_group):
+    from sqlalchemy.exc import IntegrityError
+    db_session.add(WordGroup(word_id=test_word.id, group_id=test_group.id))
+    await db_session.commit()
+    db_session.add(WordGroup(word_id=test_word.id, group_id=test_group.id))
+    with pytest.raises(IntegrityError):
+        await db_session.commit()
+    await db_session.rollback()
+
+@pytest.mark.asyncio
+async def test_due_words_are_read_in_index_order(db_session):
+    stmt = (
+        select(WordSchedule.word_id)
+        .where(WordSchedule.due_at <= datetime(2025, 1, 1))
+        .where(due_in_group(1))
+        .order_by(WordSchedule.due_at, WordSchedule.word_id)
+        .limit(20)
+    )
+    plan = await explain(db_session, stmt)
+    assert not any("TEMP B-TREE" in d for d in plan), plan
+    assert_uses_index(plan, "words_groups", "uq_words_groups_word_id_group_id")
@@ -1,7 +1,8 @@
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy import select
-from app.database.models import StudyActivity, StudySession, WordReviewItem
+from app.database.models import StudyActivity, StudySession, WordReviewItem, WordSchedule
+from app.services.scheduler import MAX_INTERVAL_DAYS, next_schedule, rebuild_schedules
 
 @pytest.mark.asyncio
 async def test_create_study_activity(db_session):
@@ -61,4 +62,63 @@ async def test_word_review_item(db_session, test_word):
     )
     saved_review = result.scalar_one()
     assert saved_review.correct == True
-    assert isinstance(saved_review.created_at, datetime) 
\ No newline at end of file
+    assert isinstance(saved_review.created_at, datetime) 
+
+def test_sm2_schedule_progression():
+    reviewed_at = datetime(2025, 3, 1)
+    state = None
+    intervals = []
+    for correct in (True, True, True, True, False, True):
+        reviewed_at += timedelta(days=1)
+        state = next_schedule(state, correct, reviewed_at)
+        intervals.append(state.interval_days)
+    # 1 -> 6 -> 6 * 2.5, a lapse restarts at one day with a lower ease
+    assert intervals == [1, 6, 15, 38, 1, 1]
+    assert state.ease == 1.96
+    assert state.due_at == reviewed_at + timedelta(days=1)
+
+    # Ease never drops below the SM-2 floor
+    for _ in range(10):
+        reviewed_at += timedelta(days=1)
+        state = next_schedule(state, False, reviewed_at)
+    assert state.ease == 1.3
+
+def test_sm2_repeats_at_one_time_are_one_step():
+    reviewed_at = datetime(2025, 3, 1)
+    state = next_schedule(None, True, reviewed_at - timedelta(days=1))
+    state = next_schedule(state, True, reviewed_at)
+    assert state.interval_days == 6
+    assert next_schedule(state, True, reviewed_at) == state
+    lapsed = next_schedule(state, False, reviewed_at)
+    assert (lapsed.interval_days, lapsed.repetitions) == (1, 0)
+
+@pytest.mark.asyncio
+async def test_rebuild_schedules_replays_history(db_session, test_word, test_study_session):
+    start = datetime(2025, 3, 1)
+    db_session.add_all([
+        WordReviewItem(
+            word_id=test_word.id,
+            study_session_id=test_study_session.id,
+            correct=correct,
+            created_at=start + timedelta(days=day)
+        ) for day, correct in ((0, True), (1, True), (7, True))
+    ])
+    await db_session.commit()
+
+    assert await rebuild_schedules(db_session, batch_size=1) == 1
+    await db_session.commit()
+    schedule = await db_session.scalar(select(WordSchedule))
+    assert (schedule.interval_days, schedule.repetitions) == (15, 3)
+    assert schedule.due_at == start + timedelta(days=7 + 15)
+
+def test_sm2_interval_is_capped():
+    state = None
+    intervals = []
+    for day in range(500):
+        reviewed_at = datetime(2025, 3, 1) + timedelta(days=day)
+        state = next_schedule(state, True, reviewed_at)
+        intervals.append(state.interval_days)
+    assert MAX_INTERVAL_DAYS == 36500
+    # The interval reaches the cap within a few dozen reviews and stays there
+    assert intervals[-450:] == [36500] * 450
+    assert state.due_at == reviewed_at + timedelta(days=36500)
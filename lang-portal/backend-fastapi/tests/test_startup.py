@@ -0,0 +1,46 @@
+import logging
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from app.config import get_settings
+from app.db import create_engine_from_settings
+
+@pytest.fixture
+async def file_engine(tmp_path):
+    engine = create_engine_from_settings(url=f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}")
+    yield engine
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_startup_warns_about_pending_migrations(file_engine, monkeypatch, caplog):
+    from app.startup import startup
+    monkeypatch.setattr(get_settings(), "migrate_on_startup", False)
+    app = FastAPI()
+
+    with caplog.at_level(logging.INFO, logger="uvicorn.error"):
+        timings = await startup(app, file_engine, file_engine)
+    assert "python tasks.py migrate" in caplog.text
+    assert "Startup finished" in caplog.text
+    assert app.state.startup_timings == timings
+    assert set(timings) == {"schema_check_ms", "migrations_ms", "pool_warm_up_ms", "total_ms"}
+    # Nothing was created besides the database file
+    async with file_engine.connect() as conn:
+        assert (await conn.execute(text("SELECT count(*) FROM sqlite_master"))).scalar() == 0
+
+@pytest.mark.asyncio
+async def test_startup_migrates_and_warms_pool(file_engine, monkeypatch, caplog):
+    from app.startup import check_schema, startup
+    monkeypatch.setattr(get_settings(), "migrate_on_startup", True)
+    monkeypatch.setattr(get_settings(), "warm_connections", 3)
+
+    await startup(FastAPI(), file_engine, file_engine)
+    current, heads = await check_schema(file_engine)
+    assert current == heads
+    assert file_engine.pool.checkedin() == 3
+
+    # Up to date, a second start skips the migrations
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger="uvicorn.error"):
+        await startup(FastAPI(), file_engine, file_engine)
+    assert "Migrating" not in caplog.text
+    assert "Startup finished" in caplog.text
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import select
+from app.database.models import WordReviewItem, WordReviewStats
+from app.services.word_stats import (
+    rebuild_word_stats, verify_word_stats, record_review, load_word_stats
+)
+
+@pytest.mark.asyncio
+async def test_rebuild_word_stats(db_session, test_word, test_study_session):
+    db_session.add_all([
+        WordReviewItem(word_id=test_word.id, study_session_id=test_study_session.id, correct=True),
+        WordReviewItem(word_id=test_word.id, study_session_id=test_study_session.id, correct=False),
+        WordReviewItem(word_id=test_word.id, study_session_id=test_study_session.id, correct=False),
+    ])
+    await db_session.commit()
+
+    # Raw inserts bypass the counters
+    mismatches = await verify_word_stats(db_session)
+    assert mismatches == {test_word.id: {"stored": (0, 0), "actual": (1, 2)}}
+
+    assert await rebuild_word_stats(db_session) == 1
+    await db_session.commit()
+
+    assert await verify_word_stats(db_session) == {}
+    stats = await load_word_stats(db_session, [test_word.id])
+    assert stats[test_word.id].correct_count == 1
+    assert stats[test_word.id].wrong_count == 2
+
+@pytest.mark.asyncio
+async def test_record_review_increments_counters(db_session, test_word, test_study_session):
+    for correct in (True, True, False):
+        db_session.add(WordReviewItem(
+            word_id=test_word.id,
+            study_session_id=test_study_session.id,
+            correct=correct
+        ))
+        await record_review(db_session, test_word.id, correct)
+    await db_session.commit()
+
+    saved = await db_session.scalar(
+        select(WordReviewStats).where(WordReviewStats.word_id == test_word.id)
+    )
+    assert (saved.correct_count, saved.wrong_count) == (2, 1)
+    assert saved.last_reviewed_at is not None
+    assert await verify_word_stats(db_session) == {}
+
+@pytest.mark.asyncio
+async def test_rebuild_word_stats_changes_etags(client, db_session, test_word, test_study_session):
+    etag = (await client.get("/api/words")).headers["etag"]
+
+    # Drifted counters, the raw insert does not touch any version
+    db_session.add(WordReviewItem(word_id=test_word.id, study_session_id=test_study_session.id, correct=True))
+    await db_session.commit()
+    assert (await client.get("/api/words", headers={"If-None-Match": etag})).status_code == 304
+
+    await rebuild_word_stats(db_session)
+    await db_session.commit()
+    response = await client.get("/api/words", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["correct_count"] == 1
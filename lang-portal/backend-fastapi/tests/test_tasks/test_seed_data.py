@@ -1,8 +1,15 @@
 import pytest
 import asyncio
+import json
 from pathlib import Path
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from tasks.json_stream import iter_json_array
 from tasks.seed_data import seed_data
-from app.database.models import Word, Group, StudyActivity
+from app.database.models import (
+    Base, Word, Group, StudyActivity, WordGroup, StudySession, WordReviewItem
+)
+from app.services.word_stats import verify_word_stats
 
 @pytest.mark.asyncio
 async def test_seed_data(tmp_path):
@@ -61,4 +68,59 @@ async def test_seed_data(tmp_path):
         result = await session.execute(select(StudyActivity))
         activities = result.scalars().all()
         assert len(activities) == 1
-        assert activities[0].name == "Vocabulary Quiz" 
\ No newline at end of file
+        assert activities[0].name == "Vocabulary Quiz" 
+
+def test_iter_json_array_streams_items(tmp_path):
+    path = tmp_path / "words.json"
+    path.write_text(
+        '{"meta": {"source": "jlpt", "tags": ["n5", "n4"]}, '
+        '"words": [{"japanese": "猫", "n": 12345}, {"japanese": "犬", "n": -1.5}, 7] }',
+        encoding="utf-8"
+    )
+    # A tiny chunk size splits strings and numbers across reads
+    for chunk_size in (1, 3, 1 << 16):
+        items = list(iter_json_array(path, "words", chunk_size=chunk_size))
+        assert items == [{"japanese": "猫", "n": 12345}, {"japanese": "犬", "n": -1.5}, 7]
+
+    with pytest.raises(KeyError):
+        list(iter_json_array(path, "groups"))
+
+@pytest.mark.asyncio
+async def test_bulk_seed_with_synthetic_history(tmp_path):
+    seeds_dir = tmp_path / "seeds"
+    seeds_dir.mkdir()
+    (seeds_dir / "groups.json").write_text(json.dumps({"groups": [{"name": "Basic Greetings"}]}))
+    (seeds_dir / "words.json").write_text(json.dumps({"words": [
+        {"japanese": "こんにちは", "romaji": "konnichiwa", "english": "hello",
+         "groups": ["Basic Greetings", "Common Phrases"]},
+        {"japanese": "ありがとう", "romaji": "arigatou", "english": "thank you",
+         "groups": ["Common Phrases"]},
+        {"japanese": "猫", "romaji": "neko", "english": "cat", "groups": ["Animals"]},
+    ]}, ensure_ascii=False), encoding="utf-8")
+    (seeds_dir / "study_activities.json").write_text(json.dumps({"activities": [
+        {"name": "Vocabulary Quiz", "thumbnail_url": None, "description": "Quiz"},
+        {"name": "Writing Practice", "thumbnail_url": None, "description": "Writing"},
+    ]}))
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'seed.db'}"
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # Small batches exercise the batch boundaries
+    assert await seed_data(scale=20, batch_size=2, seeds_dir=seeds_dir, database_url=url) == True
+
+    async with AsyncSession(engine) as session:
+        groups = (await session.execute(select(Group.name).order_by(Group.id))).scalars().all()
+        assert groups == ["Basic Greetings", "Common Phrases", "Animals"]
+        assert await session.scalar(select(func.count()).select_from(Word)) == 3
+        assert await session.scalar(select(func.count()).select_from(WordGroup)) == 4
+        assert await session.scalar(select(func.count()).select_from(StudyActivity)) == 2
+
+        # 3 days x 2 activities x 3 groups sample sessions with 2 sample words each,
+        # plus 20 synthetic reviews for each of the 3 words
+        reviews = await session.scalar(select(func.count()).select_from(WordReviewItem))
+        assert reviews == 3 * 2 * 3 * 2 + 20 * 3
+        assert await session.scalar(select(func.count()).select_from(StudySession)) > 18
+        assert await verify_word_stats(session) == {}
+    await engine.dispose()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Benchmark the embedding backends of the vector store
+
+Measures embeddings per second and recall@k for each backend. The corpus
+is made of the questions parsed from the structured transcripts, plus
+distractor documents stitched together from fragments of them. Each query
+is a span of one question's conversation with some characters dropped,
+and counts as found when that question is among the k nearest documents.
+
+The current Perplexity embedding function is measured offline through its
+MD5 hash embedding, which is what it returns without an API response. Its
+vectors carry no meaning with or without the API, so its recall is chance
+level either way. Pass --perplexity-live N with PERPLEXITY_API_KEY set to
+also time N real API calls.
+
+Usage:
+    python embedding_benchmark.py
+    python embedding_benchmark.py --backends local,sentence-transformers --texts 5000
+"""
+
+import argparse
+import os
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from vector_store import (
+    EmbeddingBackend, HashedNgramEmbeddingFunction, PerplexityEmbeddingFunction,
+    SentenceTransformerEmbeddingFunction, VectorStore
+)
+
+RECALL_AT = (1, 5, 10)
+
+class PerplexityHashBaseline(EmbeddingBackend):
+    """The Perplexity embedding function without its API calls"""
+
+    def __init__(self):
+        self.function = PerplexityEmbeddingFunction(api_key="offline")
+        self.dimension = self.function.dimension
+        self.model_id = self.function.model_id
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.array([self.function.hash_embedding(text) for text in texts], dtype=np.float32)
+
+def load_questions(transcripts_dir: Path) -> List[Dict[str, str]]:
+    """Parse the questions of the structured transcripts, those with a conversation"""
+    questions = []
+    for file_path in sorted(transcripts_dir.glob("*.structured.txt")):
+        questions += [
+            q for q in VectorStore._parse_transcript(file_path.read_text(encoding="utf-8"))
+            if q.get("conversation")
+        ]
+    return questions
+
+def make_distractors(documents: List[str], count: int, rng: random.Random) -> List[str]:
+    """Documents stitched from 4 character fragments of the real ones, so
+    they share the corpus' vocabulary but none of its questions"""
+    fragments = [doc[i:i + 4] for doc in documents for i in range(0, len(doc), 4)]
+    return [
+        "".join(rng.choice(fragments) for _ in range(rng.randint(15, 40)))
+        for _ in range(count)
+    ]
+
+def make_queries(
+    questions: List[Tuple[int, str]],
+    rng: random.Random,
+    drop: float = 0.1
+) -> List[Tuple[int, str]]:
+    """One noisy conversation span per question, with the index it should find"""
+    queries = []
+    for index, conversation in questions:
+        if len(conversation) < 8:
+            continue
+        length = max(6, int(len(conversation) * rng.uniform(0.4, 0.6)))
+        start = rng.randint(0, len(conversation) - length)
+        span = conversation[start:start + length]
+        queries.append((index, "".join(c for c in span if rng.random() >= drop)))
+    return queries
+
+def recall_at_k(
+    function: EmbeddingBackend,
+    corpus: List[str],
+    queries: List[Tuple[int, str]]
+) -> Dict[int, float]:
+    """Share of queries whose question is among the k most similar documents"""
+    documents = function.embed(corpus)
+    documents /= np.maximum(np.linalg.norm(documents, axis=1, keepdims=True), 1e-12)
+    vectors = function.embed([text for _, text in queries])
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    ranking = np.argsort(-(vectors @ documents.T), axis=1)
+    expected = np.array([index for index, _ in queries])[:, None]
+    return {k: float((ranking[:, :k] == expected).any(axis=1).mean()) for k in RECALL_AT}
+
+def throughput(function: EmbeddingBackend, texts: List[str]) -> float:
+    """Embeddings per second over ``texts``"""
+    start = time.perf_counter()
+    function.embed(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+def create_backend(name: str) -> EmbeddingBackend:
+    if name == "local":
+        return HashedNgramEmbeddingFunction()
+    if name == "sentence-transformers":
+        return SentenceTransformerEmbeddingFunction()
+    if name == "perplexity-hash":
+        return PerplexityHashBaseline()
+    raise ValueError(f"Unknown backend: {name}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vector store embedding backends")
+    parser.add_argument(
+        "--transcripts",
+        default=str(Path(__file__).parent / "transcripts"),
+        help="Directory with *.structured.txt files"
+    )
+    parser.add_argument(
+        "--backends",
+        default="perplexity-hash,local",
+        help="Comma separated: perplexity-hash, local, sentence-transformers"
+    )
+    parser.add_argument("--distractors", type=int, default=1000, help="Distractor documents in the corpus")
+    parser.add_argument("--texts", type=int, default=2000, help="Texts embedded for the throughput")
+    parser.add_argument("--perplexity-live", type=int, default=0, help="Time this many real API calls")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    questions = load_questions(Path(args.transcripts))
+    if not questions:
+        print(f"No questions found in {args.transcripts}")
+        return
+    documents = [
+        f"{q.get('introduction', '')} {q.get('conversation', '')} {q.get('question', '')}"
+        for q in questions
+    ]
+    corpus = documents + make_distractors(documents, args.distractors, rng)
+    queries = make_queries(
+        [(i, q.get("conversation", "")) for i, q in enumerate(questions)], rng
+    )
+    texts = [corpus[i % len(corpus)] for i in range(args.texts)]
+    print(
+        f"{len(documents)} questions, {args.distractors} distractors, {len(queries)} queries, "
+        f"{len(texts)} texts for the throughput\n"
+    )
+
+    header = f"{'backend':<45} {'dim':>5} {'emb/s':>10}" + "".join(f" {f'recall@{k}':>9}" for k in RECALL_AT)
+    print(header)
+    print("-" * len(header))
+    for name in args.backends.split(","):
+        try:
+            function = create_backend(name.strip())
+        except ImportError as e:
+            print(f"{name:<45} skipped: {e}")
+            continue
+        rate = throughput(function, texts)
+        recall = recall_at_k(function, corpus, queries)
+        print(
+            f"{function.model_id:<45} {function.dimension:>5} {rate:>10.0f}"
+            + "".join(f" {recall[k]:>9.2f}" for k in RECALL_AT)
+        )
+
+    if args.perplexity_live:
+        api_key = os.getenv("PERPLEXITY_API_KEY")
+        if not api_key:
+            print("\n--perplexity-live needs PERPLEXITY_API_KEY")
+            return
+        rate = throughput(PerplexityEmbeddingFunction(api_key), texts[:args.perplexity_live])
+        print(f"\nPerplexity API: {rate:.2f} embeddings/s over {args.perplexity_live} calls")
+
+if __name__ == "__main__":
+    main()
@@ -5,24 +5,70 @@ import json
 import requests
 from pathlib import Path
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Per-file status of process_directory runs, kept in the transcripts directory
+CHECKPOINT_FILE = ".structure_checkpoint.json"
+
+class RateLimiter:
+    """Spaces out calls shared by several threads to at most ``calls_per_minute``"""
+    
+    def __init__(self, calls_per_minute: float):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            calls_per_minute (float): Allowed calls per minute, 0 for no limit
+        """
+        self.interval = 60.0 / calls_per_minute if calls_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_call = 0.0
+    
+    def acquire(self) -> None:
+        """Block until the next call is allowed"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_call - now
+            self._next_call = max(now, self._next_call) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+def _write_atomically(path: Union[str, Path], text: str) -> None:
+    """Write a file through a temporary file, so it exists only once complete"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
 class JLPTTranscriptStructurer:
     """
     Class to structure JLPT listening practice test transcripts into a standardized format
     with Introduction, Conversation, and Question components for each test item.
     """
     
-    def __init__(self, perplexity_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        perplexity_api_key: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        request_timeout: float = 300
+    ):
         """
         Initialize the JLPTTranscriptStructurer
         
         Args:
             perplexity_api_key (Optional[str]): API key for Perplexity Pro
+            rate_limiter (Optional[RateLimiter]): Shared limit on Perplexity API requests
+            request_timeout (float): Seconds to wait for a Perplexity API response
         """
+        self.rate_limiter = rate_limiter
+        self.request_timeout = request_timeout
         # First try to use the provided API key, then check environment variables
         self.perplexity_api_key = perplexity_api_key or os.environ.get('PERPLEXITY_API_KEY')
         
@@ -101,6 +147,8 @@ class JLPTTranscriptStructurer:
         
         for retry_count in range(max_retries):
             try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
                 print(f"Making Perplexity API request (attempt {retry_count + 1}/{max_retries})...")
                 response = requests.post(
                     "https://api.perplexity.ai/chat/completions",
@@ -113,7 +161,8 @@ class JLPTTranscriptStructurer:
                         "messages": [{"role": "user", "content": prompt}],
                         "temperature": 0.0,
                         "max_tokens": 8000
-                    }
+                    },
+                    timeout=self.request_timeout
                 )
                 
                 if response.status_code != 200:
@@ -416,7 +465,13 @@ class JLPTTranscriptStructurer:
         
         return questions
     
-    def structure_transcript(self, transcript_path: str, output_path: str = None, add_to_vector: bool = True) -> List[Dict[str, str]]:
+    def structure_transcript(
+        self,
+        transcript_path: str,
+        output_path: str = None,
+        add_to_vector: bool = True,
+        use_perplexity: bool = True
+    ) -> List[Dict[str, str]]:
         """Structure a transcript file into questions and save to output file if provided."""
         print(f"Processing transcript: {transcript_path}")
         
@@ -425,8 +480,10 @@ class JLPTTranscriptStructurer:
             transcript_text = f.read()
         
         # Try to extract questions using Perplexity API first
-        print("Attempting to extract questions using Perplexity API...")
-        structured_data = self.extract_questions_with_perplexity(transcript_text)
+        structured_data = []
+        if use_perplexity and self.perplexity_api_key:
+            print("Attempting to extract questions using Perplexity API...")
+            structured_data = self.extract_questions_with_perplexity(transcript_text)
         
         # Verify we got a reasonable number of questions
         if structured_data and len(structured_data) > 0:
@@ -447,26 +504,43 @@ class JLPTTranscriptStructurer:
                     print(f"Manual extraction found {len(manual_data)} questions, which is not better than Perplexity's {len(structured_data)}")
                     # Keep the Perplexity results
         else:
-            print("Failed to extract questions using Perplexity API, falling back to manual extraction")
+            if use_perplexity and self.perplexity_api_key:
+                print("Failed to extract questions using Perplexity API, falling back to manual extraction")
             structured_data = self.extract_questions_manually(transcript_text)
             print(f"Manually extracted {len(structured_data)} questions")
         
         # Save structured data to output file if provided
+        structured_text = "".join(
+            f"Question: {item.get('question_number', 'Unknown')}\n"
+            f"Introduction: {item.get('introduction', '')}\n"
+            f"Conversation: {item.get('conversation', '')}\n"
+            f"Question: {item.get('question', '')}\n"
+            "\n"
+            for item in structured_data
+        )
         if output_path and structured_data:
             print(f"Saving structured data to {output_path}")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                for item in structured_data:
-                    f.write(f"Question: {item.get('question_number', 'Unknown')}\n")
-                    f.write(f"Introduction: {item.get('introduction', '')}\n")
-                    f.write(f"Conversation: {item.get('conversation', '')}\n")
-                    f.write(f"Question: {item.get('question', '')}\n")
-                    f.write("\n")
+            # Written in one go, so an existing output file is always complete
+            # and process_directory can skip it on the next run
+            _write_atomically(output_path, structured_text)
             print(f"Successfully saved {len(structured_data)} questions to {output_path}")
         
         # Add to vector store if requested
         if add_to_vector and structured_data:
-            source_file = os.path.basename(transcript_path)
-            self.add_to_vector_store(structured_data, source_file)
+            questions = structured_data
+            source_file = str(Path(transcript_path).resolve())
+            if output_path:
+                # Indexed as the output file, under the same source and IDs
+                # that load_questions_from_folder gives it, so importing the
+                # folder later does not add the questions a second time
+                try:
+                    from vector_store import VectorStore
+                    questions = VectorStore._parse_transcript(structured_text)
+                    source_file = str(Path(output_path).resolve())
+                except ImportError as e:
+                    print(f"Error adding to vector store: {str(e)}")
+                    return structured_data
+            self.add_to_vector_store(questions, source_file)
         
         return structured_data
     
@@ -475,26 +549,22 @@ class JLPTTranscriptStructurer:
         
         Args:
             structured_data (List[Dict[str, str]]): List of structured questions
-            source_file (str): Source file name
+            source_file (str): Absolute path of the source file
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            # Check if Perplexity API key is available
-            if not self.perplexity_api_key:
-                print("Error: Perplexity API key is required for vector store operations")
-                return False
-                
             # Import vector store module
-            from vector_store import JLPTQuestionVectorStore
+            from vector_store import VectorStore
             
-            # Initialize vector store with Perplexity API key
-            vector_store = JLPTQuestionVectorStore(perplexity_api_key=self.perplexity_api_key)
+            # Initialize vector store, embeddings go through its on-disk cache
+            vector_store = VectorStore(perplexity_api_key=self.perplexity_api_key)
+            vector_store.initialize()
             
             # Add questions to vector store
             count = vector_store.add_questions(structured_data, source_file)
-            print(f"Added {count} questions to vector store using Perplexity embeddings")
+            print(f"Added {count} questions to vector store using {vector_store.embedding_function.model_id} embeddings")
             
             return True
         except Exception as e:
@@ -532,9 +602,56 @@ class JLPTTranscriptStructurer:
             print(f"Error saving structured data: {str(e)}")
             return False
 
+    def add_directory_to_vector_store(self, directory_path: Union[str, Path]) -> bool:
+        """Index the structured transcripts of a directory in the vector store
+        
+        Args:
+            directory_path (Union[str, Path]): Directory with *.structured.txt files
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            from vector_store import VectorStore
+            
+            vector_store = VectorStore(perplexity_api_key=self.perplexity_api_key)
+            vector_store.initialize()
+            count = vector_store.load_questions_from_folder(directory_path)
+            print(f"Vector store holds {count} questions from {directory_path}")
+            return True
+        except Exception as e:
+            print(f"Error adding to vector store: {str(e)}")
+            return False
+
     @staticmethod
-    def process_directory(directory_path: str, use_perplexity: bool = True, add_to_vector: bool = True):
-        """Process all transcript files in a directory"""
+    def process_directory(
+        directory_path: str,
+        use_perplexity: bool = True,
+        add_to_vector: bool = True,
+        workers: int = 4,
+        requests_per_minute: float = 50
+    ) -> Dict[str, Any]:
+        """Process all transcript files in a directory
+        
+        Files are structured concurrently by a pool of ``workers`` threads,
+        which share a limit of ``requests_per_minute`` Perplexity API
+        requests. Every finished file is recorded in a checkpoint file in the
+        directory, and its output is written atomically, so an interrupted
+        run resumes with the files that are not done yet. The questions are
+        added to the vector store once all files are done, in one batched
+        import.
+        
+        Args:
+            directory_path (str): Directory with the transcript files
+            use_perplexity (bool): Whether to use Perplexity API
+            add_to_vector (bool): Whether to add questions to vector store
+            workers (int): Files processed at the same time
+            requests_per_minute (float): Perplexity API requests per minute, 0 for no limit
+            
+        Returns:
+            Dict[str, Any]: Summary of the run
+        """
+        started = time.perf_counter()
         print(f"Processing all transcript files in {directory_path}")
         
         # Get API key
@@ -548,44 +665,107 @@ class JLPTTranscriptStructurer:
                 print("Falling back to manual extraction due to missing API key.")
                 use_perplexity = False
         
-        # Create structurer
-        structurer = JLPTTranscriptStructurer(perplexity_api_key=perplexity_api_key)
+        # Create structurer, its rate limiter is shared by the workers
+        structurer = JLPTTranscriptStructurer(
+            perplexity_api_key=perplexity_api_key,
+            rate_limiter=RateLimiter(requests_per_minute)
+        )
         
         # Get all transcript files
-        transcript_files = [f for f in Path(directory_path).glob("*.txt") 
-                          if not f.name.endswith(".structured.txt")]
+        transcript_files = sorted(f for f in Path(directory_path).glob("*.txt")
+                                  if not f.name.endswith(".structured.txt"))
         
-        print(f"Found {len(transcript_files)} transcript files")
-        
-        # Process each file
+        # Skip files whose structured output already exists
+        pending = []
         for transcript_file in transcript_files:
+            output_path = transcript_file.with_name(f"{transcript_file.stem}.structured.txt")
+            if not output_path.exists():
+                pending.append((transcript_file, output_path))
+        skipped = len(transcript_files) - len(pending)
+        print(
+            f"Found {len(transcript_files)} transcript files, {skipped} already structured, "
+            f"processing {len(pending)} with {workers} workers"
+        )
+        
+        checkpoint_path = Path(directory_path) / CHECKPOINT_FILE
+        checkpoint: Dict[str, Dict[str, Any]] = {}
+        if checkpoint_path.exists():
+            try:
+                checkpoint = json.loads(checkpoint_path.read_text(encoding='utf-8'))
+            except ValueError as e:
+                print(f"Ignoring unreadable checkpoint {checkpoint_path}: {str(e)}")
+        checkpoint_lock = threading.Lock()
+        
+        def process(transcript_file: Path, output_path: Path) -> Dict[str, Any]:
+            file_started = time.perf_counter()
             try:
-                # Generate output path
-                output_path = transcript_file.with_name(f"{transcript_file.stem}.structured.txt")
-                
-                # Skip if output file already exists
-                if output_path.exists():
-                    print(f"Skipping {transcript_file.name} as structured file already exists")
-                    continue
-                
-                # Process transcript
-                print(f"Processing {transcript_file.name}...")
                 structured_data = structurer.structure_transcript(
-                    str(transcript_file), 
+                    str(transcript_file),
                     str(output_path),
-                    add_to_vector=add_to_vector
+                    add_to_vector=False,
+                    use_perplexity=use_perplexity
                 )
-                
-                # Print summary
-                if structured_data:
-                    print(f"Successfully processed {transcript_file.name} and extracted {len(structured_data)} questions")
-                else:
-                    print(f"Failed to extract questions from {transcript_file.name}")
-                    
+                entry = {"status": "done" if structured_data else "failed", "questions": len(structured_data)}
+                if not structured_data:
+                    entry["error"] = "No questions extracted"
             except Exception as e:
-                print(f"Error processing {transcript_file.name}: {str(e)}")
+                entry = {"status": "failed", "questions": 0, "error": str(e)}
+            entry["seconds"] = round(time.perf_counter() - file_started, 2)
+            
+            # Record the file as soon as it is done
+            with checkpoint_lock:
+                checkpoint[transcript_file.name] = entry
+                _write_atomically(checkpoint_path, json.dumps(checkpoint, ensure_ascii=False, indent=1))
+            return entry
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(process, *item): item[0] for item in pending}
+            for done, future in enumerate(as_completed(futures), 1):
+                transcript_file = futures[future]
+                entry = results[transcript_file.name] = future.result()
+                if entry["status"] == "done":
+                    print(f"[{done}/{len(pending)}] {transcript_file.name}: {entry['questions']} questions in {entry['seconds']}s")
+                else:
+                    print(f"[{done}/{len(pending)}] {transcript_file.name}: failed ({entry['error']})")
+        
+        succeeded = [name for name, entry in results.items() if entry["status"] == "done"]
+        if add_to_vector and succeeded:
+            structurer.add_directory_to_vector_store(directory_path)
+        
+        # Print summary
+        wall_seconds = time.perf_counter() - started
+        work_seconds = sum(entry["seconds"] for entry in results.values())
+        summary = {
+            "files": len(transcript_files),
+            "skipped": skipped,
+            "processed": len(results),
+            "succeeded": len(succeeded),
+            "failed": len(results) - len(succeeded),
+            "questions": sum(entry["questions"] for entry in results.values()),
+            "wall_seconds": round(wall_seconds, 2),
+            "work_seconds": round(work_seconds, 2),
+            "failures": {name: entry["error"] for name, entry in results.items() if entry["status"] != "done"},
+        }
+        print("\nSummary:")
+        print(f"  Files:     {summary['files']} found, {summary['skipped']} skipped, {summary['processed']} processed")
+        print(f"  Results:   {summary['succeeded']} succeeded, {summary['failed']} failed, {summary['questions']} questions")
+        print(
+            f"  Time:      {summary['wall_seconds']}s wall clock for {summary['work_seconds']}s of file processing"
+            + (f" ({work_seconds / wall_seconds:.1f}x)" if wall_seconds > 0 and results else "")
+        )
+        for name, error in summary["failures"].items():
+            print(f"  Failed:    {name}: {error}")
+        return summary
 
-def main(transcript_path: str, output_path: Optional[str] = None, use_perplexity: bool = True, add_to_vector: bool = True):
+def main(
+    transcript_path: str,
+    output_path: Optional[str] = None,
+    use_perplexity: bool = True,
+    add_to_vector: bool = True,
+    workers: int = 4,
+    requests_per_minute: float = 50
+):
     """
     Main function to structure a transcript
     
@@ -594,10 +774,15 @@ def main(transcript_path: str, output_path: Optional[str] = None, use_perplexity
         output_path (Optional[str]): Path to output file (only used if transcript_path is a file)
         use_perplexity (bool): Whether to use Perplexity API
         add_to_vector (bool): Whether to add questions to vector store
+        workers (int): Files processed at the same time (only used for a directory)
+        requests_per_minute (float): Perplexity API requests per minute (only used for a directory)
     """
     # Check if transcript_path is a directory
     if os.path.isdir(transcript_path):
-        JLPTTranscriptStructurer.process_directory(transcript_path, use_perplexity, add_to_vector)
+        JLPTTranscriptStructurer.process_directory(
+            transcript_path, use_perplexity, add_to_vector,
+            workers=workers, requests_per_minute=requests_per_minute
+        )
         return
     
     # Process single file
@@ -645,6 +830,8 @@ if __name__ == "__main__":
     parser.add_argument("--output", "-o", help="Output file path (only used if transcript_path is a file)")
     parser.add_argument("--manual", "-m", action="store_true", help="Use manual extraction instead of Perplexity API")
     parser.add_argument("--no-vector", action="store_true", help="Don't add questions to vector store")
+    parser.add_argument("--workers", "-w", type=int, default=4, help="Transcript files processed at the same time")
+    parser.add_argument("--rate-limit", type=float, default=50, help="Perplexity API requests per minute, 0 for no limit")
     
     args = parser.parse_args()
     
@@ -653,5 +840,7 @@ if __name__ == "__main__":
         transcript_path=args.transcript_path,
         output_path=args.output,
         use_perplexity=not args.manual,
-        add_to_vector=not args.no_vector
+        add_to_vector=not args.no_vector,
+        workers=args.workers,
+        requests_per_minute=args.rate_limit
     )
\ No newline at end of file
@@ -0,0 +1,75 @@
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.vector_store import CachedEmbeddingFunction, EmbeddingBackend, EmbeddingCache
+
+class CountingEmbeddingFunction(EmbeddingBackend):
+    """Embeds each text as a vector of its length and records the texts it embedded,
+    returning all-zero vectors for texts starting with "fail" like a failed API call"""
+
+    model_id = "counting-3"
+    dimension = 3
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed(self, texts):
+        self.embedded += texts
+        return np.array(
+            [[0.0] * 3 if text.startswith("fail") else [len(text), 1.0, 2.0] for text in texts],
+            dtype=np.float32
+        )
+
+def cached_function(cache_dir):
+    """A cached embedding function over a freshly opened cache, like a new process"""
+    return CachedEmbeddingFunction(CountingEmbeddingFunction(), EmbeddingCache(cache_dir, max_entries=3))
+
+def test_lru_eviction_survives_reopen():
+    """Recency of hits is persisted, so the least recently used vector is evicted after a restart"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        function = cached_function(cache_dir)
+        function.embed(["a", "bb", "ccc"])
+        assert function.function.embedded == ["a", "bb", "ccc"]
+
+        # Served from the cache only, "a" becomes the most recently used vector
+        function = cached_function(cache_dir)
+        vectors = function.embed(["a"])
+        function.flush()
+        assert function.function.embedded == []
+        assert vectors.tolist() == [[1.0, 1.0, 2.0]]
+
+        # The cache is full, the fourth text evicts "bb"
+        function = cached_function(cache_dir)
+        function.embed(["dddd"])
+
+        function = cached_function(cache_dir)
+        vectors = function.embed(["a", "bb", "ccc", "dddd"])
+        assert function.function.embedded == ["bb"]
+        assert (function.hits, function.misses) == (3, 1)
+        assert vectors[:, 0].tolist() == [1.0, 2.0, 3.0, 4.0]
+
+def test_zero_vectors_are_not_cached():
+    """All-zero vectors of failed embedding calls are embedded again next time"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        function = cached_function(cache_dir)
+        vectors = function.embed(["fail", "ok"])
+        assert vectors.tolist() == [[0.0, 0.0, 0.0], [2.0, 1.0, 2.0]]
+
+        function = cached_function(cache_dir)
+        function.embed(["fail", "ok"])
+        assert function.function.embedded == ["fail"]
+
+        cache = EmbeddingCache(cache_dir, max_entries=3)
+        keys = [cache.text_key("fail"), cache.text_key("ok")]
+        assert list(cache.get_many("counting-3", 3, keys)) == [keys[1]]
+
+if __name__ == "__main__":
+    test_lru_eviction_survives_reopen()
+    test_zero_vectors_are_not_cached()
+    print("Embedding cache tests passed")
@@ -0,0 +1,136 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import chromadb
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from backend.vector_store import VectorStore
+
+TRANSCRIPTS_DIR = Path(__file__).parent / "transcripts"
+
+def question_block(number, conversation):
+    return (
+        f"Question: {number}\n"
+        f"Introduction: 駅で男の人と女の人が話しています\n"
+        f"Conversation: {conversation}\n"
+        f"Question: 男の人はこれから何をしますか\n"
+        "\n"
+    )
+
+def make_store(persist_dir):
+    """A vector store with an empty in-memory collection and its manifest in persist_dir"""
+    store = VectorStore(persist_dir, embedding_backend="local", embedding_cache_dir="off")
+    store.client = chromadb.EphemeralClient()
+    store.initialize(rebuild=True)
+    return store
+
+def test_parse_bundled_transcript():
+    """The structured sample transcript parses into all 24 questions"""
+    content = (TRANSCRIPTS_DIR / "sY7L5cfCWno.structured.txt").read_text(encoding="utf-8")
+    questions = VectorStore._parse_transcript(content)
+    assert len(questions) == 24
+    assert questions[0]["question_number"] == "Section 1 Question 1"
+    assert questions[-1]["question_number"] == "Section 4 Question 6"
+    # Sections 3 and 4 have no conversation, every question has its question text
+    assert all(q["introduction"] and q["question"] for q in questions)
+    assert sum(1 for q in questions if q["conversation"]) == 13
+
+def test_parse_question_line_fills_current_question():
+    """The question text line after the conversation belongs to the current question"""
+    questions = VectorStore._parse_transcript(
+        question_block("1", "A: 切符を買います") + question_block("2", "B: 電車に乗ります")
+    )
+    assert [q["question_number"] for q in questions] == ["1", "2"]
+    assert questions[0]["question"] == "男の人はこれから何をしますか"
+    assert questions[1]["conversation"] == "B: 電車に乗ります"
+
+def test_question_ids_are_deterministic():
+    """IDs depend on source, number and content, repeated questions get a suffix"""
+    questions = VectorStore._parse_transcript(
+        question_block("1", "A") + question_block("1", "A") + question_block("2", "B")
+    )
+    ids = VectorStore._question_ids(questions, "/data/a.txt")
+    assert ids == VectorStore._question_ids(questions, "/data/a.txt")
+    assert ids[1] == f"{ids[0]}-2"
+    assert len(set(ids)) == 3
+    assert set(ids).isdisjoint(VectorStore._question_ids(questions, "/data/b.txt"))
+
+def test_incremental_folder_import():
+    """Unchanged files are skipped, edits and removed files update only their questions"""
+    with tempfile.TemporaryDirectory() as persist_dir, tempfile.TemporaryDirectory() as folder:
+        first = Path(folder) / "first.structured.txt"
+        second = Path(folder) / "second.structured.txt"
+        first.write_text(question_block("1", "A: はい") + question_block("2", "B: いいえ"), encoding="utf-8")
+        second.write_text(question_block("1", "C: どうぞ"), encoding="utf-8")
+        store = make_store(persist_dir)
+
+        assert store.load_questions_from_folder(folder) == 3
+        assert store.last_load_stats["upserted"] == 3
+        assert store.collection.count() == 3
+
+        # Nothing changed
+        assert store.load_questions_from_folder(folder) == 3
+        assert store.last_load_stats["unchanged_files"] == 2
+        assert store.last_load_stats["upserted"] == 0
+
+        # Touched but not modified
+        os.utime(first, ns=(first.stat().st_atime_ns, first.stat().st_mtime_ns + 10**9))
+        store.load_questions_from_folder(folder)
+        assert store.last_load_stats["unchanged_files"] == 2
+        assert store.last_load_stats["upserted"] == 0
+
+        # One question edited
+        first.write_text(question_block("1", "A: はい") + question_block("2", "B: 違います"), encoding="utf-8")
+        store.load_questions_from_folder(folder)
+        assert store.last_load_stats["changed_files"] == 1
+        assert (store.last_load_stats["upserted"], store.last_load_stats["deleted"]) == (1, 1)
+        assert store.collection.count() == 3
+
+        # File removed
+        removed_ids = store._source_ids(str(second.resolve()))
+        second.unlink()
+        assert store.load_questions_from_folder(folder) == 2
+        assert store.last_load_stats["removed_files"] == 1
+        assert store.last_load_stats["deleted"] == 1
+        assert store.collection.get(ids=removed_ids)["ids"] == []
+        assert store.collection.count() == 2
+
+def test_stale_manifest_reindexes_in_full():
+    """A manifest of another model, or listing more questions than the collection, is not trusted"""
+    with tempfile.TemporaryDirectory() as persist_dir, tempfile.TemporaryDirectory() as folder:
+        (Path(folder) / "first.structured.txt").write_text(
+            question_block("1", "A: はい") + question_block("2", "B: いいえ"), encoding="utf-8"
+        )
+        store = make_store(persist_dir)
+        store.load_questions_from_folder(folder)
+
+        # Questions lost from the collection
+        store.collection.delete(ids=store.collection.get()["ids"][:1])
+        store.load_questions_from_folder(folder)
+        assert store.last_load_stats["upserted"] == 2
+        assert store.collection.count() == 2
+
+        # Manifest written for another embedding model
+        manifest_path = Path(persist_dir) / "index_manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["embedding_model"] = "another-model"
+        manifest_path.write_text(json.dumps(manifest))
+        store.load_questions_from_folder(folder)
+        assert store.last_load_stats["upserted"] == 2
+
+        # Back in sync
+        store.load_questions_from_folder(folder)
+        assert store.last_load_stats["upserted"] == 0
+
+if __name__ == "__main__":
+    test_parse_bundled_transcript()
+    test_parse_question_line_fills_current_question()
+    test_question_ids_are_deterministic()
+    test_incremental_folder_import()
+    test_stale_manifest_reindexes_in_full()
+    print("Vector store tests passed")
@@ -1,19 +1,183 @@
 import os
 import json
 import re
+import hashlib
+import unicodedata
 import numpy as np
+from collections import OrderedDict
 from typing import List, Dict, Optional, Any, Union
 from pathlib import Path
 import chromadb
 import requests
-import uuid
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-class PerplexityEmbeddingFunction:
-    """Custom embedding function using Perplexity API"""
+class EmbeddingBackend:
+    """Interface of the embedding functions used by the vector store
+
+    Subclasses implement ``embed`` for a batch of texts. Instances can be
+    passed to ChromaDB as embedding functions, which call them with a list
+    of documents.
+    """
+    
+    # Identifies the model and settings the vectors were produced with
+    model_id = ""
+    dimension = 0
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts
+        
+        Args:
+            texts (List[str]): Texts to embed
+            
+        Returns:
+            np.ndarray: float32 matrix with one row per text
+        """
+        raise NotImplementedError
+    
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        """Generate embeddings for a list of texts
+        
+        Args:
+            input (List[str]): List of texts to embed
+            
+        Returns:
+            List[List[float]]: List of embeddings
+        """
+        if not input:
+            return []
+        return self.embed(list(input)).tolist()
+
+class HashedNgramEmbeddingFunction(EmbeddingBackend):
+    """Local embedding function projecting character n-grams into a fixed vector
+
+    Japanese is written without spaces, so instead of words the text is
+    split into overlapping character n-grams. Every n-gram is hashed to one
+    of ``dimension`` buckets with a random sign (the hashing trick) and
+    weighted by its length, so that shared bigrams and trigrams count for
+    more than shared kana. Vectors are L2 normalized, the cosine distance
+    then measures n-gram overlap. Needs no model download or API call and
+    the same text always gets the same vector.
+    """
+    
+    # Weight of an n-gram by its length n
+    NGRAM_WEIGHTS = {1: 0.25, 2: 1.0, 3: 1.5, 4: 1.5}
+    _FNV_OFFSET = np.uint64(14695981039346656037)
+    _FNV_PRIME = np.uint64(1099511628211)
+    
+    def __init__(self, dimension: int = 1024, ngram_range: tuple = (1, 3), batch_size: int = 512):
+        """Initialize the embedding function
+        
+        Args:
+            dimension (int): Size of the vectors
+            ngram_range (tuple): Smallest and largest n-gram length, at most 4
+            batch_size (int): Texts vectorized together
+        """
+        min_n, max_n = ngram_range
+        if not 1 <= min_n <= max_n <= max(self.NGRAM_WEIGHTS):
+            raise ValueError(f"Unsupported n-gram range: {ngram_range}")
+        self.dimension = dimension
+        self.ngram_range = (min_n, max_n)
+        self.batch_size = batch_size
+        self.model_id = f"hashed-ngram-{min_n}-{max_n}-{dimension}"
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """NFKC normalize (full-width letters and half-width kana), lowercase
+        and collapse whitespace, so variants of a text embed the same way"""
+        return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            vectors[start:start + len(batch)] = self._embed_batch(batch)
+        return vectors
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        # All texts as one array of code points, with the text each belongs to
+        codes = [
+            np.frombuffer(self.normalize(text).encode("utf-32-le"), dtype=np.uint32)
+            for text in texts
+        ]
+        lengths = np.array([len(c) for c in codes], dtype=np.int64)
+        flat = np.concatenate(codes).astype(np.uint64) if codes else np.zeros(0, dtype=np.uint64)
+        owner = np.repeat(np.arange(len(texts)), lengths)
+        position = np.arange(len(flat)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        remaining = lengths[owner] - position
+        
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        with np.errstate(over="ignore"):
+            for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+                starts = np.nonzero(remaining >= n)[0]
+                # FNV-1a over the code points of each n-gram, seeded with n
+                hashes = np.full(len(starts), self._FNV_OFFSET ^ np.uint64(n), dtype=np.uint64)
+                for offset in range(n):
+                    hashes = (hashes ^ flat[starts + offset]) * self._FNV_PRIME
+                buckets = (hashes >> np.uint64(1)) % np.uint64(self.dimension)
+                signs = np.where(hashes & np.uint64(1), 1.0, -1.0).astype(np.float32)
+                np.add.at(
+                    vectors,
+                    (owner[starts], buckets.astype(np.int64)),
+                    signs * self.NGRAM_WEIGHTS[n]
+                )
+        
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+class SentenceTransformerEmbeddingFunction(EmbeddingBackend):
+    """Local embedding function using a sentence-transformers model
+
+    Needs ``pip install sentence-transformers``, the model is downloaded on
+    first use. Slower than the n-gram vectors but matches paraphrases.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = "paraphrase-multilingual-MiniLM-L12-v2",
+        batch_size: int = 64,
+        device: Optional[str] = None
+    ):
+        """Initialize the embedding function
+        
+        Args:
+            model_name (str): sentence-transformers model, should support Japanese
+            batch_size (int): Texts encoded together
+            device (Optional[str]): Torch device, e.g. "cpu", detected by default
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "The sentence-transformers embedding backend needs "
+                "`pip install sentence-transformers`"
+            ) from e
+        self.model = SentenceTransformer(model_name, device=device)
+        self.batch_size = batch_size
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.model_id = f"sentence-transformers/{model_name}"
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).astype(np.float32)
+
+class PerplexityEmbeddingFunction(EmbeddingBackend):
+    """Custom embedding function using Perplexity API
+
+    Perplexity has no embeddings endpoint: every text costs one chat
+    completion and the vector is derived from an MD5 hash, so it carries
+    no meaning. Kept for collections built with it.
+    """
+    
+    model_id = "perplexity-sonar-md5-1536"
     
     def __init__(self, api_key: str):
         """Initialize the embedding function
@@ -23,19 +187,29 @@ class PerplexityEmbeddingFunction:
         """
         self.api_key = api_key
         self.embedding_dimension = 1536  # Default embedding dimension
+        self.dimension = self.embedding_dimension
     
-    def __call__(self, input: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts
+    def hash_embedding(self, text: str) -> List[float]:
+        """Create a deterministic embedding from the MD5 hash of the text
         
         Args:
-            input (List[str]): List of texts to embed
+            text (str): Text to hash
             
         Returns:
-            List[List[float]]: List of embeddings
+            List[float]: Embedding with values between 0 and 1
         """
+        hash_digest = hashlib.md5(text.encode()).digest()
+        
+        # Use modulo to get a value between 0 and 1
+        return [
+            hash_digest[i % len(hash_digest)] / 255.0
+            for i in range(self.embedding_dimension)
+        ]
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
         embeddings = []
         
-        for text in input:
+        for text in texts:
             try:
                 # Try to use Perplexity API for chat completion and extract embedding from there
                 headers = {
@@ -64,19 +238,7 @@ class PerplexityEmbeddingFunction:
                     result = response.json()
                     if 'choices' in result and len(result['choices']) > 0:
                         response_text = result['choices'][0].get('message', {}).get('content', '')
-                        # Use this response to generate a hash-based embedding
-                        import hashlib
-                        hash_object = hashlib.md5((text + response_text).encode())
-                        hash_digest = hash_object.digest()
-                        
-                        # Convert the hash to a list of floats
-                        embedding = []
-                        for i in range(self.embedding_dimension):
-                            # Use modulo to get a value between 0 and 1
-                            value = hash_digest[i % len(hash_digest)] / 255.0
-                            embedding.append(value)
-                        
-                        embeddings.append(embedding)
+                        embeddings.append(self.hash_embedding(text + response_text))
                         print(f"Generated embedding using Perplexity API response")
                         continue
                 else:
@@ -85,37 +247,283 @@ class PerplexityEmbeddingFunction:
                 # If we reach here, the API call failed or returned unexpected format
                 # Fall back to hash-based approach
                 print(f"Falling back to hash-based approach for embedding generation")
-                
-                # Create a deterministic embedding based on the text
-                import hashlib
-                hash_object = hashlib.md5(text.encode())
-                hash_digest = hash_object.digest()
-                
-                # Convert the hash to a list of floats
-                embedding = []
-                for i in range(self.embedding_dimension):
-                    # Use modulo to get a value between 0 and 1
-                    value = hash_digest[i % len(hash_digest)] / 255.0
-                    embedding.append(value)
-                
-                embeddings.append(embedding)
+                embeddings.append(self.hash_embedding(text))
                     
             except Exception as e:
                 print(f"Error generating embedding: {str(e)}")
                 # Fallback to zeros embedding
                 embeddings.append([0.0] * self.embedding_dimension)
         
-        return embeddings
+        return np.array(embeddings, dtype=np.float32).reshape(len(texts), self.dimension)
+
+class EmbeddingCache:
+    """Persistent embedding cache keyed by (model id, SHA-256 of the text)
+
+    Each model gets a directory holding its vectors in a float32 matrix
+    that is memory-mapped, so only the rows that are read are loaded, and
+    an index.json mapping text hashes to rows in least recently used
+    order. When ``max_entries`` is reached the least recently used row is
+    overwritten. The cache expects a single writing process at a time.
+    """
+    
+    def __init__(self, directory: Union[str, Path], max_entries: int = 100_000):
+        """Initialize the cache
+        
+        Args:
+            directory (Union[str, Path]): Directory to keep the cache files in
+            max_entries (int): Vectors kept per model
+        """
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self._models: Dict[str, Dict[str, Any]] = {}
+    
+    @staticmethod
+    def text_key(text: str) -> str:
+        """SHA-256 of the text after NFC normalization and whitespace collapsing,
+        which don't change what the text embeds to"""
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    
+    def _model_dir(self, model_id: str) -> Path:
+        safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", model_id)
+        return self.directory / safe_name
+    
+    def _open(self, model_id: str, dimension: int) -> Dict[str, Any]:
+        """Load (or create) the index and matrix of a model"""
+        model = self._models.get(model_id)
+        if model and model["dimension"] == dimension:
+            return model
+        
+        model_dir = self._model_dir(model_id)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        index_path = model_dir / "index.json"
+        entries = OrderedDict()
+        if index_path.exists():
+            try:
+                index = json.loads(index_path.read_text())
+                if index.get("model_id") == model_id and index.get("dimension") == dimension:
+                    entries = OrderedDict(index["entries"])
+            except (ValueError, KeyError) as e:
+                print(f"Ignoring unreadable embedding cache index {index_path}: {str(e)}")
+        
+        model = {
+            "dimension": dimension,
+            "entries": entries,
+            "path": model_dir / "vectors.f32",
+            "index_path": index_path,
+            "matrix": None,
+            "capacity": 0,
+            "dirty": False,
+        }
+        self._models[model_id] = model
+        rows = max(entries.values(), default=-1) + 1
+        self._reserve(model, rows)
+        return model
+    
+    def _reserve(self, model: Dict[str, Any], rows: int) -> None:
+        """Grow the matrix file to hold at least ``rows`` rows"""
+        if rows <= model["capacity"] and model["matrix"] is not None:
+            return
+        capacity = max(rows, 1024, min(self.max_entries, model["capacity"] * 2))
+        row_bytes = model["dimension"] * 4
+        if model["matrix"] is not None:
+            model["matrix"].flush()
+            model["matrix"] = None
+        with open(model["path"], "ab") as f:
+            if f.tell() < capacity * row_bytes:
+                f.truncate(capacity * row_bytes)
+        model["matrix"] = np.memmap(
+            model["path"], dtype=np.float32, mode="r+", shape=(capacity, model["dimension"])
+        )
+        model["capacity"] = capacity
+    
+    def get_many(self, model_id: str, dimension: int, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look up vectors, marking the hits as recently used
+        
+        The recency is kept in memory until the next put_many() or flush().
+        
+        Args:
+            model_id (str): Model the vectors were produced with
+            dimension (int): Size of the model's vectors
+            keys (List[str]): Text keys from text_key()
+            
+        Returns:
+            Dict[str, np.ndarray]: Vectors of the keys found in the cache
+        """
+        model = self._open(model_id, dimension)
+        entries = model["entries"]
+        hits, rows = [], []
+        for key in keys:
+            row = entries.get(key)
+            if row is not None:
+                entries.move_to_end(key)
+                hits.append(key)
+                rows.append(row)
+        if rows:
+            # The new recency is written on the next flush
+            model["dirty"] = True
+        # One gather from the memory map instead of a copy per row
+        return dict(zip(hits, model["matrix"][rows])) if rows else {}
+    
+    def put_many(self, model_id: str, keys: List[str], vectors: np.ndarray) -> None:
+        """Store vectors, evicting the least recently used ones when full
+        
+        Args:
+            model_id (str): Model the vectors were produced with
+            keys (List[str]): Text keys from text_key()
+            vectors (np.ndarray): One row per key
+        """
+        model = self._open(model_id, vectors.shape[1])
+        entries = model["entries"]
+        for key, vector in zip(keys, vectors):
+            row = entries.get(key)
+            if row is None:
+                if len(entries) >= self.max_entries:
+                    _, row = entries.popitem(last=False)
+                else:
+                    row = len(entries)
+                    self._reserve(model, row + 1)
+            entries[key] = row
+            entries.move_to_end(key)
+            model["matrix"][row] = vector
+        model["dirty"] = True
+        self.flush(model_id)
+    
+    def flush(self, model_id: Optional[str] = None) -> None:
+        """Write the vectors and index of a model (or of all models) to disk"""
+        for name in [model_id] if model_id else list(self._models):
+            model = self._models.get(name)
+            if not model or not model["dirty"]:
+                continue
+            model["matrix"].flush()
+            tmp_path = model["index_path"].with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({
+                "model_id": name,
+                "dimension": model["dimension"],
+                "entries": list(model["entries"].items()),
+            }))
+            os.replace(tmp_path, model["index_path"])
+            model["dirty"] = False
+
+class CachedEmbeddingFunction(EmbeddingBackend):
+    """Embedding function reading through an EmbeddingCache
+
+    Texts already in the cache are not embedded again, duplicates in a
+    batch are embedded once. All-zero vectors, which the Perplexity
+    function returns when it fails, are not cached.
+    """
+    
+    def __init__(self, function: EmbeddingBackend, cache: EmbeddingCache):
+        """Initialize the embedding function
+        
+        Args:
+            function (EmbeddingBackend): Embedding function computing the misses
+            cache (EmbeddingCache): Cache to read and fill
+        """
+        self.function = function
+        self.cache = cache
+        self.model_id = function.model_id
+        self.dimension = function.dimension
+        self.hits = 0
+        self.misses = 0
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        keys = [self.cache.text_key(text) for text in texts]
+        found = self.cache.get_many(self.model_id, self.dimension, keys)
+        
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            vectors = self.function.embed(list(missing.values()))
+            valid = np.any(vectors != 0, axis=1)
+            missing_keys = list(missing)
+            found.update(zip(missing_keys, vectors))
+            self.cache.put_many(
+                self.model_id,
+                [key for key, ok in zip(missing_keys, valid) if ok],
+                vectors[valid]
+            )
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        
+        return np.array([found[key] for key in keys], dtype=np.float32).reshape(len(texts), self.dimension)
+    
+    def flush(self) -> None:
+        """Write the cache of this model to disk, including the recency of hits"""
+        self.cache.flush(self.model_id)
+
+# Embedding backends by name, selected with EMBEDDING_BACKEND
+EMBEDDING_BACKENDS = {
+    "local": HashedNgramEmbeddingFunction,
+    "sentence-transformers": SentenceTransformerEmbeddingFunction,
+    "perplexity": PerplexityEmbeddingFunction,
+}
+
+# Collection name, and the embedding a collection without embedding
+# metadata was built with: the Perplexity function, the only one before
+COLLECTION_NAME = "jlpt_questions"
+LEGACY_EMBEDDING = {
+    "embedding_backend": "perplexity",
+    "embedding_model": PerplexityEmbeddingFunction.model_id,
+    "embedding_dimension": 1536,
+}
+
+def create_embedding_function(
+    backend: Optional[str] = None,
+    perplexity_api_key: Optional[str] = None,
+    cache_dir: Optional[Union[str, Path]] = None
+) -> EmbeddingBackend:
+    """Create an embedding function by backend name
+    
+    Args:
+        backend (Optional[str]): One of EMBEDDING_BACKENDS, defaults to the
+            EMBEDDING_BACKEND environment variable or "local"
+        perplexity_api_key (Optional[str]): Perplexity API key, for the perplexity backend
+        cache_dir (Optional[Union[str, Path]]): Directory of the embedding cache,
+            the function reads through it when given
+        
+    Returns:
+        EmbeddingBackend: The embedding function
+    """
+    backend = backend or os.getenv("EMBEDDING_BACKEND", "local")
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend {backend!r}, choose one of: {', '.join(EMBEDDING_BACKENDS)}"
+        )
+    if backend == "perplexity":
+        api_key = perplexity_api_key or os.getenv("PERPLEXITY_API_KEY")
+        if not api_key:
+            raise ValueError("Perplexity API key is required for the perplexity embedding backend")
+        function = PerplexityEmbeddingFunction(api_key=api_key)
+    else:
+        function = EMBEDDING_BACKENDS[backend]()
+    if cache_dir is None:
+        return function
+    max_entries = int(os.getenv("EMBEDDING_CACHE_SIZE", "100000"))
+    return CachedEmbeddingFunction(function, EmbeddingCache(cache_dir, max_entries=max_entries))
 
 class VectorStore:
-    """Vector store for JLPT questions using ChromaDB with Perplexity embeddings"""
+    """Vector store for JLPT questions using ChromaDB with pluggable embeddings"""
     
-    def __init__(self, persist_directory: str = "./chroma_db", perplexity_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_db",
+        perplexity_api_key: Optional[str] = None,
+        embedding_backend: Optional[str] = None,
+        embedding_cache_dir: Optional[str] = None
+    ):
         """Initialize the vector store
         
         Args:
             persist_directory (str): Directory to persist the vector store
-            perplexity_api_key (Optional[str]): Perplexity API key
+            perplexity_api_key (Optional[str]): Perplexity API key, for the perplexity backend
+            embedding_backend (Optional[str]): One of EMBEDDING_BACKENDS, defaults to
+                the EMBEDDING_BACKEND environment variable or "local"
+            embedding_cache_dir (Optional[str]): Directory of the embedding cache,
+                defaults to the EMBEDDING_CACHE_DIR environment variable or
+                embedding_cache next to the database. "off" disables the cache.
         """
         # Convert relative paths to absolute paths
         self.persist_directory = os.path.abspath(persist_directory)
@@ -133,34 +541,161 @@ class VectorStore:
             self.client = None
             return
         
-        # Use Perplexity embeddings
         self.perplexity_api_key = perplexity_api_key or os.getenv("PERPLEXITY_API_KEY")
-        if not self.perplexity_api_key:
-            raise ValueError("Perplexity API key is required for the vector store")
-        
-        self.embedding_function = PerplexityEmbeddingFunction(api_key=self.perplexity_api_key)
+        cache_dir = embedding_cache_dir or os.getenv(
+            "EMBEDDING_CACHE_DIR", os.path.join(self.persist_directory, "embedding_cache")
+        )
+        self.embedding_cache_dir = None if cache_dir == "off" else cache_dir
+        # An explicitly chosen backend must match the collection, the default
+        # one gives way to the backend the collection was built with
+        self.embedding_backend_chosen = bool(embedding_backend or os.getenv("EMBEDDING_BACKEND"))
+        self.embedding_backend = embedding_backend or os.getenv("EMBEDDING_BACKEND", "local")
+        self.embedding_function = create_embedding_function(
+            self.embedding_backend,
+            perplexity_api_key=self.perplexity_api_key,
+            cache_dir=self.embedding_cache_dir
+        )
         self._questions_loaded = False
+        self.last_load_stats: Dict[str, float] = {}
         
-    def initialize(self, load_questions: bool = False):
+    def _embedding_metadata(self) -> Dict[str, Any]:
+        """Collection metadata recording the embedding of the current backend"""
+        return {
+            "embedding_backend": self.embedding_backend,
+            "embedding_model": self.embedding_function.model_id,
+            "embedding_dimension": self.embedding_function.dimension,
+        }
+    
+    def initialize(self, load_questions: bool = False, rebuild: bool = False):
         """Initialize the vector store collection
         
+        The collection's metadata records the embedding it was built with.
+        When it differs from the configured backend, the collection is
+        queried with the backend it was built with if none was chosen
+        explicitly, otherwise initialization fails rather than querying
+        vectors of another model.
+        
         Args:
             load_questions (bool): Whether to load questions from the transcripts directory
+            rebuild (bool): Delete the collection and create an empty one for the
+                configured backend, e.g. after changing EMBEDDING_BACKEND
+            
+        Raises:
+            ValueError: If the collection was built with another embedding
         """
         if not self.client:
             raise ValueError("ChromaDB client not initialized. No existing database found.")
+        
+        if rebuild:
+            try:
+                self.client.delete_collection(name=COLLECTION_NAME)
+            except ValueError:
+                pass
+            self.collection = self.client.create_collection(
+                name=COLLECTION_NAME,
+                embedding_function=self.embedding_function,
+                metadata=self._embedding_metadata()
+            )
+            print(f"Created empty collection for {self.embedding_function.model_id}")
+            return
             
         try:
             # Try to get existing collection first
             self.collection = self.client.get_collection(
-                name="jlpt_questions",
+                name=COLLECTION_NAME,
                 embedding_function=self.embedding_function
             )
-            print("Using existing collection with embeddings from first run")
-            self._questions_loaded = True
         except ValueError:
             print("No existing collection found")
             return
+        
+        metadata = self.collection.metadata or {}
+        if "embedding_model" in metadata:
+            built_with = {key: metadata.get(key) for key in LEGACY_EMBEDDING}
+        elif self.collection.count():
+            built_with = LEGACY_EMBEDDING
+        else:
+            built_with = None
+        if built_with and built_with["embedding_model"] != self.embedding_function.model_id:
+            if self.embedding_backend_chosen or built_with["embedding_backend"] not in EMBEDDING_BACKENDS:
+                raise ValueError(
+                    f"Collection was embedded with {built_with['embedding_model']} "
+                    f"({built_with['embedding_dimension']} dimensions), but the "
+                    f"{self.embedding_backend} backend produces {self.embedding_function.model_id} "
+                    f"({self.embedding_function.dimension} dimensions). Set EMBEDDING_BACKEND="
+                    f"{built_with['embedding_backend']} or rebuild it with `python vector_store.py --rebuild`."
+                )
+            print(
+                f"Collection was embedded with {built_with['embedding_model']}, "
+                f"querying it with the {built_with['embedding_backend']} backend"
+            )
+            self.embedding_backend = built_with["embedding_backend"]
+            self.embedding_function = create_embedding_function(
+                self.embedding_backend,
+                perplexity_api_key=self.perplexity_api_key,
+                cache_dir=self.embedding_cache_dir
+            )
+            if self.embedding_function.model_id != built_with["embedding_model"]:
+                raise ValueError(
+                    f"Collection was embedded with {built_with['embedding_model']}, which the "
+                    f"{self.embedding_backend} backend no longer produces. Rebuild the collection."
+                )
+            self.collection = self.client.get_collection(
+                name=COLLECTION_NAME,
+                embedding_function=self.embedding_function
+            )
+        print("Using existing collection with embeddings from first run")
+        self._questions_loaded = True
+    
+    def _record_embedding(self) -> None:
+        """Record the embedding in the collection metadata before writing vectors"""
+        metadata = dict(self.collection.metadata or {})
+        wanted = self._embedding_metadata()
+        if all(metadata.get(key) == value for key, value in wanted.items()):
+            return
+        metadata.update(wanted)
+        # HNSW settings are fixed when the collection is created and can not be modified
+        self.collection.modify(metadata={
+            key: value for key, value in metadata.items() if not key.startswith("hnsw:")
+        })
+    
+    def _flush_embedding_cache(self) -> None:
+        """Persist the embedding cache, so the recency of its hits survives a restart"""
+        if isinstance(self.embedding_function, CachedEmbeddingFunction):
+            self.embedding_function.flush()
+    
+    @staticmethod
+    def _question_text(question: Dict[str, str]) -> str:
+        """Combine question components into the text that is embedded"""
+        return f"{question.get('introduction', '')} {question.get('conversation', '')} {question.get('question', '')}"
+    
+    @staticmethod
+    def _question_metadata(question: Dict[str, str], source: str) -> Dict[str, str]:
+        """Metadata stored with a question, returned by search()"""
+        return {
+            "source": source,
+            "question_number": question.get("question_number", ""),
+            "introduction": question.get("introduction", ""),
+            "conversation": question.get("conversation", ""),
+            "question": question.get("question", "")
+        }
+    
+    @staticmethod
+    def _question_ids(questions: List[Dict[str, str]], source: str) -> List[str]:
+        """Deterministic IDs from the source file, question number and content hash
+        
+        An edited question gets a new ID. Identical questions repeated in a
+        file get an occurrence suffix.
+        """
+        ids = []
+        seen: Dict[str, int] = {}
+        for question in questions:
+            content_hash = hashlib.sha256(VectorStore._question_text(question).encode("utf-8")).hexdigest()
+            key = f"{source}\0{question.get('question_number', '')}\0{content_hash}"
+            question_id = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+            seen[question_id] = seen.get(question_id, 0) + 1
+            ids.append(question_id if seen[question_id] == 1 else f"{question_id}-{seen[question_id]}")
+        return ids
     
     def add_question(self, question: Dict[str, str], source: str) -> str:
         """Add a single question to the vector store
@@ -172,23 +707,15 @@ class VectorStore:
         Returns:
             str: ID of the added question
         """
-        # Generate a unique ID for the question
-        question_id = str(uuid.uuid4())
-        
-        # Combine question components for embedding
-        question_text = f"{question.get('introduction', '')} {question.get('conversation', '')} {question.get('question', '')}"
+        # Same question from the same source, same ID, so re-adding it is a no-op
+        question_id = self._question_ids([question], source)[0]
         
         # Add to collection
-        self.collection.add(
+        self._record_embedding()
+        self.collection.upsert(
             ids=[question_id],
-            documents=[question_text],
-            metadatas=[{
-                "source": source,
-                "question_number": question.get("question_number", ""),
-                "introduction": question.get("introduction", ""),
-                "conversation": question.get("conversation", ""),
-                "question": question.get("question", "")
-            }]
+            documents=[self._question_text(question)],
+            metadatas=[self._question_metadata(question, source)]
         )
         
         return question_id
@@ -203,34 +730,25 @@ class VectorStore:
         Returns:
             int: Number of questions added
         """
-        # Generate unique IDs for each question
-        question_ids = [str(uuid.uuid4()) for _ in range(len(questions))]
+        # Deterministic IDs, so adding the questions again updates them in place
+        question_ids = self._question_ids(questions, source)
         
         # Combine question components for embedding
-        question_texts = [
-            f"{q.get('introduction', '')} {q.get('conversation', '')} {q.get('question', '')}"
-            for q in questions
-        ]
+        question_texts = [self._question_text(q) for q in questions]
         
         # Prepare metadata for each question
-        metadatas = [
-            {
-                "source": source,
-                "question_number": q.get("question_number", ""),
-                "introduction": q.get("introduction", ""),
-                "conversation": q.get("conversation", ""),
-                "question": q.get("question", "")
-            }
-            for q in questions
-        ]
+        metadatas = [self._question_metadata(q, source) for q in questions]
         
         # Add to collection
-        self.collection.add(
+        self._record_embedding()
+        self.collection.upsert(
             ids=question_ids,
             documents=question_texts,
             metadatas=metadatas
         )
         
+        self._flush_embedding_cache()
+        
         return len(questions)
     
     def search(self, query: str, limit: int = 5, filter_criteria: Optional[Dict[str, Any]] = None) -> List[Dict]:
@@ -287,47 +805,233 @@ class VectorStore:
             print(f"Error getting collection info: {str(e)}")
             return {"count": 0, "metadata": None}
     
-    def load_questions_from_folder(self, folder_path: Union[str, Path]) -> int:
-        """Load questions from all transcript files in a folder
+    def _manifest_path(self) -> Path:
+        return Path(self.persist_directory) / "index_manifest.json"
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        """The index manifest: the collection and embedding model it describes,
+        and the indexed transcript files by path, with their mtime, size, hash
+        and question count"""
+        manifest_path = self._manifest_path()
+        if not manifest_path.exists():
+            return {"files": {}}
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except ValueError as e:
+            print(f"Ignoring unreadable index manifest {manifest_path}: {str(e)}")
+            return {"files": {}}
+        manifest.setdefault("files", {})
+        return manifest
+    
+    def _save_manifest(self, files: Dict[str, Dict[str, Any]]) -> None:
+        manifest_path = self._manifest_path()
+        tmp_path = manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "version": 2,
+            "collection": str(self.collection.id),
+            "embedding_model": self.embedding_function.model_id,
+            "files": files,
+        }, indent=1))
+        os.replace(tmp_path, manifest_path)
+    
+    def _manifest_mismatch(self, manifest: Dict[str, Any]) -> Optional[str]:
+        """Why the manifest does not describe the collection, if it does not"""
+        if not manifest["files"]:
+            return None
+        if manifest.get("collection") != str(self.collection.id):
+            return "it was written for another collection"
+        if manifest.get("embedding_model") != self.embedding_function.model_id:
+            return f"it was written for {manifest.get('embedding_model')} embeddings"
+        indexed = sum(entry["questions"] for entry in manifest["files"].values())
+        count = self.collection.count()
+        if count < indexed:
+            return f"it lists {indexed} questions but the collection has {count}"
+        return None
+    
+    def _source_ids(self, source: str) -> List[str]:
+        """IDs of the questions in the collection that came from a file"""
+        return self.collection.get(where={"source": source}, include=[])["ids"]
+    
+    def load_questions_from_folder(
+        self,
+        folder_path: Union[str, Path],
+        embed_batch_size: int = 256,
+        write_batch_size: int = 5000
+    ) -> int:
+        """Index the questions of all transcript files in a folder incrementally
+        
+        A manifest next to the database records the mtime, size and hash of
+        every indexed file. Files whose mtime and size did not change are
+        skipped without being read. Changed files are parsed again: questions
+        get deterministic IDs, so only new or edited questions are embedded
+        and upserted, and questions no longer in the file are deleted, as are
+        the questions of files that were removed from the folder.
+        
+        The manifest also records the collection and the embedding model. If
+        either differs, or the collection has fewer questions than the
+        manifest lists, the folder is reindexed in full: every file is parsed
+        and every question embedded again.
+        
+        New questions are embedded in batches and written in large batches.
+        The stage timings and counts are printed and kept in ``last_load_stats``.
         
         Args:
             folder_path (Union[str, Path]): Path to folder containing transcript files
+            embed_batch_size (int): Texts per embedding call
+            write_batch_size (int): Questions per collection write, capped at
+                the largest batch ChromaDB accepts
             
         Returns:
-            int: Number of questions loaded
+            int: Number of questions of the folder's files in the collection
         """
-        folder_path = Path(folder_path)
-        count = 0
+        folder_path = Path(folder_path).resolve()
+        started = time.perf_counter()
+        loaded = self._load_manifest()
+        manifest = loaded["files"]
+        mismatch = self._manifest_mismatch(loaded)
+        if mismatch:
+            print(f"Reindexing {folder_path} in full, the index manifest is stale: {mismatch}")
+        # Files listed in the manifest are skipped only if it describes the collection
+        indexed = {} if mismatch else manifest
+        stats = {
+            "files": 0, "unchanged_files": 0, "changed_files": 0, "removed_files": 0,
+            "questions": 0, "upserted": 0, "deleted": 0,
+        }
+        # Manifest entries of changed and removed files, applied once the collection is updated
+        changed: Dict[str, Dict[str, Any]] = {}
+        removed: List[str] = []
+        ids, texts, metadatas, delete_ids = [], [], [], []
         
-        # Check if collection already has questions
-        try:
-            existing_count = self.collection.count()
-            if existing_count > 0:
-                print(f"Collection already contains {existing_count} questions")
-                return existing_count
-        except Exception as e:
-            print(f"Error checking collection count: {str(e)}")
-            pass
-        
-        # Only proceed with loading if collection is empty
-        for file_path in folder_path.glob("*.txt"):
+        current = set()
+        for file_path in sorted(folder_path.glob("*.txt")):
+            source = str(file_path)
+            current.add(source)
+            stats["files"] += 1
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    questions = self._parse_transcript(content)
-                    for question in questions:
-                        self.add_question(question, str(file_path))
-                        count += 1
-                        print(f"Parsed question: {question.get('question', 'Unknown')}")
+                stat = file_path.stat()
+                entry = indexed.get(source)
+                if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    stats["unchanged_files"] += 1
+                    stats["questions"] += entry["questions"]
+                    continue
+                
+                content = file_path.read_bytes()
+                new_entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sha256": hashlib.sha256(content).hexdigest(),
+                }
+                if entry and entry["sha256"] == new_entry["sha256"]:
+                    # Touched but not modified
+                    manifest[source] = dict(new_entry, questions=entry["questions"])
+                    stats["unchanged_files"] += 1
+                    stats["questions"] += entry["questions"]
+                    continue
+                
+                questions = self._parse_transcript(content.decode("utf-8"))
+                question_ids = self._question_ids(questions, source)
+                existing = set(self._source_ids(source))
             except Exception as e:
                 print(f"Error processing file {file_path}: {str(e)}")
                 continue
+            
+            for question_id, question in zip(question_ids, questions):
+                # A full reindex embeds the questions already stored again
+                if mismatch or question_id not in existing:
+                    ids.append(question_id)
+                    texts.append(self._question_text(question))
+                    metadatas.append(self._question_metadata(question, source))
+            delete_ids += sorted(existing - set(question_ids))
+            changed[source] = dict(new_entry, questions=len(questions))
+            stats["changed_files"] += 1
+            stats["questions"] += len(questions)
+            print(f"Parsed {len(questions)} questions from {file_path.name}")
+        
+        for source in manifest:
+            if Path(source).parent == folder_path and source not in current:
+                try:
+                    delete_ids += self._source_ids(source)
+                except Exception as e:
+                    print(f"Error looking up questions of removed file {source}: {str(e)}")
+                    continue
+                removed.append(source)
+                stats["removed_files"] += 1
+        parsed = time.perf_counter()
+        
+        embeddings = np.zeros((len(texts), self.embedding_function.dimension), dtype=np.float32)
+        for start in range(0, len(texts), embed_batch_size):
+            embeddings[start:start + embed_batch_size] = self.embedding_function.embed(
+                texts[start:start + embed_batch_size]
+            )
+        self._flush_embedding_cache()
+        embedded = time.perf_counter()
+        
+        write_batch_size = min(write_batch_size, getattr(self.client, "max_batch_size", write_batch_size))
+        failed = False
+        if ids:
+            self._record_embedding()
+        for start in range(0, len(ids), write_batch_size):
+            end = start + write_batch_size
+            try:
+                self.collection.upsert(
+                    ids=ids[start:end],
+                    embeddings=embeddings[start:end].tolist(),
+                    documents=texts[start:end],
+                    metadatas=metadatas[start:end]
+                )
+                stats["upserted"] += len(ids[start:end])
+            except Exception as e:
+                print(f"Error upserting questions {start + 1}-{start + len(ids[start:end])}: {str(e)}")
+                failed = True
+        for start in range(0, len(delete_ids), write_batch_size):
+            try:
+                self.collection.delete(ids=delete_ids[start:start + write_batch_size])
+                stats["deleted"] += len(delete_ids[start:start + write_batch_size])
+            except Exception as e:
+                print(f"Error deleting questions: {str(e)}")
+                failed = True
         
-        return count
+        # After a failed write the changed files keep their old manifest
+        # entries, so the next run indexes them again; upserts are idempotent.
+        # A full reindex writes a manifest of this folder's files only once it
+        # succeeded, the files of other folders are parsed again on their next import
+        if mismatch:
+            if not failed:
+                self._save_manifest(changed)
+        else:
+            if not failed:
+                manifest.update(changed)
+                for source in removed:
+                    del manifest[source]
+            self._save_manifest(manifest)
+        written = time.perf_counter()
+        
+        total = written - started
+        stats.update({
+            "parse_seconds": parsed - started,
+            "embed_seconds": embedded - parsed,
+            "write_seconds": written - embedded,
+            "total_seconds": total,
+            "questions_per_second": stats["upserted"] / total if total > 0 else 0.0,
+        })
+        self.last_load_stats = stats
+        print(
+            f"Indexed {folder_path} in {total:.2f}s: {stats['files']} files "
+            f"({stats['unchanged_files']} unchanged, {stats['changed_files']} changed, "
+            f"{stats['removed_files']} removed), {stats['upserted']} questions upserted, "
+            f"{stats['deleted']} deleted (parse {parsed - started:.2f}s, embed {embedded - parsed:.2f}s, "
+            f"write {written - embedded:.2f}s, {stats['questions_per_second']:.0f} questions/s)"
+        )
+        return stats["questions"]
     
-    def _parse_transcript(self, content: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _parse_transcript(content: str) -> List[Dict[str, str]]:
         """Parse a transcript into questions
         
+        Each question starts with a "Question:" line holding its number,
+        followed by "Introduction:" and "Conversation:" sections. The next
+        "Question:" line after those sections is the question itself.
+        
         Args:
             content (str): Transcript content
             
@@ -345,8 +1049,13 @@ class VectorStore:
             if not line:
                 continue
             
+            # The question text of the current question
+            if line.startswith('Question:') and current_section in ("introduction", "conversation"):
+                current_section = "question"
+                current_question["question"] = line.replace('Question:', '').strip()
+            
             # Check if this is a question number line
-            if line.startswith('Question:'):
+            elif line.startswith('Question:'):
                 # Save the previous question if it exists
                 if current_question and current_question.get('question_number'):
                     questions.append(current_question)
@@ -395,13 +1104,20 @@ def main():
     parser = argparse.ArgumentParser(description="JLPT Question Vector Store")
     parser.add_argument("--import-dir", help="Directory to import structured.txt files from")
     parser.add_argument("--search", dest="search_query", help="Search query for questions")
+    parser.add_argument("--embed-batch-size", type=int, default=256, help="Texts per embedding call")
+    parser.add_argument("--write-batch-size", type=int, default=5000, help="Questions per collection write")
+    parser.add_argument("--rebuild", action="store_true", help="Recreate the collection for the configured embedding backend")
     
     args = parser.parse_args()
     
     # Initialize vector store
     try:
         vector_store = VectorStore()
-        vector_store.initialize(load_questions=True)
+        vector_store.initialize(load_questions=True, rebuild=args.rebuild)
+        batch_sizes = {
+            "embed_batch_size": args.embed_batch_size,
+            "write_batch_size": args.write_batch_size
+        }
         
         # Load questions based on arguments
         if args.import_dir:
@@ -411,17 +1127,17 @@ def main():
             # Only load from default directory if it's different from the import directory
             if import_path.resolve() != default_path.resolve():
                 # Load from default directory first
-                vector_store.load_questions_from_folder(default_path)
+                vector_store.load_questions_from_folder(default_path, **batch_sizes)
                 # Then import from specified directory
-                count = vector_store.load_questions_from_folder(import_path)
+                count = vector_store.load_questions_from_folder(import_path, **batch_sizes)
                 print(f"Imported {count} questions from {args.import_dir}")
             else:
                 # If same directory, just load once
-                count = vector_store.load_questions_from_folder(import_path)
+                count = vector_store.load_questions_from_folder(import_path, **batch_sizes)
                 print(f"Imported {count} questions from {args.import_dir}")
         else:
             # No import directory specified, just load from default location
-            vector_store.load_questions_from_folder(Path(vector_store.transcripts_directory))
+            vector_store.load_questions_from_folder(Path(vector_store.transcripts_directory), **batch_sizes)
         
         if args.search_query:
             # Search for questions